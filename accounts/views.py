@@ -152,7 +152,7 @@ def admin_dashboard(request):
         'total_users': User.objects.count(),
         'total_members': User.objects.filter(role=User.Role.MEMBER).count(),
         'pending_messages': ContactMessage.objects.filter(is_read=False).count(),
-        'upcoming_events': Event.objects.filter(is_published=True).count(),
+        'upcoming_events': Event.objects.published().upcoming().count(),
         'total_announcements': Announcement.objects.count(),
         'total_images': GalleryImage.objects.count(),
         'recent_users': User.objects.order_by('-date_joined')[:5],
@@ -174,7 +174,7 @@ def chief_dashboard(request):
     
     context = {
         'recent_announcements': Announcement.objects.filter(is_published=True)[:5],
-        'upcoming_events': Event.objects.filter(is_published=True)[:5],
+        'upcoming_events': Event.objects.published().upcoming()[:5],
     }
     
     return render(request, 'accounts/chief_dashboard.html', context)
@@ -3,21 +3,35 @@ Admin configuration for announcements app.
 """
 
 from django.contrib import admin
-from .models import Announcement, RoyalMessage, AnnouncementCategory
+from .models import Announcement, AttachmentText, RoyalMessage, AnnouncementCategory
 
 
 @admin.register(AnnouncementCategory)
 class AnnouncementCategoryAdmin(admin.ModelAdmin):
     """Admin for announcement categories."""
     
-    list_display = ['name', 'slug', 'color']
+    list_display = ['name', 'slug', 'color', 'published_count']
     prepopulated_fields = {'slug': ('name',)}
 
 
+class AttachmentTextInline(admin.StackedInline):
+    """Read-only status of the attachment's text extraction."""
+    
+    model = AttachmentText
+    can_delete = False
+    extra = 0
+    fields = ['status', 'page_count', 'attempts', 'error', 'queued_at', 'extracted_at']
+    readonly_fields = fields
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Announcement)
 class AnnouncementAdmin(admin.ModelAdmin):
     """Admin for announcements."""
     
+    inlines = [AttachmentTextInline]
     list_display = [
         'title', 'category', 'announcement_type', 'priority',
         'is_published', 'is_featured', 'is_pinned', 'view_count', 'publish_date'
@@ -26,7 +40,7 @@ class AnnouncementAdmin(admin.ModelAdmin):
         'category', 'announcement_type', 'priority',
         'is_published', 'is_featured', 'is_pinned'
     ]
-    search_fields = ['title', 'content', 'excerpt']
+    search_fields = ['title', 'content', 'excerpt', 'attachment_text__text']
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'publish_date'
     raw_id_fields = ['author']
@@ -42,7 +56,7 @@ class AnnouncementAdmin(admin.ModelAdmin):
             'fields': ('featured_image', 'attachment')
         }),
         ('Publishing', {
-            'fields': ('author', 'is_published', 'is_featured', 'is_pinned', 'publish_date')
+            'fields': ('author', 'is_published', 'is_featured', 'is_pinned', 'publish_date', 'publish_at')
         }),
     )
     
@@ -56,7 +70,7 @@ class AnnouncementAdmin(admin.ModelAdmin):
 class RoyalMessageAdmin(admin.ModelAdmin):
     """Admin for royal messages."""
     
-    list_display = ['title', 'message_date', 'is_published', 'is_featured']
+    list_display = ['title', 'message_date', 'is_published', 'is_featured', 'publish_at']
     list_filter = ['is_published', 'is_featured']
     search_fields = ['title', 'message']
     date_hierarchy = 'message_date'
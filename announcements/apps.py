@@ -5,3 +5,6 @@ class AnnouncementsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'announcements'
     verbose_name = 'Royal Announcements & News'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,124 @@
+"""
+Announcement and royal message archive by year and month.
+
+``AnnouncementArchiveMonth`` stores how many published items of each kind
+fall in each local month, so archive navigation is one small query and
+period pages are range scans on ``publish_date`` (announcements) or
+``message_date`` (royal messages) instead of OFFSET paging through the
+full list.
+"""
+
+from collections import namedtuple
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Announcement, AnnouncementArchiveMonth, RoyalMessage
+
+
+Kind = AnnouncementArchiveMonth.Kind
+
+Source = namedtuple('Source', ['model', 'date_field', 'related'])
+
+SOURCES = {
+    Kind.ANNOUNCEMENT: Source(Announcement, 'publish_date', ['category']),
+    Kind.ROYAL_MESSAGE: Source(RoyalMessage, 'message_date', []),
+}
+
+
+def kind_of(model):
+    for kind, source in SOURCES.items():
+        if source.model is model:
+            return kind
+    raise LookupError(f'{model.__name__} has no archive')
+
+
+def period_bounds(kind, year, month=None):
+    """``[start, end)`` of a local year or month, typed for the kind's date field."""
+    start = date(year, month or 1, 1)
+    if month is None or month == 12:
+        end = date(year + 1, 1, 1)
+    else:
+        end = date(year, month + 1, 1)
+    if kind == Kind.ANNOUNCEMENT:
+        return (
+            timezone.make_aware(datetime.combine(start, datetime.min.time())),
+            timezone.make_aware(datetime.combine(end, datetime.min.time())),
+        )
+    return start, end
+
+
+def period_of(instance):
+    """``(kind, year, month)`` an item is filed under, or ``None`` if not archived."""
+    kind = kind_of(type(instance))
+    value = getattr(instance, SOURCES[kind].date_field)
+    if not instance.is_published or not value:
+        return None
+    if isinstance(value, datetime):
+        value = timezone.localtime(value)
+    return kind, value.year, value.month
+
+
+def period_items(kind, year, month=None):
+    """Published items dated within the period, in date order."""
+    source = SOURCES[kind]
+    start, end = period_bounds(kind, year, month)
+    return source.model.objects.filter(
+        is_published=True,
+        **{f'{source.date_field}__gte': start, f'{source.date_field}__lt': end}
+    ).select_related(*source.related).order_by(source.date_field, 'pk')
+
+
+def refresh_months(periods):
+    """Recount the given ``(kind, year, month)`` buckets."""
+    for kind, year, month in set(periods):
+        count = period_items(kind, year, month).count()
+        if count:
+            AnnouncementArchiveMonth.objects.update_or_create(
+                kind=kind, year=year, month=month, defaults={'item_count': count}
+            )
+        else:
+            AnnouncementArchiveMonth.objects.filter(kind=kind, year=year, month=month).delete()
+
+
+def rebuild_archive():
+    """Recompute the histograms with one grouped query per kind; returns the row count."""
+    rows = []
+    for kind, source in SOURCES.items():
+        totals = source.model.objects.filter(
+            is_published=True, **{f'{source.date_field}__isnull': False}
+        ).annotate(period=TruncMonth(source.date_field)).order_by().values('period').annotate(
+            total=Count('pk')
+        )
+        rows += [
+            AnnouncementArchiveMonth(
+                kind=kind, year=row['period'].year, month=row['period'].month, item_count=row['total']
+            )
+            for row in totals
+        ]
+    with transaction.atomic():
+        AnnouncementArchiveMonth.objects.all().delete()
+        AnnouncementArchiveMonth.objects.bulk_create(rows)
+    return len(rows)
+
+
+def archive_months(kind, now=None):
+    """Histogram rows of ``kind`` up to and including the current month, newest first."""
+    today = timezone.localdate(now)
+    return AnnouncementArchiveMonth.objects.filter(kind=kind).filter(
+        Q(year__lt=today.year) | Q(year=today.year, month__lte=today.month)
+    ).order_by('-year', '-month')
+
+
+def archive_years(months):
+    """Group histogram rows into ``(year, total, [months])``, newest first."""
+    years = {}
+    for row in months:
+        years.setdefault(row.year, []).append(row)
+    return [
+        (year, sum(row.item_count for row in rows), rows)
+        for year, rows in sorted(years.items(), reverse=True)
+    ]
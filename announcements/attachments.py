@@ -0,0 +1,178 @@
+"""
+Text extraction pipeline for announcement PDF attachments.
+
+Saving an announcement with a new attachment queues an ``AttachmentText``
+row; nothing is downloaded or parsed during the request. The
+``extract_attachments`` command works through the queue: it streams the
+file from media storage into a temporary file (refusing anything over
+``ATTACHMENT_MAX_BYTES``) and parses it locally with ``pypdf`` in a child
+process (``announcements.pdftext``) limited to
+``ATTACHMENT_MEMORY_LIMIT_MB`` of address space and
+``ATTACHMENT_TIMEOUT`` seconds. Only the first ``ATTACHMENT_MAX_PAGES``
+pages and ``ATTACHMENT_TEXT_MAX_CHARS`` characters are kept, with
+whitespace collapsed.
+"""
+
+import subprocess
+import sys
+import tempfile
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Announcement, AttachmentText
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MAX_ATTEMPTS = 3
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def attachment_source(announcement):
+    """Stored identifier of the attachment (changes with every upload)."""
+    if not announcement.attachment:
+        return ''
+    return Announcement._meta.get_field('attachment').value_to_string(announcement) or ''
+
+
+def queue(announcement):
+    """Queue text extraction when the announcement's attachment changed."""
+    source = attachment_source(announcement)
+    if not source:
+        AttachmentText.objects.filter(pk=announcement.pk).delete()
+        return
+    if AttachmentText.objects.filter(pk=announcement.pk, source=source).exists():
+        return
+    AttachmentText.objects.update_or_create(
+        announcement=announcement,
+        defaults={
+            'source': source,
+            'status': AttachmentText.Status.PENDING,
+            'text': '',
+            'page_count': 0,
+            'attempts': 0,
+            'error': '',
+            'queued_at': timezone.now(),
+            'extracted_at': None,
+        },
+    )
+
+
+def queue_existing():
+    """Queue every announcement whose attachment has not been extracted yet."""
+    queued = 0
+    pending = Announcement.objects.exclude(attachment='').exclude(attachment__isnull=True)
+    for announcement in pending.filter(attachment_text__isnull=True).iterator():
+        queue(announcement)
+        queued += 1
+    return queued
+
+
+def download(url, destination):
+    """Stream ``url`` into the open file ``destination``, enforcing the size cap."""
+    limit = _setting('ATTACHMENT_MAX_BYTES', 20 * 1024 * 1024)
+    with urlopen(url, timeout=_setting('ATTACHMENT_TIMEOUT', 60)) as response:
+        declared = response.headers.get('Content-Length')
+        if declared and int(declared) > limit:
+            raise AttachmentTooLarge(f'{int(declared)} bytes')
+        size = 0
+        while True:
+            chunk = response.read(64 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                raise AttachmentTooLarge(f'over {limit} bytes')
+            destination.write(chunk)
+    destination.flush()
+
+
+def _limit_memory():
+    megabytes = _setting('ATTACHMENT_MEMORY_LIMIT_MB', 256)
+    if resource is not None and megabytes:
+        limit = megabytes * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def parse(path):
+    """Run the local parser in a memory-limited child; returns ``(text, pages)``."""
+    completed = subprocess.run(
+        [
+            sys.executable, '-m', 'announcements.pdftext', path,
+            '--max-pages', str(_setting('ATTACHMENT_MAX_PAGES', 200)),
+            '--max-chars', str(_setting('ATTACHMENT_TEXT_MAX_CHARS', 200000)),
+        ],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        timeout=_setting('ATTACHMENT_TIMEOUT', 60),
+        preexec_fn=_limit_memory if resource is not None else None,
+    )
+    if completed.returncode != 0:
+        lines = completed.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise ValueError(lines[-1] if lines else f'parser exited with {completed.returncode}')
+    pages, _, text = completed.stdout.decode('utf-8').partition('\n')
+    return text, int(pages)
+
+
+def _finish(row, **fields):
+    # Drop the result if a new attachment was uploaded meanwhile
+    AttachmentText.objects.filter(pk=row.pk, source=row.source).update(**fields)
+
+
+def extract(row):
+    """Download and parse one queued attachment; returns the resulting status."""
+    Status = AttachmentText.Status
+    if not row.source.lower().endswith('.pdf'):
+        _finish(row, status=Status.SKIPPED, error='Not a PDF', extracted_at=timezone.now())
+        return Status.SKIPPED
+
+    attempts = row.attempts + 1
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as handle:
+        try:
+            download(row.announcement.attachment.url, handle)
+        except AttachmentTooLarge as exc:
+            _finish(row, status=Status.SKIPPED, attempts=attempts,
+                    error=f'Too large: {exc}'[:255], extracted_at=timezone.now())
+            return Status.SKIPPED
+        except (URLError, OSError, ValueError) as exc:
+            # Storage hiccups (and storage misconfiguration) are retried on the next run
+            status = Status.FAILED if attempts >= MAX_ATTEMPTS else Status.PENDING
+            _finish(row, status=status, attempts=attempts, error=str(exc)[:255])
+            return status
+
+        try:
+            text, pages = parse(handle.name)
+        except (ValueError, subprocess.TimeoutExpired) as exc:
+            _finish(row, status=Status.FAILED, attempts=attempts, error=str(exc)[:255])
+            return Status.FAILED
+
+    _finish(row, status=Status.EXTRACTED, attempts=attempts, text=text, page_count=pages,
+            error='', extracted_at=timezone.now())
+    return Status.EXTRACTED
+
+
+def process_pending(limit=None):
+    """Extract queued attachments, oldest first; returns a count per status."""
+    rows = AttachmentText.objects.filter(
+        status=AttachmentText.Status.PENDING
+    ).select_related('announcement').order_by('queued_at')
+    if limit:
+        rows = rows[:limit]
+    counts = {}
+    for row in rows:
+        status = extract(row)
+        counts[status] = counts.get(status, 0) + 1
+    return counts
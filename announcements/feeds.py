@@ -0,0 +1,210 @@
+"""
+RSS and Atom feeds for announcements and royal messages.
+
+Feeds are rendered once per announcements cache generation (bumped on
+every announcement, category or royal message change, including
+scheduled publication) and stored gzip-compressed. Cached feeds are
+served without touching the database: conditional requests get a 304
+from the stored ETag/Last-Modified, and clients that accept gzip get
+the stored bytes as-is.
+"""
+
+import gzip
+import hashlib
+import re
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import F
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from palace import caching
+
+from .models import Announcement, AnnouncementCategory, RoyalMessage
+from .signals import GENERATION
+
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+class AnnouncementFeed(Feed):
+    """Latest published announcements."""
+
+    title = 'Ejeh Ankpa Palace Announcements'
+    link = reverse_lazy('announcements:list')
+    description = 'Royal announcements and palace news from the Ejeh Ankpa Palace.'
+    limit = 30
+
+    def filter_items(self, queryset, obj):
+        return queryset
+
+    def items(self, obj=None):
+        queryset = Announcement.objects.filter(is_published=True).select_related('category', 'author')
+        return self.filter_items(queryset, obj).order_by(
+            F('publish_date').desc(nulls_last=True), '-created_at'
+        )[:self.limit]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt or item.content
+
+    def item_pubdate(self, item):
+        return item.publish_date or item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() if item.author else None
+
+    def item_categories(self, item):
+        return [item.category.name] if item.category else []
+
+
+class AnnouncementAtomFeed(AnnouncementFeed):
+    feed_type = Atom1Feed
+    subtitle = AnnouncementFeed.description
+
+
+class CategoryAnnouncementFeed(AnnouncementFeed):
+    """Latest announcements in one category."""
+
+    def get_object(self, request, slug):
+        return get_object_or_404(AnnouncementCategory, slug=slug)
+
+    def title(self, obj):
+        return f'Ejeh Ankpa Palace Announcements: {obj.name}'
+
+    def link(self, obj):
+        return f"{reverse('announcements:list')}?category={obj.slug}"
+
+    def description(self, obj):
+        return obj.description or f'{obj.name} announcements from the Ejeh Ankpa Palace.'
+
+    def filter_items(self, queryset, obj):
+        return queryset.filter(category=obj)
+
+
+class CategoryAnnouncementAtomFeed(CategoryAnnouncementFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class TypeAnnouncementFeed(AnnouncementFeed):
+    """Latest announcements of one type."""
+
+    def get_object(self, request, announcement_type):
+        if announcement_type not in Announcement.AnnouncementType.values:
+            raise Http404('Unknown announcement type')
+        return Announcement.AnnouncementType(announcement_type)
+
+    def title(self, obj):
+        return f'Ejeh Ankpa Palace: {obj.label}'
+
+    def link(self, obj):
+        return f"{reverse('announcements:list')}?type={obj.value}"
+
+    def description(self, obj):
+        return f'{obj.label} items from the Ejeh Ankpa Palace.'
+
+    def filter_items(self, queryset, obj):
+        return queryset.filter(announcement_type=obj)
+
+
+class TypeAnnouncementAtomFeed(TypeAnnouncementFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class RoyalMessageFeed(Feed):
+    """Latest published royal messages."""
+
+    title = 'Royal Messages from the Ejeh of Ankpa'
+    link = reverse_lazy('announcements:royal_messages')
+    description = 'Messages from His Royal Majesty, The Ejeh of Ankpa.'
+    limit = 30
+
+    def items(self):
+        return RoyalMessage.objects.filter(is_published=True).order_by('-message_date', '-created_at')[:self.limit]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.message
+
+    def item_pubdate(self, item):
+        return timezone.make_aware(datetime.combine(item.message_date, time.min))
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.signature_name
+
+
+class RoyalMessageAtomFeed(RoyalMessageFeed):
+    feed_type = Atom1Feed
+    subtitle = RoyalMessageFeed.description
+
+
+def cached_feed(feed):
+    """
+    Wrap a ``Feed`` instance in a view that caches its compressed output.
+
+    The cache key covers the generation, scheme and host (feeds contain
+    absolute links) and path, so each feed is rendered at most once per change.
+    """
+    def view(request, *args, **kwargs):
+        current = caching.generation(GENERATION)
+        origin = f'{request.scheme}://{request.get_host()}'
+        digest = hashlib.md5(f'{current}|{origin}|{request.path}'.encode()).hexdigest()
+        key = f'announcements:feed:{digest}'
+        cached = cache.get(key)
+        if cached is None:
+            rendered = feed(request, *args, **kwargs)
+            last_modified = parse_http_date_safe(rendered.get('Last-Modified', '')) or int(timezone.now().timestamp())
+            body = gzip.compress(rendered.content)
+            etag = quote_etag(hashlib.md5(body).hexdigest())
+            cached = (rendered['Content-Type'], last_modified, etag, body)
+            cache.set(key, cached, getattr(settings, 'FEED_CACHE_TIMEOUT', 3600))
+
+        content_type, last_modified, etag, body = cached
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            if ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+                response = HttpResponse(body, content_type=content_type)
+                response['Content-Encoding'] = 'gzip'
+            else:
+                response = HttpResponse(gzip.decompress(body), content_type=content_type)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept-Encoding'])
+        patch_cache_control(response, public=True, max_age=300)
+        return response
+
+    return view
+
+
+announcements_rss = cached_feed(AnnouncementFeed())
+announcements_atom = cached_feed(AnnouncementAtomFeed())
+category_rss = cached_feed(CategoryAnnouncementFeed())
+category_atom = cached_feed(CategoryAnnouncementAtomFeed())
+type_rss = cached_feed(TypeAnnouncementFeed())
+type_atom = cached_feed(TypeAnnouncementAtomFeed())
+royal_messages_rss = cached_feed(RoyalMessageFeed())
+royal_messages_atom = cached_feed(RoyalMessageAtomFeed())
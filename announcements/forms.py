@@ -17,12 +17,13 @@ class AnnouncementForm(forms.ModelForm):
         fields = [
             'title', 'slug', 'excerpt', 'content', 'category',
             'announcement_type', 'priority', 'featured_image', 'attachment',
-            'is_published', 'is_featured', 'is_pinned', 'publish_date'
+            'is_published', 'is_featured', 'is_pinned', 'publish_date', 'publish_at'
         ]
         widgets = {
             'excerpt': forms.Textarea(attrs={'rows': 2}),
             'content': forms.Textarea(attrs={'rows': 10}),
             'publish_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+            'publish_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
         }
     
     def __init__(self, *args, **kwargs):
@@ -60,7 +61,10 @@ class AnnouncementForm(forms.ModelForm):
                     Column('is_featured', css_class='col-md-4'),
                     Column('is_pinned', css_class='col-md-4'),
                 ),
-                'publish_date',
+                Row(
+                    Column('publish_date', css_class='col-md-6'),
+                    Column('publish_at', css_class='col-md-6'),
+                ),
             ),
             Submit('submit', 'Save Announcement', css_class='btn btn-primary')
         )
@@ -73,11 +77,12 @@ class RoyalMessageForm(forms.ModelForm):
         model = RoyalMessage
         fields = [
             'title', 'message', 'signature_name', 'image',
-            'video_url', 'is_published', 'is_featured', 'message_date'
+            'video_url', 'is_published', 'is_featured', 'publish_at', 'message_date'
         ]
         widgets = {
             'message': forms.Textarea(attrs={'rows': 8}),
             'message_date': forms.DateInput(attrs={'type': 'date'}),
+            'publish_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
         }
     
     def __init__(self, *args, **kwargs):
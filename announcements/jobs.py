@@ -0,0 +1,13 @@
+"""
+Periodic maintenance jobs for the announcements app (see palace.scheduler).
+"""
+
+from palace.scheduler import periodic
+
+from .attachments import process_pending
+
+
+@periodic(every=5 * 60, queue=True)
+def extract_attachments():
+    """Extract text from newly uploaded PDF attachments."""
+    process_pending(limit=20)
@@ -0,0 +1,36 @@
+"""
+Management command to extract text from queued PDF attachments.
+
+Uploading an attachment only queues it; run this every few minutes (e.g.
+from cron or the platform scheduler) to download and parse the queue
+outside the request cycle. Use ``--backfill`` once to queue attachments
+uploaded before extraction existed.
+"""
+
+from django.core.management.base import BaseCommand
+
+from announcements.attachments import process_pending, queue_existing
+
+
+class Command(BaseCommand):
+    help = 'Extract searchable text from queued announcement attachments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Process at most this many attachments',
+        )
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='First queue every attachment that has never been extracted',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            queued = queue_existing()
+            self.stdout.write(self.style.NOTICE(f'Queued {queued} existing attachments.'))
+
+        counts = process_pending(options['limit'])
+        for status, count in sorted(counts.items()):
+            self.stdout.write(f'{count} {status}')
+        self.stdout.write(self.style.SUCCESS(f'Processed {sum(counts.values())} attachments.'))
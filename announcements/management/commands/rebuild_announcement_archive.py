@@ -0,0 +1,19 @@
+"""
+Management command to rebuild the announcement archive histogram.
+
+Signals keep the histogram current on ordinary saves and deletes; run
+this after bulk imports or ``QuerySet.update()`` calls on announcements
+or royal messages.
+"""
+
+from django.core.management.base import BaseCommand
+
+from announcements.archive import rebuild_archive
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-month counts behind the announcement and royal message archives'
+
+    def handle(self, *args, **options):
+        rows = rebuild_archive()
+        self.stdout.write(self.style.SUCCESS(f'Announcement archive rebuilt ({rows} months).'))
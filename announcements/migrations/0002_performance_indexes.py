@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-is_pinned', '-publish_date', '-created_at'], name='announcement_published_idx'),
+        ),
+    ]
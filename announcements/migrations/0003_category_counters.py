@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+def count_published(apps, schema_editor):
+    AnnouncementCategory = apps.get_model('announcements', 'AnnouncementCategory')
+    for category in AnnouncementCategory.objects.all():
+        category.published_count = category.announcements.filter(is_published=True).count()
+        category.save(update_fields=['published_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0002_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcementcategory',
+            name='published_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Published Announcements'),
+        ),
+        migrations.RunPython(count_published, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0003_category_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Leave unpublished and set a time to publish automatically', null=True, verbose_name='Scheduled Publish Time'),
+        ),
+        migrations.AddField(
+            model_name='royalmessage',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Leave unpublished and set a time to publish automatically', null=True, verbose_name='Scheduled Publish Time'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_published', False), ('publish_at__isnull', False)), fields=['publish_at'], name='announcement_publish_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='royalmessage',
+            index=models.Index(condition=models.Q(('is_published', False), ('publish_at__isnull', False)), fields=['publish_at'], name='royal_message_publish_due_idx'),
+        ),
+    ]
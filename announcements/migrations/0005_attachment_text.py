@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0004_scheduled_publishing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentText',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attachment_text', serialize=False, to='announcements.announcement')),
+                ('source', models.CharField(max_length=255, verbose_name='Attachment')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('extracted', 'Extracted'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('text', models.TextField(blank=True, verbose_name='Extracted Text')),
+                ('page_count', models.PositiveIntegerField(default=0, verbose_name='Pages Read')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('error', models.CharField(blank=True, max_length=255, verbose_name='Error')),
+                ('queued_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Queued')),
+                ('extracted_at', models.DateTimeField(blank=True, null=True, verbose_name='Extracted')),
+            ],
+            options={
+                'verbose_name': 'Attachment Text',
+                'verbose_name_plural': 'Attachment Texts',
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['queued_at'], name='attachment_text_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:21
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+
+
+def fill_archive(apps, schema_editor):
+    Announcement = apps.get_model('announcements', 'Announcement')
+    RoyalMessage = apps.get_model('announcements', 'RoyalMessage')
+    AnnouncementArchiveMonth = apps.get_model('announcements', 'AnnouncementArchiveMonth')
+    # Published announcements are now always dated; file undated ones by creation
+    Announcement.objects.filter(is_published=True, publish_date__isnull=True).update(publish_date=F('created_at'))
+    rows = []
+    for kind, model, date_field in [
+        ('announcement', Announcement, 'publish_date'),
+        ('royal_message', RoyalMessage, 'message_date'),
+    ]:
+        totals = model.objects.filter(is_published=True).annotate(
+            period=TruncMonth(date_field)
+        ).order_by().values('period').annotate(total=Count('pk'))
+        rows += [
+            AnnouncementArchiveMonth(kind=kind, year=row['period'].year, month=row['period'].month, item_count=row['total'])
+            for row in totals
+        ]
+    AnnouncementArchiveMonth.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('announcements', '0005_attachment_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('announcement', 'Announcements'), ('royal_message', 'Royal Messages')], max_length=20, verbose_name='Kind')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Year')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Month')),
+                ('item_count', models.PositiveIntegerField(default=0, verbose_name='Items')),
+            ],
+            options={
+                'verbose_name': 'Announcement Archive Month',
+                'verbose_name_plural': 'Announcement Archive Months',
+                'ordering': ['kind', '-year', '-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['publish_date'], name='announcement_archive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='royalmessage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['message_date'], name='royal_message_archive_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='announcementarchivemonth',
+            constraint=models.UniqueConstraint(fields=('kind', 'year', 'month'), name='announcement_archive_month_unique'),
+        ),
+        migrations.RunPython(fill_archive, migrations.RunPython.noop),
+    ]
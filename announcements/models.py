@@ -2,8 +2,10 @@
 Models for Royal Announcements and Palace News.
 """
 
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.conf import settings
 from cloudinary.models import CloudinaryField
 
@@ -21,6 +23,13 @@ class AnnouncementCategory(models.Model):
         help_text='Bootstrap color class (primary, success, warning, danger, info)'
     )
     
+    # Maintained by announcements.signals; repaired by `manage.py recount`
+    published_count = models.PositiveIntegerField(
+        'Published Announcements',
+        default=0,
+        editable=False
+    )
+    
     class Meta:
         verbose_name = 'Announcement Category'
         verbose_name_plural = 'Announcement Categories'
@@ -94,6 +103,12 @@ class Announcement(models.Model):
     is_featured = models.BooleanField('Featured on Homepage', default=False)
     is_pinned = models.BooleanField('Pinned (Always Show First)', default=False)
     publish_date = models.DateTimeField('Publish Date', null=True, blank=True)
+    publish_at = models.DateTimeField(
+        'Scheduled Publish Time',
+        null=True,
+        blank=True,
+        help_text='Leave unpublished and set a time to publish automatically'
+    )
     
     # Metrics
     view_count = models.PositiveIntegerField('View Count', default=0)
@@ -102,10 +117,30 @@ class Announcement(models.Model):
     created_at = models.DateTimeField('Created', auto_now_add=True)
     updated_at = models.DateTimeField('Updated', auto_now=True)
     
+    # Maintained by palace.related
+    related_entries = GenericRelation('palace.RelatedItem', object_id_field='target_id')
+    
     class Meta:
         verbose_name = 'Announcement'
         verbose_name_plural = 'Announcements'
         ordering = ['-is_pinned', '-publish_date', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['-is_pinned', '-publish_date', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='announcement_published_idx'
+            ),
+            models.Index(
+                fields=['publish_at'],
+                condition=models.Q(is_published=False, publish_at__isnull=False),
+                name='announcement_publish_due_idx'
+            ),
+            models.Index(
+                fields=['publish_date'],
+                condition=models.Q(is_published=True),
+                name='announcement_archive_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -146,6 +181,12 @@ class RoyalMessage(models.Model):
     # Status
     is_published = models.BooleanField('Published', default=False)
     is_featured = models.BooleanField('Featured', default=False)
+    publish_at = models.DateTimeField(
+        'Scheduled Publish Time',
+        null=True,
+        blank=True,
+        help_text='Leave unpublished and set a time to publish automatically'
+    )
     
     # Timestamps
     message_date = models.DateField('Message Date')
@@ -156,9 +197,109 @@ class RoyalMessage(models.Model):
         verbose_name = 'Royal Message'
         verbose_name_plural = 'Royal Messages'
         ordering = ['-message_date']
+        indexes = [
+            models.Index(
+                fields=['publish_at'],
+                condition=models.Q(is_published=False, publish_at__isnull=False),
+                name='royal_message_publish_due_idx'
+            ),
+            models.Index(
+                fields=['message_date'],
+                condition=models.Q(is_published=True),
+                name='royal_message_archive_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Royal Message: {self.title}"
     
     def get_absolute_url(self):
         return reverse('announcements:royal_message', kwargs={'pk': self.pk})
+
+
+class AttachmentText(models.Model):
+    """
+    Text extracted from an announcement's PDF attachment.
+    
+    Rows are queued when an attachment is uploaded and filled in by the
+    ``extract_attachments`` command (see announcements.attachments); the
+    text is searched together with the announcement itself.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        EXTRACTED = 'extracted', 'Extracted'
+        SKIPPED = 'skipped', 'Skipped'
+        FAILED = 'failed', 'Failed'
+    
+    announcement = models.OneToOneField(
+        Announcement,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='attachment_text'
+    )
+    source = models.CharField('Attachment', max_length=255)
+    status = models.CharField(
+        'Status',
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    text = models.TextField('Extracted Text', blank=True)
+    page_count = models.PositiveIntegerField('Pages Read', default=0)
+    attempts = models.PositiveSmallIntegerField('Attempts', default=0)
+    error = models.CharField('Error', max_length=255, blank=True)
+    queued_at = models.DateTimeField('Queued', default=timezone.now)
+    extracted_at = models.DateTimeField('Extracted', null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Attachment Text'
+        verbose_name_plural = 'Attachment Texts'
+        indexes = [
+            models.Index(
+                fields=['queued_at'],
+                condition=models.Q(status='pending'),
+                name='attachment_text_pending_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f'Attachment text: {self.announcement}'
+
+
+class AnnouncementArchiveMonth(models.Model):
+    """
+    Published announcements and royal messages per local calendar month.
+    
+    Backs the archive navigation of both lists. Maintained by
+    ``announcements.signals``; ``rebuild_announcement_archive`` recomputes
+    it in full.
+    """
+    
+    class Kind(models.TextChoices):
+        ANNOUNCEMENT = 'announcement', 'Announcements'
+        ROYAL_MESSAGE = 'royal_message', 'Royal Messages'
+    
+    kind = models.CharField('Kind', max_length=20, choices=Kind.choices)
+    year = models.PositiveSmallIntegerField('Year')
+    month = models.PositiveSmallIntegerField('Month')
+    item_count = models.PositiveIntegerField('Items', default=0)
+    
+    class Meta:
+        verbose_name = 'Announcement Archive Month'
+        verbose_name_plural = 'Announcement Archive Months'
+        ordering = ['kind', '-year', '-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'year', 'month'],
+                name='announcement_archive_month_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.year}-{self.month:02d} ({self.item_count})"
+    
+    @property
+    def month_name(self):
+        import calendar
+        return calendar.month_name[self.month]
@@ -0,0 +1,59 @@
+"""
+Local PDF text extraction.
+
+Run as ``python -m announcements.pdftext FILE --max-pages N --max-chars N``;
+prints the number of pages read on the first line and the normalized
+text after it. The module imports no Django code so
+``announcements.attachments`` can run it in a child process under a
+memory limit and a timeout, keeping malformed or huge PDFs away from the
+worker's own memory.
+"""
+
+import argparse
+import re
+import sys
+
+
+HYPHENATED = re.compile(r'(\w)-\s*\n\s*(\w)')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize(text):
+    """Rejoin words hyphenated across lines and collapse whitespace."""
+    return WHITESPACE.sub(' ', HYPHENATED.sub(r'\1\2', text)).strip()
+
+
+def extract(path, max_pages, max_chars):
+    """Return ``(text, pages_read)``, stopping at ``max_pages`` or ``max_chars``."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Many official PDFs are "encrypted" with an empty user password
+        reader.decrypt('')
+
+    parts, size, pages = [], 0, 0
+    for number in range(min(len(reader.pages), max_pages)):
+        text = normalize(reader.pages[number].extract_text() or '')
+        pages += 1
+        if text:
+            parts.append(text)
+            size += len(text) + 1
+        if size >= max_chars:
+            break
+    return ' '.join(parts)[:max_chars], pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract text from a PDF file.')
+    parser.add_argument('path')
+    parser.add_argument('--max-pages', type=int, default=200)
+    parser.add_argument('--max-chars', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    text, pages = extract(args.path, args.max_pages, args.max_chars)
+    sys.stdout.buffer.write(f'{pages}\n{text}'.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Signal handlers for the announcements app.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from ejeh_palace import live
+from palace import caching
+from palace.counters import track_category_count
+from palace.publishing import schedule_publishing
+from palace.related import track_related
+from palace.snapshots import previous_row, track_previous
+
+from .archive import SOURCES, kind_of, period_of, refresh_months
+from .attachments import queue as queue_attachment
+from .models import Announcement, AnnouncementCategory, RoyalMessage
+
+
+# Cache generation for anything that embeds announcements or royal messages
+GENERATION = 'announcements'
+
+
+# One stored-row lookup per save, shared by the pre_save handlers below
+track_previous(Announcement)
+track_previous(RoyalMessage)
+
+
+track_category_count(
+    Announcement,
+    category_field='category',
+    counter_field='published_count',
+    is_counted=lambda announcement: announcement.is_published,
+)
+
+
+track_related(
+    Announcement,
+    fields={'title': 3, 'excerpt': 1, 'content': 1},
+    live={'is_published': True},
+    limit=3,
+)
+
+
+def stamp_publish_date(announcement):
+    if not announcement.publish_date:
+        announcement.publish_date = announcement.publish_at
+
+
+schedule_publishing(
+    Announcement,
+    generations=[GENERATION],
+    pages=['announcements:list', 'announcements:feed_rss', 'announcements:feed_atom', 'palace:home'],
+    on_publish=stamp_publish_date,
+)
+schedule_publishing(
+    RoyalMessage,
+    generations=[GENERATION],
+    pages=[
+        'announcements:royal_messages',
+        'announcements:royal_messages_rss',
+        'announcements:royal_messages_atom',
+    ],
+)
+
+
+@receiver([post_save, post_delete], sender=Announcement)
+@receiver([post_save, post_delete], sender=AnnouncementCategory)
+@receiver([post_save, post_delete], sender=RoyalMessage)
+def invalidate_announcements(sender, **kwargs):
+    caching.bump(GENERATION)
+
+
+@receiver(post_save, sender=Announcement, dispatch_uid='announcements.attachment_text')
+def queue_attachment_text(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Queue text extraction for new attachments; the upload itself stays fast."""
+    if raw or (update_fields is not None and 'attachment' not in update_fields):
+        return
+    queue_attachment(instance)
+
+
+def _is_live_urgent(published, priority):
+    return published and priority == Announcement.Priority.URGENT
+
+
+@receiver(pre_save, sender=Announcement, dispatch_uid='announcements.live.pre_save')
+def remember_urgency(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._was_live_urgent = True
+    if raw or (update_fields is not None and not {'is_published', 'priority'} & set(update_fields)):
+        return
+    previous = previous_row(instance)
+    instance._was_live_urgent = bool(previous) and _is_live_urgent(previous.is_published, previous.priority)
+
+
+@receiver(post_save, sender=Announcement, dispatch_uid='announcements.live.post_save')
+def push_urgent_announcement(sender, instance, raw=False, **kwargs):
+    """Tell connected browsers when an urgent announcement goes live."""
+    if raw or getattr(instance, '_was_live_urgent', True):
+        return
+    if _is_live_urgent(instance.is_published, instance.priority):
+        live.publish('urgent', {
+            'id': instance.pk,
+            'title': instance.title,
+            'excerpt': instance.excerpt,
+            'url': instance.get_absolute_url(),
+        })
+
+
+@receiver(pre_save, sender=Announcement, dispatch_uid='announcements.publish_date')
+def stamp_publish_date_on_publish(sender, instance, raw=False, **kwargs):
+    """Date announcements when they go live so they are filed in the archive."""
+    if instance.is_published and not instance.publish_date and not raw:
+        instance.publish_date = timezone.now()
+
+
+@receiver(pre_save, sender=Announcement, dispatch_uid='announcements.archive.pre_save')
+@receiver(pre_save, sender=RoyalMessage, dispatch_uid='announcements.archive.royal_pre_save')
+def remember_archive_period(sender, instance, raw=False, update_fields=None, **kwargs):
+    date_field = SOURCES[kind_of(sender)].date_field
+    instance._archive_unchanged = raw or (
+        update_fields is not None and not {'is_published', date_field} & set(update_fields)
+    )
+    previous = None if instance._archive_unchanged else previous_row(instance)
+    instance._archive_period = period_of(previous) if previous else None
+
+
+@receiver(post_save, sender=Announcement, dispatch_uid='announcements.archive.post_save')
+@receiver(post_save, sender=RoyalMessage, dispatch_uid='announcements.archive.royal_post_save')
+def update_archive_on_save(sender, instance, raw=False, **kwargs):
+    """Recount the archive months an item moved out of and into."""
+    if raw or getattr(instance, '_archive_unchanged', False):
+        return
+    before, after = getattr(instance, '_archive_period', None), period_of(instance)
+    if before != after:
+        refresh_months(period for period in (before, after) if period)
+
+
+@receiver(post_delete, sender=Announcement, dispatch_uid='announcements.archive.post_delete')
+@receiver(post_delete, sender=RoyalMessage, dispatch_uid='announcements.archive.royal_post_delete')
+def update_archive_on_delete(sender, instance, **kwargs):
+    period = period_of(instance)
+    if period:
+        refresh_months([period])
@@ -0,0 +1,58 @@
+"""
+Tests for the announcement archive views and save signals.
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Announcement, AnnouncementCategory
+
+
+class ArchivePeriodTests(TestCase):
+
+    def get(self, **kwargs):
+        name = 'announcements:archive_month' if 'month' in kwargs else 'announcements:archive_year'
+        return self.client.get(reverse(name, kwargs=kwargs))
+
+    def test_years_outside_the_calendar_are_not_found(self):
+        for kwargs in ({'year': 0}, {'year': 1}, {'year': 1, 'month': 1}, {'year': 9999}, {'year': 9999, 'month': 12}):
+            with self.subTest(**kwargs):
+                self.assertEqual(self.get(**kwargs).status_code, 404)
+
+    def test_first_and_last_supported_years_render(self):
+        for kwargs in ({'year': 2, 'month': 1}, {'year': 9998, 'month': 12}):
+            with self.subTest(**kwargs):
+                self.assertEqual(self.get(**kwargs).status_code, 200)
+
+
+class SaveSignalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = AnnouncementCategory.objects.create(name='Notices', slug='notices')
+        cls.announcement = Announcement.objects.create(
+            title='Palace market notice',
+            slug='market-notice',
+            content='The palace market opens early for the new yam festival.',
+            category=cls.category,
+        )
+
+    def test_stored_row_is_fetched_once_per_save(self):
+        lookup = f'WHERE "announcements_announcement"."id" = {self.announcement.pk}'
+        with mock.patch('ejeh_palace.live.publish') as publish:
+            with CaptureQueriesContext(connection) as queries:
+                self.announcement.is_published = True
+                self.announcement.priority = Announcement.Priority.URGENT
+                self.announcement.save()
+        self.assertEqual(
+            sum(query['sql'].startswith('SELECT') and lookup in query['sql'] for query in queries), 1
+        )
+
+        # Every handler still saw the stored row
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.published_count, 1)
+        self.assertEqual(publish.call_args[0][0], 'urgent')
@@ -3,16 +3,37 @@ URL patterns for announcements app.
 """
 
 from django.urls import path
-from . import views
+from . import feeds, views
+from .models import AnnouncementArchiveMonth
 
 app_name = 'announcements'
 
+ROYAL_MESSAGE = AnnouncementArchiveMonth.Kind.ROYAL_MESSAGE
+
 urlpatterns = [
     # Public views
     path('', views.AnnouncementListView.as_view(), name='list'),
     path('detail/<slug:slug>/', views.AnnouncementDetailView.as_view(), name='detail'),
     path('royal-messages/', views.RoyalMessageListView.as_view(), name='royal_messages'),
     path('royal-message/<int:pk>/', views.RoyalMessageDetailView.as_view(), name='royal_message'),
+    path('archive/', views.AnnouncementArchiveView.as_view(), name='archive'),
+    path('archive/<int:year>/', views.AnnouncementArchivePeriodView.as_view(), name='archive_year'),
+    path('archive/<int:year>/<int:month>/', views.AnnouncementArchivePeriodView.as_view(), name='archive_month'),
+    path('royal-messages/archive/', views.AnnouncementArchiveView.as_view(kind=ROYAL_MESSAGE),
+         name='royal_message_archive'),
+    path('royal-messages/archive/<int:year>/', views.AnnouncementArchivePeriodView.as_view(kind=ROYAL_MESSAGE),
+         name='royal_message_archive_year'),
+    path('royal-messages/archive/<int:year>/<int:month>/',
+         views.AnnouncementArchivePeriodView.as_view(kind=ROYAL_MESSAGE),
+         name='royal_message_archive_month'),
+    path('feeds/announcements.rss', feeds.announcements_rss, name='feed_rss'),
+    path('feeds/announcements.atom', feeds.announcements_atom, name='feed_atom'),
+    path('feeds/category/<slug:slug>.rss', feeds.category_rss, name='category_feed_rss'),
+    path('feeds/category/<slug:slug>.atom', feeds.category_atom, name='category_feed_atom'),
+    path('feeds/type/<slug:announcement_type>.rss', feeds.type_rss, name='type_feed_rss'),
+    path('feeds/type/<slug:announcement_type>.atom', feeds.type_atom, name='type_feed_atom'),
+    path('feeds/royal-messages.rss', feeds.royal_messages_rss, name='royal_messages_rss'),
+    path('feeds/royal-messages.atom', feeds.royal_messages_atom, name='royal_messages_atom'),
     
     # Admin views
     path('admin/manage/', views.AnnouncementManageListView.as_view(), name='admin_manage'),
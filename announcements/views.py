@@ -2,17 +2,23 @@
 Views for announcements app.
 """
 
+from datetime import datetime
+
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import (
-    ListView, DetailView, CreateView, UpdateView, DeleteView
+    ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 )
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import F, Q
+
+from palace import related
 
-from .models import Announcement, RoyalMessage, AnnouncementCategory
+from .archive import archive_months, archive_years, period_items
+from .models import Announcement, AnnouncementArchiveMonth, RoyalMessage, AnnouncementCategory
 from .forms import AnnouncementForm, RoyalMessageForm
 
 
@@ -52,7 +58,8 @@ class AnnouncementListView(ListView):
             queryset = queryset.filter(
                 Q(title__icontains=search) |
                 Q(content__icontains=search) |
-                Q(excerpt__icontains=search)
+                Q(excerpt__icontains=search) |
+                Q(attachment_text__text__icontains=search)
             )
         
         return queryset
@@ -85,14 +92,16 @@ class AnnouncementDetailView(DetailView):
     
     def get_object(self):
         obj = super().get_object()
+        # A plain UPDATE: no save() signals, and concurrent views are not lost
+        Announcement.objects.filter(pk=obj.pk).update(view_count=F('view_count') + 1)
         obj.view_count += 1
-        obj.save(update_fields=['view_count'])
         return obj
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['related_announcements'] = Announcement.objects.filter(
-            is_published=True,
+        published = Announcement.objects.filter(is_published=True)
+        # Fall back to the same category when nothing shares enough text
+        context['related_announcements'] = list(related.similar(self.object, published)[:3]) or published.filter(
             category=self.object.category
         ).exclude(pk=self.object.pk)[:3]
         return context
@@ -123,6 +132,87 @@ class RoyalMessageDetailView(DetailView):
         return RoyalMessage.objects.filter(is_published=True)
 
 
+ARCHIVE_URLS = {
+    AnnouncementArchiveMonth.Kind.ANNOUNCEMENT: {
+        'list': 'announcements:list',
+        'archive': 'announcements:archive',
+        'year': 'announcements:archive_year',
+        'month': 'announcements:archive_month',
+    },
+    AnnouncementArchiveMonth.Kind.ROYAL_MESSAGE: {
+        'list': 'announcements:royal_messages',
+        'archive': 'announcements:royal_message_archive',
+        'year': 'announcements:royal_message_archive_year',
+        'month': 'announcements:royal_message_archive_month',
+    },
+}
+
+
+class ArchiveKindMixin:
+    """Shared context for the announcement and royal message archives."""
+    
+    kind = AnnouncementArchiveMonth.Kind.ANNOUNCEMENT
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['kind'] = self.kind
+        context['kind_label'] = AnnouncementArchiveMonth.Kind(self.kind).label
+        context['archive_urls'] = ARCHIVE_URLS[self.kind]
+        return context
+
+
+class AnnouncementArchiveView(ArchiveKindMixin, TemplateView):
+    """Archive landing page: item counts per year and month."""
+    
+    template_name = 'announcements/archive.html'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['archive_years'] = archive_years(archive_months(self.kind))
+        return context
+
+
+class AnnouncementArchivePeriodView(ArchiveKindMixin, ListView):
+    """Announcements or royal messages of one archived year or month."""
+    
+    template_name = 'announcements/archive_period.html'
+    context_object_name = 'items'
+    paginate_by = 12
+    
+    def get_queryset(self):
+        self.year = self.kwargs['year']
+        self.month = self.kwargs.get('month')
+        if self.month is not None and not 1 <= self.month <= 12:
+            raise Http404('Invalid month.')
+        # Bounds run to the start of the next year, and local year 1 begins
+        # before datetime.min in UTC east of Greenwich
+        if not 2 <= self.year <= 9998:
+            raise Http404('Invalid year.')
+        return period_items(self.kind, self.year, self.month)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        months = list(archive_months(self.kind))
+        context['archive_years'] = archive_years(months)
+        context['year'] = self.year
+        context['month'] = self.month
+        if self.month is not None:
+            context['period_label'] = f"{datetime(self.year, self.month, 1):%B} {self.year}"
+        else:
+            context['period_label'] = str(self.year)
+            context['year_months'] = sorted(
+                (row for row in months if row.year == self.year), key=lambda row: row.month
+            )
+        
+        # Neighbouring periods that have items; the histogram is newest first
+        periods = [(row.year, row.month) for row in months]
+        if self.month is not None and (self.year, self.month) in periods:
+            index = periods.index((self.year, self.month))
+            context['newer_period'] = periods[index - 1] if index > 0 else None
+            context['older_period'] = periods[index + 1] if index + 1 < len(periods) else None
+        return context
+
+
 # ============== ADMIN VIEWS ==============
 
 class AnnouncementCreateView(AdminRequiredMixin, CreateView):
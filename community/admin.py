@@ -3,7 +3,9 @@ Admin configuration for community app.
 """
 
 from django.contrib import admin
-from .models import ContactMessage, PublicFeedback, Newsletter
+from django.utils import timezone
+from .archive import restore_message
+from .models import ArchivedContactMessage, ContactMessage, EmailNotification, PublicFeedback, Newsletter
 
 
 @admin.register(ContactMessage)
@@ -38,6 +40,41 @@ class ContactMessageAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ArchivedContactMessage)
+class ArchivedContactMessageAdmin(admin.ModelAdmin):
+    """Read-only admin for messages in cold storage."""
+    
+    list_display = [
+        'subject', 'full_name', 'email', 'message_type',
+        'is_responded', 'created_at', 'archived_at'
+    ]
+    list_filter = ['message_type', 'is_responded']
+    search_fields = ['subject', 'full_name', 'email']
+    date_hierarchy = 'created_at'
+    fields = [
+        'full_name', 'email', 'subject', 'message_type',
+        'is_responded', 'created_at', 'archived_at', 'message_text'
+    ]
+    readonly_fields = fields
+    
+    actions = ['restore_messages']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def message_text(self, obj):
+        return obj.to_message().message
+    message_text.short_description = "Message"
+    
+    def restore_messages(self, request, queryset):
+        for archived in queryset:
+            restore_message(archived.pk)
+    restore_messages.short_description = "Restore selected messages to inbox"
+
+
 @admin.register(PublicFeedback)
 class PublicFeedbackAdmin(admin.ModelAdmin):
     """Admin for public feedback."""
@@ -69,3 +106,29 @@ class NewsletterAdmin(admin.ModelAdmin):
     list_filter = ['is_active']
     search_fields = ['email', 'name']
     date_hierarchy = 'subscribed_at'
+
+
+@admin.register(EmailNotification)
+class EmailNotificationAdmin(admin.ModelAdmin):
+    """Admin for the notification outbox."""
+    
+    list_display = ['subject', 'recipient', 'kind', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['recipient', 'subject']
+    date_hierarchy = 'created_at'
+    readonly_fields = [
+        'kind', 'contact_message', 'recipient', 'reply_to', 'subject', 'body', 'status',
+        'attempts', 'next_attempt_at', 'last_error', 'created_at', 'sent_at'
+    ]
+    exclude = ['claimed_by', 'claimed_at']
+    actions = ['retry_notifications']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Retry selected failed notifications')
+    def retry_notifications(self, request, queryset):
+        retried = queryset.filter(status=EmailNotification.Status.FAILED).update(
+            status=EmailNotification.Status.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{retried} notification(s) queued again.')
@@ -0,0 +1,134 @@
+"""
+Hot/cold archival for contact messages.
+
+Archived or responded messages older than ``CONTACT_ARCHIVE_AFTER_DAYS``
+are moved from ``ContactMessage`` (hot) into ``ArchivedContactMessage``
+(cold) so the inbox table, its indexes and the unread count stay small.
+Lookups that miss the hot table fall back to the archive, so detail
+pages, search and the admin keep working for archived messages.
+"""
+
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ArchivedContactMessage, ContactMessage
+
+
+def pack(message):
+    """Serialize a message into a compressed JSON payload."""
+    data = serializers.serialize('json', [message])
+    return zlib.compress(data.encode('utf-8'), 9)
+
+
+def unpack(payload):
+    """Rebuild an unsaved ``ContactMessage`` from a payload."""
+    data = zlib.decompress(bytes(payload)).decode('utf-8')
+    message = next(serializers.deserialize('json', data)).object
+    message.is_cold = True
+    return message
+
+
+def archivable(days=None, now=None):
+    """Hot messages old enough to move to the archive."""
+    if days is None:
+        days = getattr(settings, 'CONTACT_ARCHIVE_AFTER_DAYS', 365)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return ContactMessage.objects.filter(
+        Q(is_archived=True) | Q(is_responded=True),
+        created_at__lt=cutoff,
+    )
+
+
+def archive_messages(days=None, batch_size=500, now=None):
+    """Move archivable messages to cold storage; returns the number moved."""
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(archivable(days, now).order_by('pk')[:batch_size])
+            if not batch:
+                return moved
+            ArchivedContactMessage.objects.bulk_create([
+                ArchivedContactMessage(
+                    id=message.pk,
+                    full_name=message.full_name,
+                    email=message.email,
+                    subject=message.subject,
+                    message_type=message.message_type,
+                    is_read=message.is_read,
+                    is_responded=message.is_responded,
+                    is_archived=message.is_archived,
+                    created_at=message.created_at,
+                    payload=pack(message),
+                )
+                for message in batch
+            ], ignore_conflicts=True)
+            ContactMessage.objects.filter(pk__in=[m.pk for m in batch]).delete()
+        moved += len(batch)
+
+
+def restore_message(pk):
+    """Move an archived message back into the hot table and return it."""
+    with transaction.atomic():
+        archived = ArchivedContactMessage.objects.select_for_update().get(pk=pk)
+        message = archived.to_message()
+        # save_base with raw=True keeps auto_now/auto_now_add values intact
+        message.save_base(raw=True, force_insert=True)
+        archived.delete()
+    message.is_cold = False
+    return message
+
+
+def get_message(pk):
+    """Return a message from the hot table, falling back to the archive."""
+    try:
+        return ContactMessage.objects.get(pk=pk)
+    except ContactMessage.DoesNotExist:
+        return ArchivedContactMessage.objects.get(pk=pk).to_message()
+
+
+def search_archive(term):
+    """Archived messages whose sender or subject matches ``term``."""
+    return ArchivedContactMessage.objects.filter(
+        Q(subject__icontains=term) |
+        Q(full_name__icontains=term) |
+        Q(email__icontains=term)
+    )
+
+
+class HotColdList:
+    """
+    Paginator-friendly sequence over hot rows followed by cold rows.
+
+    Archived rows are always older than the archival cutoff, so listing
+    the hot queryset first and the cold one after keeps ``-created_at``
+    order. Cold rows are unpacked to ``ContactMessage`` instances.
+    """
+
+    def __init__(self, hot, cold):
+        self.hot = hot
+        self.cold = cold
+
+    def count(self):
+        if not hasattr(self, '_counts'):
+            self._counts = (self.hot.count(), self.cold.count())
+        return sum(self._counts)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        hot_count = self.count() and self._counts[0]
+        start, stop = key.start or 0, key.stop if key.stop is not None else self.count()
+        items = list(self.hot[start:min(stop, hot_count)]) if start < hot_count else []
+        cold_start, cold_stop = max(start - hot_count, 0), max(stop - hot_count, 0)
+        if cold_stop > cold_start:
+            items += [row.to_message() for row in self.cold[cold_start:cold_stop]]
+        return items
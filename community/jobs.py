@@ -0,0 +1,20 @@
+"""
+Periodic maintenance jobs for the community app (see palace.scheduler).
+"""
+
+from palace.scheduler import periodic
+
+from .archive import archive_messages
+from .notifications import send_pending
+
+
+@periodic(every=24 * 60 * 60, queue=True)
+def archive_old_messages():
+    """Move old archived or responded contact messages to cold storage."""
+    archive_messages()
+
+
+@periodic(every=60)
+def send_notifications():
+    """Send notification emails that are due for a retry."""
+    send_pending()
@@ -0,0 +1,38 @@
+"""
+Management command to move old contact messages to cold storage.
+
+Archived or responded messages older than ``CONTACT_ARCHIVE_AFTER_DAYS``
+are compressed into ``ArchivedContactMessage`` and removed from the inbox
+table. Schedule it daily or weekly; each batch runs in its own transaction.
+"""
+
+from django.core.management.base import BaseCommand
+
+from community.archive import archivable, archive_messages
+
+
+class Command(BaseCommand):
+    help = 'Move old archived or responded contact messages to cold storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Archive messages older than this many days (default: CONTACT_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Messages moved per transaction',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report how many messages would be archived',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            pending = archivable(options['days']).count()
+            self.stdout.write(self.style.NOTICE(f'{pending} messages would be archived.'))
+            return
+
+        moved = archive_messages(options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} messages.'))
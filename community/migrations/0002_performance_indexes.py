@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['-created_at'], name='contact_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-created_at'], name='contact_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_archived', 'is_read', '-created_at'], name='contact_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-subscribed_at'], name='newsletter_active_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0002_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedContactMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Original ID')),
+                ('full_name', models.CharField(max_length=200, verbose_name='Full Name')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email Address')),
+                ('subject', models.CharField(max_length=300, verbose_name='Subject')),
+                ('message_type', models.CharField(choices=[('general', 'General Inquiry'), ('request', 'Request/Appeal'), ('feedback', 'Feedback'), ('complaint', 'Complaint'), ('suggestion', 'Suggestion'), ('media', 'Media/Press Inquiry'), ('other', 'Other')], default='general', max_length=20, verbose_name='Message Type')),
+                ('is_responded', models.BooleanField(default=False, verbose_name='Responded')),
+                ('payload', models.BinaryField(verbose_name='Compressed Message')),
+                ('created_at', models.DateTimeField(db_index=True, verbose_name='Received')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archived')),
+            ],
+            options={
+                'verbose_name': 'Archived Contact Message',
+                'verbose_name_plural': 'Archived Contact Messages',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
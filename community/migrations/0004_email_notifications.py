@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_contact_message_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('new_message', 'New Message Alert'), ('response', 'Response to Sender')], max_length=20, verbose_name='Kind')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Recipient')),
+                ('reply_to', models.EmailField(blank=True, max_length=254, verbose_name='Reply To')),
+                ('subject', models.CharField(max_length=300, verbose_name='Subject')),
+                ('body', models.TextField(verbose_name='Body')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next Attempt')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='Claimed By')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True, verbose_name='Claimed At')),
+                ('last_error', models.CharField(blank=True, max_length=500, verbose_name='Last Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Queued')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent')),
+                ('contact_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='community.contactmessage')),
+            ],
+            options={
+                'verbose_name': 'Email Notification',
+                'verbose_name_plural': 'Email Notifications',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at'], name='email_notification_due_idx'), models.Index(condition=models.Q(('status', 'sending')), fields=['claimed_at'], name='email_notification_sending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:44
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+
+def fill_status(apps, schema_editor):
+    ArchivedContactMessage = apps.get_model('community', 'ArchivedContactMessage')
+    # The flags were only kept in the compressed payload until now
+    for row in ArchivedContactMessage.objects.only('pk', 'payload').iterator():
+        fields = json.loads(zlib.decompress(bytes(row.payload)))[0]['fields']
+        ArchivedContactMessage.objects.filter(pk=row.pk).update(
+            is_read=fields.get('is_read', True),
+            is_archived=fields.get('is_archived', False),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0004_email_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcontactmessage',
+            name='is_archived',
+            field=models.BooleanField(default=False, verbose_name='Archived'),
+        ),
+        migrations.AddField(
+            model_name='archivedcontactmessage',
+            name='is_read',
+            field=models.BooleanField(default=True, verbose_name='Read'),
+        ),
+        migrations.RunPython(fill_status, migrations.RunPython.noop),
+    ]
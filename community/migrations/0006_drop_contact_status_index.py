@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0005_archived_message_status'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contactmessage',
+            name='contact_status_idx',
+        ),
+    ]
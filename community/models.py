@@ -4,6 +4,7 @@ Models for Community Engagement - Contact and Feedback.
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class ContactMessage(models.Model):
@@ -78,6 +79,18 @@ class ContactMessage(models.Model):
         verbose_name = 'Contact Message'
         verbose_name_plural = 'Contact Messages'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_archived=False),
+                name='contact_inbox_idx'
+            ),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_read=False),
+                name='contact_unread_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.subject} - {self.full_name}"
@@ -94,6 +107,48 @@ class ContactMessage(models.Model):
         return 'new'
 
 
+class ArchivedContactMessage(models.Model):
+    """
+    Cold storage for old archived or responded contact messages.
+    
+    Rows keep the original primary key and the columns the message list
+    filters and searches on; the full message is stored as zlib-compressed JSON in ``payload``. See
+    ``community.archive`` for moving rows in and out.
+    """
+    
+    id = models.BigIntegerField('Original ID', primary_key=True)
+    full_name = models.CharField('Full Name', max_length=200)
+    email = models.EmailField('Email Address')
+    subject = models.CharField('Subject', max_length=300)
+    message_type = models.CharField(
+        'Message Type',
+        max_length=20,
+        choices=ContactMessage.MessageType.choices,
+        default=ContactMessage.MessageType.GENERAL
+    )
+    is_read = models.BooleanField('Read', default=True)
+    is_responded = models.BooleanField('Responded', default=False)
+    is_archived = models.BooleanField('Archived', default=False)
+    payload = models.BinaryField('Compressed Message')
+    
+    # Timestamps
+    created_at = models.DateTimeField('Received', db_index=True)
+    archived_at = models.DateTimeField('Archived', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Archived Contact Message'
+        verbose_name_plural = 'Archived Contact Messages'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.subject} - {self.full_name}"
+    
+    def to_message(self):
+        """Return an unsaved ``ContactMessage`` rebuilt from the payload."""
+        from .archive import unpack
+        return unpack(self.payload)
+
+
 class PublicFeedback(models.Model):
     """
     Public feedback/testimonials that can be displayed on the website.
@@ -160,6 +215,81 @@ class Newsletter(models.Model):
         verbose_name = 'Newsletter Subscriber'
         verbose_name_plural = 'Newsletter Subscribers'
         ordering = ['-subscribed_at']
+        indexes = [
+            models.Index(
+                fields=['-subscribed_at'],
+                condition=models.Q(is_active=True),
+                name='newsletter_active_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.email
+
+
+class EmailNotification(models.Model):
+    """
+    An email waiting in (or sent from) the notification outbox.
+    
+    Rows are rendered when queued and sent in batches by a background task
+    (see community.notifications), so contact and reply requests never
+    wait on SMTP.
+    """
+    
+    class Kind(models.TextChoices):
+        NEW_MESSAGE = 'new_message', 'New Message Alert'
+        RESPONSE = 'response', 'Response to Sender'
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        SENDING = 'sending', 'Sending'
+        SENT = 'sent', 'Sent'
+        FAILED = 'failed', 'Failed'
+    
+    kind = models.CharField('Kind', max_length=20, choices=Kind.choices)
+    contact_message = models.ForeignKey(
+        ContactMessage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    recipient = models.EmailField('Recipient')
+    reply_to = models.EmailField('Reply To', blank=True)
+    subject = models.CharField('Subject', max_length=300)
+    body = models.TextField('Body')
+    
+    # Delivery
+    status = models.CharField(
+        'Status',
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Attempts', default=0)
+    next_attempt_at = models.DateTimeField('Next Attempt', default=timezone.now)
+    claimed_by = models.CharField('Claimed By', max_length=100, blank=True)
+    claimed_at = models.DateTimeField('Claimed At', null=True, blank=True)
+    last_error = models.CharField('Last Error', max_length=500, blank=True)
+    created_at = models.DateTimeField('Queued', auto_now_add=True)
+    sent_at = models.DateTimeField('Sent', null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Email Notification'
+        verbose_name_plural = 'Email Notifications'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                condition=models.Q(status='pending'),
+                name='email_notification_due_idx'
+            ),
+            models.Index(
+                fields=['claimed_at'],
+                condition=models.Q(status='sending'),
+                name='email_notification_sending_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.recipient}"
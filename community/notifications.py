@@ -0,0 +1,217 @@
+"""
+Email notifications for contact messages.
+
+New contact messages alert the palace admins and saved responses are
+mailed back to the sender. ``queue_*`` render each email into an
+``EmailNotification`` row and nudge the ``send_notifications`` background
+task, so the request only pays for a couple of inserts.
+
+``send_pending`` claims due rows in batches (a conditional ``UPDATE``, so
+concurrent senders never pick the same row) and sends them over one SMTP
+connection, reopening it if the server drops it. Failed sends are retried
+with exponential backoff up to ``NOTIFICATION_MAX_ATTEMPTS`` times;
+permanently refused recipients and malformed messages fail at once.
+"""
+
+import logging
+import os
+import smtplib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from palace.models import PalaceInfo, Task
+
+from .models import EmailNotification
+
+
+logger = logging.getLogger(__name__)
+
+
+# A sender that died mid-batch leaves rows in "sending"; retry them after this
+STALE_CLAIM = timedelta(minutes=10)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def admin_recipients():
+    """Addresses of active palace admins plus ``NOTIFICATION_ADMIN_EMAILS``."""
+    User = get_user_model()
+    emails = set(_setting('NOTIFICATION_ADMIN_EMAILS', []))
+    emails.update(
+        User.objects.filter(
+            is_active=True, role__in=[User.Role.EJEH, User.Role.PALACE_ADMIN]
+        ).exclude(email='').values_list('email', flat=True)
+    )
+    return sorted(emails)
+
+
+def _nudge():
+    """Queue a send task unless one is already waiting."""
+    from .tasks import send_notifications
+
+    waiting = Task.objects.filter(name=send_notifications.task_name, status=Task.Status.QUEUED)
+    if not waiting.exists():
+        send_notifications.enqueue()
+
+
+def _subject(text):
+    """One-line subject; a newline from the contact form would be a header injection."""
+    return ' '.join(text.splitlines())[:300]
+
+
+def queue_new_message_alert(message):
+    """Queue an alert about ``message`` for every palace admin."""
+    recipients = admin_recipients()
+    if not recipients:
+        return []
+    subject = _subject(f'New message: {message.subject}')
+    body = render_to_string('community/email/new_message_alert.txt', {
+        'message': message,
+        'site_url': _setting('SITE_URL', '').rstrip('/'),
+    })
+    rows = EmailNotification.objects.bulk_create([
+        EmailNotification(
+            kind=EmailNotification.Kind.NEW_MESSAGE,
+            contact_message=message,
+            recipient=recipient,
+            reply_to=message.email,
+            subject=subject,
+            body=body,
+        )
+        for recipient in recipients
+    ])
+    _nudge()
+    return rows
+
+
+def queue_response(message):
+    """Queue the palace's response to the sender of ``message``."""
+    if not message.response.strip():
+        return None
+    info = PalaceInfo.objects.first()
+    palace_name = info.palace_name if info else 'Ejeh Ankpa Palace'
+    row = EmailNotification.objects.create(
+        kind=EmailNotification.Kind.RESPONSE,
+        contact_message=message,
+        recipient=message.email,
+        subject=_subject(f'Re: {message.subject}'),
+        body=render_to_string('community/email/response.txt', {
+            'message': message,
+            'palace_name': palace_name,
+        }),
+    )
+    _nudge()
+    return row
+
+
+def requeue_stale(now=None):
+    """Put rows claimed by a sender that stopped back in the queue."""
+    now = now or timezone.now()
+    return EmailNotification.objects.filter(
+        status=EmailNotification.Status.SENDING, claimed_at__lt=now - STALE_CLAIM
+    ).update(status=EmailNotification.Status.PENDING, claimed_by='')
+
+
+def claim(limit, now=None):
+    """Mark up to ``limit`` due rows as being sent by us; returns them."""
+    now = now or timezone.now()
+    token = f'{os.getpid()}:{uuid.uuid4().hex[:8]}'
+    due = EmailNotification.objects.filter(
+        status=EmailNotification.Status.PENDING, next_attempt_at__lte=now
+    ).order_by('next_attempt_at', 'pk')
+    # Status is checked again by the UPDATE itself, so a row another sender
+    # claimed meanwhile is skipped.
+    claimed = EmailNotification.objects.filter(
+        pk__in=due.values('pk')[:limit], status=EmailNotification.Status.PENDING
+    ).update(status=EmailNotification.Status.SENDING, claimed_by=token, claimed_at=now)
+    if not claimed:
+        return []
+    return list(EmailNotification.objects.filter(
+        claimed_by=token, status=EmailNotification.Status.SENDING
+    ).order_by('pk'))
+
+
+def _finish(row, **fields):
+    EmailNotification.objects.filter(pk=row.pk, claimed_by=row.claimed_by).update(claimed_by='', **fields)
+
+
+def _failed(row, error, permanent=False):
+    attempts = row.attempts + 1
+    fields = {'attempts': attempts, 'last_error': str(error)[:500]}
+    if permanent or attempts >= _setting('NOTIFICATION_MAX_ATTEMPTS', 5):
+        fields['status'] = EmailNotification.Status.FAILED
+    else:
+        delay = _setting('NOTIFICATION_RETRY_SECONDS', 60) * 2 ** (attempts - 1)
+        fields['status'] = EmailNotification.Status.PENDING
+        fields['next_attempt_at'] = timezone.now() + timedelta(seconds=delay)
+    _finish(row, **fields)
+    logger.warning('Email notification %s to %s failed: %s', row.pk, row.recipient, error)
+
+
+def _send_batch(connection, rows):
+    """Send ``rows`` over ``connection``; returns ``(sent, failed, reachable)``."""
+    sent = failed = 0
+    for index, row in enumerate(rows):
+        try:
+            # No-op while the connection is open; reconnects after a failure
+            connection.open()
+        except (smtplib.SMTPException, OSError) as exc:
+            # Server unreachable: retry the rest later instead of timing out on each
+            for rest in rows[index:]:
+                _failed(rest, exc)
+            return sent, failed + len(rows) - index, False
+        try:
+            EmailMessage(
+                subject=row.subject,
+                body=row.body,
+                to=[row.recipient],
+                reply_to=[row.reply_to] if row.reply_to else None,
+                connection=connection,
+            ).send()
+        except smtplib.SMTPRecipientsRefused as exc:
+            # 5xx is final; 4xx (mailbox busy, greylisting) is worth another try
+            permanent = all(code >= 500 for code, _ in exc.recipients.values())
+            _failed(row, exc, permanent=permanent)
+            failed += 1
+        except ValueError as exc:
+            # Bad headers (BadHeaderError is a ValueError) fail the same way on
+            # every attempt; leaving the row in "sending" would stall the outbox
+            _failed(row, exc, permanent=True)
+            failed += 1
+        except (smtplib.SMTPException, OSError) as exc:
+            _failed(row, exc)
+            failed += 1
+            # The next row starts over on a fresh connection
+            connection.close()
+        else:
+            _finish(row, status=EmailNotification.Status.SENT, attempts=row.attempts + 1,
+                    last_error='', sent_at=timezone.now())
+            sent += 1
+    return sent, failed, True
+
+
+def send_pending(batch_size=None):
+    """Send every due notification; returns ``(sent, failed)`` counts."""
+    batch_size = batch_size or _setting('NOTIFICATION_BATCH_SIZE', 50)
+    requeue_stale()
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        while True:
+            rows = claim(batch_size)
+            batch_sent, batch_failed, reachable = _send_batch(connection, rows)
+            sent += batch_sent
+            failed += batch_failed
+            if not reachable or len(rows) < batch_size:
+                break
+    finally:
+        connection.close()
+    return sent, failed
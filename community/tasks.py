@@ -0,0 +1,13 @@
+"""
+Background tasks for the community app (see palace.taskqueue).
+"""
+
+from palace.taskqueue import task
+
+from . import notifications
+
+
+@task(max_attempts=1)
+def send_notifications():
+    """Send queued notification emails; failed ones are retried by the outbox itself."""
+    notifications.send_pending()
@@ -0,0 +1,280 @@
+"""
+Tests for contact message email notifications.
+
+SMTP behaviour is exercised against ``SMTPStub``, a minimal in-process
+SMTP server whose replies each test can script.
+"""
+
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import notifications
+from .models import ContactMessage, EmailNotification
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for ``smtplib``; replies come from the server."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        recipients = []
+        self.reply('220 stub ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 stub')
+            elif verb in ('MAIL', 'RSET'):
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                reply = server.rcpt_replies.get(address, '250 OK')
+                if reply.startswith('250'):
+                    recipients.append(address)
+                self.reply(reply)
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                while True:
+                    line = self.rfile.readline()
+                    if line in (b'.\r\n', b''):
+                        break
+                    data.append(line)
+                reply = server.data_replies.pop(0) if server.data_replies else '250 OK'
+                if reply.startswith('250'):
+                    server.messages.append((recipients, b''.join(data).decode()))
+                self.reply(reply)
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.reset()
+
+    def reset(self):
+        self.connections = 0
+        self.messages = []
+        self.rcpt_replies = {}
+        self.data_replies = []
+
+
+def closed_port():
+    """A local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def contact_message(**fields):
+    defaults = {
+        'full_name': 'Ada Okpe',
+        'email': 'ada@example.com',
+        'subject': 'Visiting the palace',
+        'message': 'When is the palace open to visitors?',
+    }
+    defaults.update(fields)
+    return ContactMessage.objects.create(**defaults)
+
+
+@override_settings(NOTIFICATION_ADMIN_EMAILS=['admin@example.com'], SITE_URL='https://palace.example')
+class QueueNotificationTests(TestCase):
+
+    def test_alert_is_rendered_and_sent(self):
+        message = contact_message()
+        rows = notifications.queue_new_message_alert(message)
+        self.assertEqual([row.recipient for row in rows], ['admin@example.com'])
+
+        self.assertEqual(notifications.send_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        sent = mail.outbox[0]
+        self.assertEqual(sent.subject, 'New message: Visiting the palace')
+        self.assertEqual(sent.reply_to, ['ada@example.com'])
+        self.assertIn('When is the palace open', sent.body)
+        self.assertEqual(EmailNotification.objects.get().status, EmailNotification.Status.SENT)
+
+    def test_response_needs_text(self):
+        message = contact_message()
+        self.assertIsNone(notifications.queue_response(message))
+        message.response = 'We open at 10am on weekdays.'
+        row = notifications.queue_response(message)
+        self.assertEqual(row.recipient, 'ada@example.com')
+        self.assertEqual(row.subject, 'Re: Visiting the palace')
+
+    def test_subject_newlines_are_flattened(self):
+        message = contact_message(subject='Hello\r\nBcc: everyone@example.com')
+        row, = notifications.queue_new_message_alert(message)
+        self.assertEqual(row.subject, 'New message: Hello Bcc: everyone@example.com')
+
+        self.assertEqual(notifications.send_pending(), (1, 0))
+        self.assertEqual(mail.outbox[0].bcc, [])
+
+
+class SMTPTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.smtp = SMTPStub()
+        threading.Thread(target=cls.smtp.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.smtp.shutdown()
+        cls.smtp.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.smtp.reset()
+        override = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.smtp.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='',
+            EMAIL_HOST_PASSWORD='',
+            EMAIL_TIMEOUT=5,
+            NOTIFICATION_MAX_ATTEMPTS=3,
+            NOTIFICATION_RETRY_SECONDS=60,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def queue(self, *recipients, subject='Hello'):
+        return EmailNotification.objects.bulk_create([
+            EmailNotification(
+                kind=EmailNotification.Kind.NEW_MESSAGE,
+                recipient=recipient,
+                subject=subject,
+                body='A new message arrived.',
+            )
+            for recipient in recipients
+        ])
+
+    def assertRow(self, row, status, attempts):
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (status, attempts))
+        self.assertEqual(row.claimed_by, '')
+        return row
+
+
+class SendPendingTests(SMTPTestCase):
+
+    def test_batch_shares_one_connection(self):
+        rows = self.queue(*[f'admin{n}@example.com' for n in range(6)])
+        self.assertEqual(notifications.send_pending(), (6, 0))
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(
+            sorted(recipients[0] for recipients, _ in self.smtp.messages),
+            sorted(row.recipient for row in rows),
+        )
+
+    def test_batches_continue_until_queue_is_empty(self):
+        self.queue(*[f'admin{n}@example.com' for n in range(5)])
+        self.assertEqual(notifications.send_pending(batch_size=2), (5, 0))
+        self.assertEqual(len(self.smtp.messages), 5)
+        self.assertFalse(EmailNotification.objects.exclude(status=EmailNotification.Status.SENT).exists())
+
+    def test_temporary_data_error_is_retried_with_backoff(self):
+        row, = self.queue('admin@example.com')
+        self.smtp.data_replies = ['451 Try again later']
+        before = timezone.now()
+        self.assertEqual(notifications.send_pending(), (0, 1))
+        row = self.assertRow(row, EmailNotification.Status.PENDING, 1)
+        self.assertIn('451', row.last_error)
+        self.assertGreaterEqual(row.next_attempt_at, before + timedelta(seconds=60))
+
+        # Not due yet
+        self.assertEqual(notifications.send_pending(), (0, 0))
+
+        # Second failure doubles the delay
+        EmailNotification.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+        self.smtp.data_replies = ['554 Transaction failed']
+        before = timezone.now()
+        notifications.send_pending()
+        row = self.assertRow(row, EmailNotification.Status.PENDING, 2)
+        self.assertGreaterEqual(row.next_attempt_at, before + timedelta(seconds=120))
+
+        # Succeeds on the next attempt
+        EmailNotification.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(notifications.send_pending(), (1, 0))
+        self.assertRow(row, EmailNotification.Status.SENT, 3)
+
+    def test_gives_up_after_max_attempts(self):
+        row, = self.queue('admin@example.com')
+        for attempt in range(3):
+            self.smtp.data_replies = ['451 Try again later']
+            EmailNotification.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now())
+            notifications.send_pending()
+        self.assertRow(row, EmailNotification.Status.FAILED, 3)
+
+    def test_failure_does_not_block_the_rest_of_the_batch(self):
+        first, second = self.queue('first@example.com', 'second@example.com')
+        self.smtp.data_replies = ['451 Try again later']
+        self.assertEqual(notifications.send_pending(), (1, 1))
+        self.assertRow(first, EmailNotification.Status.PENDING, 1)
+        self.assertRow(second, EmailNotification.Status.SENT, 1)
+        # The failed send closed the connection; the next row reconnected
+        self.assertEqual(self.smtp.connections, 2)
+
+    def test_refused_recipient_fails_permanently(self):
+        refused, accepted = self.queue('nobody@example.com', 'admin@example.com')
+        self.smtp.rcpt_replies = {'nobody@example.com': '550 No such user'}
+        self.assertEqual(notifications.send_pending(), (1, 1))
+        self.assertRow(refused, EmailNotification.Status.FAILED, 1)
+        self.assertRow(accepted, EmailNotification.Status.SENT, 1)
+
+    def test_busy_mailbox_is_retried(self):
+        row, = self.queue('busy@example.com')
+        self.smtp.rcpt_replies = {'busy@example.com': '450 Mailbox busy'}
+        notifications.send_pending()
+        self.assertRow(row, EmailNotification.Status.PENDING, 1)
+
+    def test_header_injection_fails_without_stalling(self):
+        bad, good = self.queue('admin@example.com', 'other@example.com', subject='Hi\nBcc: everyone@example.com')
+        EmailNotification.objects.filter(pk=good.pk).update(subject='Hi')
+        self.assertEqual(notifications.send_pending(), (1, 1))
+        bad = self.assertRow(bad, EmailNotification.Status.FAILED, 1)
+        self.assertIn('newline', bad.last_error.lower())
+        self.assertRow(good, EmailNotification.Status.SENT, 1)
+        self.assertFalse(EmailNotification.objects.filter(status=EmailNotification.Status.SENDING).exists())
+
+    def test_unreachable_server_defers_the_batch(self):
+        rows = self.queue('first@example.com', 'second@example.com')
+        before = timezone.now()
+        with override_settings(EMAIL_PORT=closed_port()):
+            self.assertEqual(notifications.send_pending(), (0, 2))
+        for row in rows:
+            row = self.assertRow(row, EmailNotification.Status.PENDING, 1)
+            self.assertGreaterEqual(row.next_attempt_at, before + timedelta(seconds=60))
+
+    def test_stale_claims_are_requeued(self):
+        row, = self.queue('admin@example.com')
+        EmailNotification.objects.filter(pk=row.pk).update(
+            status=EmailNotification.Status.SENDING,
+            claimed_by='gone:1',
+            claimed_at=timezone.now() - notifications.STALE_CLAIM - timedelta(minutes=1),
+        )
+        self.assertEqual(notifications.send_pending(), (1, 0))
+        self.assertRow(row, EmailNotification.Status.SENT, 1)
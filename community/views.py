@@ -10,9 +10,12 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
+from django.db.models import Q
 
-from .models import ContactMessage, PublicFeedback, Newsletter
+from . import notifications
+from .archive import HotColdList, get_message, restore_message, search_archive
+from .models import ArchivedContactMessage, ContactMessage, PublicFeedback, Newsletter
 from .forms import ContactForm, FeedbackForm, NewsletterForm, MessageResponseForm
 
 
@@ -35,6 +38,7 @@ class ContactView(CreateView):
     
     def form_valid(self, form):
         response = super().form_valid(form)
+        notifications.queue_new_message_alert(self.object)
         messages.success(
             self.request,
             'Your message has been sent successfully. We will respond as soon as possible.'
@@ -131,28 +135,37 @@ class MessageListView(AdminRequiredMixin, ListView):
     context_object_name = 'messages_list'
     paginate_by = 20
     
+    # Status filters apply to the hot table and to cold storage alike
+    STATUS_FILTERS = {
+        'unread': {'is_read': False},
+        'read': {'is_read': True, 'is_responded': False},
+        'responded': {'is_responded': True},
+        'archived': {'is_archived': True},
+    }
+    
     def get_queryset(self):
-        queryset = ContactMessage.objects.all()
-        
-        # Filter by status
         status = self.request.GET.get('status')
-        if status == 'unread':
-            queryset = queryset.filter(is_read=False)
-        elif status == 'read':
-            queryset = queryset.filter(is_read=True, is_responded=False)
-        elif status == 'responded':
-            queryset = queryset.filter(is_responded=True)
-        elif status == 'archived':
-            queryset = queryset.filter(is_archived=True)
-        else:
-            queryset = queryset.filter(is_archived=False)
+        filters = dict(self.STATUS_FILTERS.get(status, {'is_archived': False}))
         
         # Filter by type
         message_type = self.request.GET.get('type')
         if message_type:
-            queryset = queryset.filter(message_type=message_type)
+            filters['message_type'] = message_type
         
-        return queryset.order_by('-created_at')
+        queryset = ContactMessage.objects.filter(**filters)
+        cold = ArchivedContactMessage.objects.filter(**filters)
+        
+        search = self.request.GET.get('search', '').strip()
+        if search:
+            queryset = queryset.filter(
+                Q(subject__icontains=search) |
+                Q(full_name__icontains=search) |
+                Q(email__icontains=search)
+            )
+            cold = search_archive(search).filter(**filters)
+        
+        # Old messages continue into cold storage
+        return HotColdList(queryset.order_by('-created_at'), cold.order_by('-created_at'))
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -171,8 +184,11 @@ class MessageDetailView(AdminRequiredMixin, DetailView):
     context_object_name = 'message'
     
     def get_object(self):
-        obj = super().get_object()
-        if not obj.is_read:
+        try:
+            obj = get_message(self.kwargs['pk'])
+        except ArchivedContactMessage.DoesNotExist:
+            raise Http404('Message not found.')
+        if not obj.is_read and not getattr(obj, 'is_cold', False):
             obj.is_read = True
             obj.save(update_fields=['is_read'])
         return obj
@@ -186,12 +202,23 @@ class MessageResponseView(AdminRequiredMixin, UpdateView):
     template_name = 'community/admin/message_response.html'
     success_url = reverse_lazy('community:admin_messages')
     
+    def get_object(self):
+        try:
+            return get_message(self.kwargs['pk'])
+        except ArchivedContactMessage.DoesNotExist:
+            raise Http404('Message not found.')
+    
     def form_valid(self, form):
+        if getattr(form.instance, 'is_cold', False):
+            # Replying to an archived message brings it back to the inbox
+            restore_message(form.instance.pk)
         form.instance.responded_by = self.request.user
         form.instance.responded_at = timezone.now()
         form.instance.is_responded = True
+        response = super().form_valid(form)
+        notifications.queue_response(self.object)
         messages.success(self.request, 'Response saved successfully.')
-        return super().form_valid(form)
+        return response
 
 
 class FeedbackManageListView(AdminRequiredMixin, ListView):
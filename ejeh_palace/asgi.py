@@ -1,5 +1,8 @@
 """
 ASGI config for Ejeh Ankpa Palace Platform.
+
+Requests for ``LIVE_EVENTS_PATH`` are answered by the Server-Sent Events
+stream in ``ejeh_palace.live``; everything else goes to Django.
 """
 
 import os
@@ -8,4 +11,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ejeh_palace.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from .live import events_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if (
+        scope['type'] == 'http'
+        and settings.LIVE_EVENTS_ENABLED
+        and scope['path'] == settings.LIVE_EVENTS_PATH
+    ):
+        await events_stream(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
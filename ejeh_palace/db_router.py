@@ -0,0 +1,99 @@
+"""
+Database routing for the Ejeh Ankpa Palace Platform.
+
+Reads from anonymous public GET requests go to a read replica; everything
+else (writes, admin, logged-in users, migrations) stays on the primary.
+``ReplicaRoutingMiddleware`` decides per request and the router reads the
+decision from a context variable, so it works for sync and async views.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+_use_replica = ContextVar('use_replica', default=False)
+
+PIN_COOKIE = 'pin_primary'
+
+
+def replica_aliases():
+    """Return the configured replica database aliases."""
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+class ReplicaRouter:
+    """Send reads to a replica when the current request allows it."""
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+
+    def db_for_read(self, model, **hints):
+        if self.replicas and _use_replica.get():
+            return random.choice(self.replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any alias may relate
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Mark anonymous public GET/HEAD requests as safe to read from a replica.
+
+    Unsafe requests set a short-lived cookie that pins the browser to the
+    primary for ``REPLICA_PIN_SECONDS`` so users see their own writes
+    (read-your-writes) before replication catches up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 15)
+        self.excluded_paths = tuple(getattr(settings, 'REPLICA_EXCLUDED_PATHS', ()))
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = _use_replica.set(self.can_use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time()) + self.pin_seconds),
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite='Lax',
+                secure=request.is_secure(),
+            )
+        return response
+
+    def can_use_replica(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if request.path.startswith(self.excluded_paths):
+            return False
+        if self.is_pinned(request):
+            return False
+        user = getattr(request, 'user', None)
+        return not (user and user.is_authenticated)
+
+    def is_pinned(self, request):
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,277 @@
+"""
+Live push of urgent announcements and event cancellations (Server-Sent Events).
+
+``publish()`` is called from signal handlers once the saving transaction
+commits; ``events_stream`` is a plain ASGI app mounted at
+``LIVE_EVENTS_PATH`` by ``ejeh_palace.asgi`` that keeps one response open
+per browser and writes each message as an SSE frame.
+
+The broker is chosen by ``LIVE_BROKER``. ``LocalBroker`` fans out within a
+single ASGI process, which suits single-node deployments. ``DatabaseBroker``
+(the default on PostgreSQL) goes through ``LiveMessage`` rows, so messages
+published by the scheduler, the background worker or another web process
+reach browsers connected to any ASGI process.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from palace.models import LiveMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def encode(message_id, event, data):
+    """One SSE frame; ``data`` is JSON on a single line."""
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return f'id: {message_id}\nevent: {event}\ndata: {payload}\n\n'.encode('utf-8')
+
+
+class LocalBroker:
+    """
+    In-process fan-out.
+
+    Each message is encoded once and kept in a ring buffer of the last
+    ``size`` frames. Subscribers hold only a cursor (the last id they
+    sent) and share one wake-up event, so memory does not grow with the
+    number of connections and reconnecting browsers resume from their
+    ``Last-Event-ID`` while it is still buffered. ``publish`` is safe to
+    call from Django's sync threads.
+    """
+
+    def __init__(self, size=100):
+        self._frames = deque(maxlen=size)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._changed = None
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, event, data):
+        with self._lock:
+            self._last_id += 1
+            self._frames.append((self._last_id, encode(self._last_id, event, data)))
+            loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._notify)
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _since(self, cursor):
+        with self._lock:
+            return [(message_id, frame) for message_id, frame in self._frames if message_id > cursor]
+
+    async def wait(self, cursor, timeout):
+        """Frames after ``cursor`` and the new cursor, waiting up to ``timeout`` seconds."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._changed = asyncio.Event()
+        # Take the event before reading so a publish in between still wakes us
+        changed = self._changed
+        frames = self._since(cursor)
+        if not frames:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return [], cursor
+            frames = self._since(cursor)
+        if not frames:
+            return [], cursor
+        return [frame for _, frame in frames], frames[-1][0]
+
+
+class DatabaseBroker(LocalBroker):
+    """
+    Fan-out across processes through ``LiveMessage`` rows.
+
+    ``publish`` inserts a row and may run in any process. In each ASGI
+    process one poller reads the rows after the last one it saw every
+    ``LIVE_POLL_SECONDS`` into the ring buffer ``LocalBroker`` serves
+    subscribers from, so the database sees one indexed query per interval
+    however many browsers are connected. Message ids are row ids, so a
+    browser that reconnects to another process or after a restart with a
+    ``Last-Event-ID`` older than the buffer is replayed the rows it missed
+    straight from the table (until they are purged).
+    """
+
+    def __init__(self, size=100):
+        super().__init__(size)
+        self._last_id = None
+        self._poller = None
+
+    @property
+    def last_id(self):
+        if self._last_id is None:
+            self._last_id = LiveMessage.objects.aggregate(last=Max('pk'))['last'] or 0
+        return self._last_id
+
+    def publish(self, event, data):
+        LiveMessage.objects.create(event=event, data=data)
+
+    def _fetch(self, after, upto=None):
+        rows = LiveMessage.objects.filter(pk__gt=after)
+        if upto is not None:
+            rows = rows.filter(pk__lte=upto)
+        try:
+            return list(rows.order_by('pk').values_list('pk', 'event', 'data')[:self._frames.maxlen])
+        finally:
+            close_old_connections()
+
+    def _missed(self, cursor):
+        """Whether messages after ``cursor`` may have left (or never entered) the buffer."""
+        with self._lock:
+            oldest = self._frames[0][0] if self._frames else self._last_id + 1
+        return cursor < oldest - 1
+
+    async def _poll(self):
+        interval = getattr(settings, 'LIVE_POLL_SECONDS', 1)
+        while True:
+            try:
+                rows = await sync_to_async(self._fetch)(self._last_id)
+            except Exception:
+                # Keep polling; the database may be back on the next round
+                logger.exception('Could not read live messages')
+                rows = []
+            if rows:
+                with self._lock:
+                    for message_id, event, data in rows:
+                        self._frames.append((message_id, encode(message_id, event, data)))
+                    self._last_id = rows[-1][0]
+                self._notify()
+            # A full batch means more rows are waiting
+            if len(rows) < self._frames.maxlen:
+                await asyncio.sleep(interval)
+
+    async def wait(self, cursor, timeout):
+        if self._poller is None or self._poller.done():
+            if self._last_id is None:
+                await sync_to_async(lambda: self.last_id)()
+            self._poller = asyncio.ensure_future(self._poll())
+        if self._missed(cursor):
+            # Replay from the table up to what the poller has seen; the
+            # buffer takes over once the cursor has caught up
+            upto = self._last_id
+            rows = await sync_to_async(self._fetch)(cursor, upto)
+            if rows:
+                return [encode(*row) for row in rows], rows[-1][0]
+            # Purged already; nothing left to replay
+            cursor = upto
+        return await super().wait(cursor, timeout)
+
+
+def purge(hours=None):
+    """Delete live messages older than ``LIVE_RETENTION_HOURS``; returns the count."""
+    hours = getattr(settings, 'LIVE_RETENTION_HOURS', 24) if hours is None else hours
+    deleted, _ = LiveMessage.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours)).delete()
+    return deleted
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(getattr(settings, 'LIVE_BROKER', 'ejeh_palace.live.LocalBroker'))()
+        return _broker
+
+
+def publish(event, data):
+    """Push ``data`` to connected browsers once the current transaction commits."""
+    if not getattr(settings, 'LIVE_EVENTS_ENABLED', False):
+        return
+    transaction.on_commit(lambda: get_broker().publish(event, data))
+
+
+# ---------------------------------------------------------------------------
+# ASGI endpoint
+# ---------------------------------------------------------------------------
+
+_connections = 0
+
+
+def _last_event_id(scope, broker):
+    for name, value in scope.get('headers', []):
+        if name == b'last-event-id':
+            try:
+                cursor = int(value)
+            except ValueError:
+                break
+            # LocalBroker ids restart with the process; ignore ids from a previous run
+            return cursor if 0 <= cursor <= broker.last_id else broker.last_id
+    return broker.last_id
+
+
+async def _simple_response(send, status, headers=()):
+    await send({'type': 'http.response.start', 'status': status, 'headers': list(headers)})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def events_stream(scope, receive, send):
+    """Stream live messages to one browser until it disconnects."""
+    global _connections
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _simple_response(send, 405, [(b'allow', b'GET, HEAD')])
+        return
+    if _connections >= getattr(settings, 'LIVE_MAX_CONNECTIONS', 1000):
+        await _simple_response(send, 503, [(b'retry-after', b'30')])
+        return
+
+    broker = get_broker()
+    # A shared broker may need a query to learn the latest id
+    cursor = await sync_to_async(_last_event_id)(scope, broker)
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    if scope['method'] == 'HEAD':
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    keepalive = getattr(settings, 'LIVE_KEEPALIVE_SECONDS', 20)
+    _connections += 1
+    disconnect = asyncio.ensure_future(_disconnected(receive))
+    try:
+        await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+        while True:
+            waiter = asyncio.ensure_future(broker.wait(cursor, keepalive))
+            await asyncio.wait({waiter, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                waiter.cancel()
+                break
+            frames, cursor = waiter.result()
+            body = b''.join(frames) or b': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    finally:
+        _connections -= 1
+        disconnect.cancel()
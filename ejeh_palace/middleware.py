@@ -0,0 +1,134 @@
+"""
+Project-wide middleware for the Ejeh Ankpa Palace Platform.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('ejeh_palace.queries')
+
+# Literals are stripped from SQL so queries that differ only by their
+# parameters share a fingerprint (e.g. one category lookup per card).
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'IN \((?:\s*(?:%s|\?)\s*,?)+\)')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Return the shape of a SQL statement with literals removed."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view exceeds its query budget and raising is enabled."""
+
+
+class QueryRecorder:
+    """Database execute wrapper that records count, time and SQL shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        """Return SQL shapes issued at least ``threshold`` times."""
+        return {sql: n for sql, n in self.shapes.items() if n >= threshold}
+
+
+class QueryBudgetMiddleware:
+    """
+    Count queries and DB time per request and flag N+1 patterns.
+
+    Budgets are configured per URL name in ``QUERY_BUDGETS`` (for example
+    ``{'palace:home': 12}``) with ``QUERY_BUDGET_DEFAULT`` as the fallback.
+    Violations are logged; with ``QUERY_BUDGET_RAISE`` enabled (tests) they
+    raise ``QueryBudgetExceeded`` instead. Outside production the totals
+    are also returned in ``X-Query-*`` response headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        self.default_budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+        self.n_plus_one_threshold = getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        self.raise_on_violation = getattr(settings, 'QUERY_BUDGET_RAISE', False)
+        self.add_headers = getattr(settings, 'QUERY_BUDGET_HEADERS', settings.DEBUG)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        wrappers = [
+            connections[alias].execute_wrapper(recorder)
+            for alias in connections
+        ]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+
+        self.report(request, response, recorder)
+        return response
+
+    def get_budget(self, request):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        return view_name, self.budgets.get(view_name, self.default_budget)
+
+    def report(self, request, response, recorder):
+        view_name, budget = self.get_budget(request)
+        repeated = recorder.repeated(self.n_plus_one_threshold)
+        over_budget = budget is not None and recorder.count > budget
+
+        record = {
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 2),
+            'budget': budget,
+            'n_plus_one': [
+                {'sql': sql[:200], 'count': n} for sql, n in repeated.items()
+            ],
+        }
+
+        if over_budget or repeated:
+            logger.warning('query budget violation %s', json.dumps(record))
+            if self.raise_on_violation:
+                raise QueryBudgetExceeded(
+                    f"{view_name or request.path} issued {recorder.count} queries "
+                    f"(budget {budget}), repeated shapes: {len(repeated)}"
+                )
+        else:
+            logger.debug('query budget %s', json.dumps(record))
+
+        if self.add_headers:
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time-Ms'] = str(record['db_ms'])
+            if budget is not None:
+                response['X-Query-Budget'] = str(budget)
+            if repeated:
+                response['X-Query-N-Plus-One'] = str(len(repeated))
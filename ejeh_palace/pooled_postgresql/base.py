@@ -0,0 +1,133 @@
+"""
+PostgreSQL backend that borrows connections from an in-process pool.
+
+Intended for long-lived gunicorn workers (Render). Django still "opens"
+and "closes" a connection per request, but opening takes an idle
+connection from a ``psycopg2.pool.ThreadedConnectionPool`` and closing
+hands it back, so the TCP/TLS handshake and authentication are paid once
+per worker instead of once per request.
+
+Configure with a ``POOL`` entry in the database settings::
+
+    'POOL': {'MIN_SIZE': 2, 'MAX_SIZE': 10, 'TIMEOUT': 10, 'MAX_IDLE': 300}
+
+``MIN_SIZE`` idle connections are kept; up to ``MAX_SIZE`` may be in use
+at once and callers wait up to ``TIMEOUT`` seconds for a free one.
+
+An idle connection is checked with ``SELECT 1`` before it is handed out,
+and one idle for more than ``MAX_IDLE`` seconds is closed instead, since
+firewalls and the server drop quiet connections without telling the
+client. A connection that fails either check is discarded and the next
+one (or a new one) is tried.
+"""
+
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions, pool as pg_pool
+
+from django.db import OperationalError
+from django.db.backends.postgresql import base
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """A thread-safe pool that blocks instead of failing when exhausted."""
+
+    def __init__(self, conn_params, min_size, max_size, timeout, max_idle=300):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        # id(connection) -> when it was handed back; fresh connections are absent
+        self._idle_since = {}
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._pool = pg_pool.ThreadedConnectionPool(0, max_size, **conn_params)
+        # ThreadedConnectionPool keeps at most ``minconn`` idle connections
+        self._pool.minconn = min_size
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f'No pooled database connection available after {self.timeout}s'
+            )
+        try:
+            while True:
+                connection = self._pool.getconn()
+                idle_since = self._idle_since.pop(id(connection), None)
+                if idle_since is None or self._usable(connection, idle_since):
+                    return connection
+                self._pool.putconn(connection, close=True)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _usable(self, connection, idle_since):
+        """Whether an idle connection is young enough and still answers."""
+        if connection.closed or connection.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.monotonic() - idle_since > self.max_idle:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def putconn(self, connection):
+        try:
+            self._idle_since[id(connection)] = time.monotonic()
+            self._pool.putconn(connection, close=connection.closed)
+            if connection.closed:
+                # Closed by us or by the pool trimming down to MIN_SIZE
+                self._idle_since.pop(id(connection), None)
+        finally:
+            self._slots.release()
+
+
+def get_pool(alias, conn_params, pool_settings):
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(
+                conn_params,
+                min_size=pool_settings.get('MIN_SIZE', 2),
+                max_size=pool_settings.get('MAX_SIZE', 10),
+                timeout=pool_settings.get('TIMEOUT', 10),
+                max_idle=pool_settings.get('MAX_IDLE', 300),
+            )
+        return _pools[alias]
+
+
+class PooledDriver:
+    """Driver module stand-in whose ``connect()`` borrows from the pool."""
+
+    def __init__(self, wrapper):
+        self._wrapper = wrapper
+
+    def connect(self, **conn_params):
+        wrapper = self._wrapper
+        pool = get_pool(wrapper.alias, conn_params, wrapper.settings_dict.get('POOL', {}))
+        return pool.getconn()
+
+    def __getattr__(self, name):
+        return getattr(base.Database, name)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.Database = PooledDriver(self)
+
+    def _close(self):
+        if self.connection is not None:
+            pool = _pools.get(self.alias)
+            with self.wrap_database_errors:
+                if pool is None:
+                    return self.connection.close()
+                return pool.putconn(self.connection)
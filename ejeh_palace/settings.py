@@ -45,12 +45,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ejeh_palace.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'ejeh_palace.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,6 +90,36 @@ DATABASE_URL = os.environ.get('DATABASE_URL')
 HAS_PG_ENV = any(os.environ.get(k) for k in ('DATABASE_URL', 'PGHOST', 'POSTGRES_DB', 'POSTGRES_HOST'))
 HAS_MYSQL_ENV = any(os.environ.get(k) for k in ('MYSQL_DATABASE', 'MYSQL_HOST', 'MYSQL_DB'))
 
+# Connection handling mode for PostgreSQL, chosen from the environment unless
+# DB_POOL_MODE is set explicitly:
+# - 'transaction': DATABASE_URL points at a transaction-level pooler (Neon
+#   "-pooler" hosts, PgBouncer/Supavisor on port 6543 or ?pgbouncer=true).
+#   No server-side cursors and no session state is relied on.
+# - 'serverless': Vercel without an external pooler. Connections are closed
+#   at the end of each invocation since a frozen function can't reuse them.
+# - 'pool': long-lived gunicorn workers (Render). Connections come from an
+#   in-process pool (ejeh_palace.pooled_postgresql).
+# - 'persistent': Django persistent connections (previous default).
+IS_VERCEL = bool(os.environ.get('VERCEL'))
+IS_RENDER = bool(os.environ.get('RENDER'))
+
+
+def detect_db_pool_mode(url):
+    mode = os.environ.get('DB_POOL_MODE', '').lower()
+    if mode in ('transaction', 'serverless', 'pool', 'persistent'):
+        return mode
+    url = url or ''
+    if '-pooler' in url or ':6543' in url or 'pgbouncer=true' in url:
+        return 'transaction'
+    if IS_VERCEL:
+        return 'serverless'
+    if IS_RENDER:
+        return 'pool'
+    return 'persistent'
+
+
+DB_POOL_MODE = detect_db_pool_mode(DATABASE_URL)
+
 if HAS_PG_ENV:
     try:
         # Use dj_database_url if available to parse DATABASE_URL
@@ -100,6 +132,25 @@ if HAS_PG_ENV:
                 conn_health_checks=True,
             )
         }
+        is_postgres = DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+        if is_postgres and DB_POOL_MODE == 'transaction':
+            # The pooler multiplexes transactions over server connections, so
+            # named cursors would vanish between statements. Keep the client
+            # connection only where the process itself is long-lived. The
+            # database's timezone should be UTC so Django never has to SET it.
+            DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+            DATABASES['default']['CONN_MAX_AGE'] = 0 if IS_VERCEL else 600
+        elif is_postgres and DB_POOL_MODE == 'serverless':
+            DATABASES['default']['CONN_MAX_AGE'] = 0
+        elif is_postgres and DB_POOL_MODE == 'pool':
+            DATABASES['default']['ENGINE'] = 'ejeh_palace.pooled_postgresql'
+            DATABASES['default']['CONN_MAX_AGE'] = 0
+            DATABASES['default']['POOL'] = {
+                'MIN_SIZE': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                'TIMEOUT': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                'MAX_IDLE': int(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+            }
     except Exception:
         # Parsing failed or dj_database_url not present — fall back to SQLite
         DATABASES = {
@@ -127,6 +178,70 @@ else:
         }
     }
 
+# SQLite profile for single-node installs (see ejeh_palace.sqlite_backend).
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['ENGINE'] = 'ejeh_palace.sqlite_backend'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+    'cache_size': -20000,
+    'temp_store': 'memory',
+}
+
+# Read replicas
+# DATABASE_REPLICA_URLS is a comma-separated list of read-only replicas of
+# the primary database. Anonymous public GET requests read from them; writes,
+# admin and logged-in users stay on the primary, and a browser that just
+# POSTed is pinned to the primary for REPLICA_PIN_SECONDS.
+REPLICA_URLS = [
+    url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+    if url.strip()
+]
+if REPLICA_URLS and 'default' in DATABASES:
+    for i, url in enumerate(REPLICA_URLS):
+        replica = dj_database_url.parse(url, conn_health_checks=True)
+        # Replicas share the primary's connection handling (pooling mode)
+        for key in ('ENGINE', 'CONN_MAX_AGE', 'DISABLE_SERVER_SIDE_CURSORS', 'POOL'):
+            if key in DATABASES['default']:
+                replica[key] = DATABASES['default'][key]
+        replica['TEST'] = {'MIRROR': 'default'}
+        DATABASES[f'replica_{i}'] = replica
+    DATABASE_ROUTERS = ['ejeh_palace.db_router.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '15'))
+REPLICA_EXCLUDED_PATHS = ['/palace-admin/', '/accounts/']
+
+# Query budgets
+# Maximum queries per request keyed by URL name. Requests over budget, or
+# repeating the same SQL shape QUERY_N_PLUS_ONE_THRESHOLD times or more,
+# are logged to the `ejeh_palace.queries` logger. Set QUERY_BUDGET_RAISE=True
+# (e.g. in tests) to turn violations into exceptions.
+QUERY_BUDGET_DEFAULT = int(os.environ.get('QUERY_BUDGET_DEFAULT', '30'))
+QUERY_BUDGETS = {
+    'palace:home': 12,
+    'palace:gallery': 8,
+    'palace:gallery_image': 8,
+    'palace:history_list': 6,
+    'palace:history_detail': 8,
+    'announcements:list': 8,
+    'announcements:detail': 8,
+    # Filters (category, type, search) add one event id lookup
+    'events:list': 10,
+    'events:detail': 8,
+    'events:calendar': 6,
+    'events:calendar_events': 4,
+    'events:archive': 4,
+    'events:archive_year': 6,
+    'events:archive_month': 6,
+    'community:admin_messages': 10,
+}
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_N_PLUS_ONE_THRESHOLD', '5'))
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE', 'False') == 'True'
+# Expose X-Query-* headers only outside production
+QUERY_BUDGET_HEADERS = DEBUG or os.environ.get('QUERY_BUDGET_HEADERS', 'False') == 'True'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -216,11 +331,98 @@ if not DEBUG:
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
-EMAIL_USE_TLS = True
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', '20'))
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Ejeh Ankpa Palace <noreply@ejehankpa.com>')
 
+# Cache generations (see palace.caching)
+# Tokens are stored in the database so bumps made by the worker or the
+# scheduler reach every web process; each process re-reads a token at most
+# every CACHE_GENERATION_CHECK_SECONDS.
+CACHE_GENERATION_CHECK_SECONDS = int(os.environ.get('CACHE_GENERATION_CHECK_SECONDS', '5'))
+
+# Event occurrences
+# Recurring events are expanded into occurrences and cached per month
+# (see events.occurrences). The default cache is per process, so keep the
+# timeout short enough that other workers pick up edits promptly.
+EVENT_OCCURRENCE_HORIZON_DAYS = int(os.environ.get('EVENT_OCCURRENCE_HORIZON_DAYS', '365'))
+EVENT_OCCURRENCE_CACHE_TIMEOUT = int(os.environ.get('EVENT_OCCURRENCE_CACHE_TIMEOUT', '300'))
+# .ics feeds include events from the last ICAL_FEED_HISTORY_DAYS; bodies are
+# cached until an event changes or ICAL_FEED_CACHE_TIMEOUT passes
+ICAL_FEED_HISTORY_DAYS = int(os.environ.get('ICAL_FEED_HISTORY_DAYS', '365'))
+ICAL_FEED_CACHE_TIMEOUT = int(os.environ.get('ICAL_FEED_CACHE_TIMEOUT', '3600'))
+# RSS/Atom feeds are cached compressed until announcements change or
+# FEED_CACHE_TIMEOUT passes
+FEED_CACHE_TIMEOUT = int(os.environ.get('FEED_CACHE_TIMEOUT', '3600'))
+
+# Scheduled publishing (see palace.publishing and the publish_scheduled
+# command). Affected pages are pre-warmed as if requested from SITE_URL,
+# so cached entries keyed by host (feeds) match what visitors request.
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost')
+
+# Announcement attachment text extraction (see announcements.attachments and
+# the extract_attachments command). Files over ATTACHMENT_MAX_BYTES are
+# skipped; the parser runs in a child process capped at
+# ATTACHMENT_MEMORY_LIMIT_MB and ATTACHMENT_TIMEOUT seconds.
+ATTACHMENT_MAX_BYTES = int(os.environ.get('ATTACHMENT_MAX_BYTES', str(20 * 1024 * 1024)))
+ATTACHMENT_MAX_PAGES = int(os.environ.get('ATTACHMENT_MAX_PAGES', '200'))
+ATTACHMENT_TEXT_MAX_CHARS = int(os.environ.get('ATTACHMENT_TEXT_MAX_CHARS', '200000'))
+ATTACHMENT_MEMORY_LIMIT_MB = int(os.environ.get('ATTACHMENT_MEMORY_LIMIT_MB', '256'))
+ATTACHMENT_TIMEOUT = int(os.environ.get('ATTACHMENT_TIMEOUT', '60'))
+
+# Background tasks (see palace.taskqueue). Queued in the database and run
+# by `python manage.py run_worker`; a running task's lease is renewed while
+# it runs and re-claimed by another worker if it expires.
+TASK_WORKER_CONCURRENCY = int(os.environ.get('TASK_WORKER_CONCURRENCY', '4'))
+TASK_POLL_SECONDS = float(os.environ.get('TASK_POLL_SECONDS', '1'))
+TASK_LEASE_SECONDS = int(os.environ.get('TASK_LEASE_SECONDS', '300'))
+TASK_RETENTION_DAYS = int(os.environ.get('TASK_RETENTION_DAYS', '7'))
+
+# Periodic maintenance jobs (see palace.scheduler), run by
+# `python manage.py run_scheduler` or `run_worker --scheduler`. Only the
+# node holding the scheduler lease runs jobs; the lease must outlast a tick.
+SCHEDULER_TICK_SECONDS = int(os.environ.get('SCHEDULER_TICK_SECONDS', '10'))
+SCHEDULER_LEASE_SECONDS = int(os.environ.get('SCHEDULER_LEASE_SECONDS', '60'))
+
+# Live push of urgent announcements and event cancellations over
+# Server-Sent Events (see ejeh_palace.live). Needs the ASGI entry point
+# (e.g. `uvicorn ejeh_palace.asgi:application`). On PostgreSQL messages go
+# through a database outbox that every process polls every
+# LIVE_POLL_SECONDS, so publishes from the worker and the scheduler reach
+# all browsers; elsewhere the default broker only fans out within one
+# process, so run a single worker or set
+# LIVE_BROKER=ejeh_palace.live.DatabaseBroker.
+LIVE_EVENTS_ENABLED = os.environ.get('LIVE_EVENTS_ENABLED', 'False') == 'True'
+LIVE_EVENTS_PATH = os.environ.get('LIVE_EVENTS_PATH', '/live/events/')
+LIVE_BROKER = os.environ.get(
+    'LIVE_BROKER',
+    'ejeh_palace.live.DatabaseBroker' if 'postgresql' in DATABASES['default']['ENGINE']
+    else 'ejeh_palace.live.LocalBroker'
+)
+LIVE_POLL_SECONDS = float(os.environ.get('LIVE_POLL_SECONDS', '1'))
+LIVE_RETENTION_HOURS = int(os.environ.get('LIVE_RETENTION_HOURS', '24'))
+LIVE_KEEPALIVE_SECONDS = int(os.environ.get('LIVE_KEEPALIVE_SECONDS', '20'))
+LIVE_MAX_CONNECTIONS = int(os.environ.get('LIVE_MAX_CONNECTIONS', '1000'))
+
+# Contact message archival
+# Archived or responded messages older than this move to cold storage
+# (see community.archive and the archive_messages command).
+CONTACT_ARCHIVE_AFTER_DAYS = int(os.environ.get('CONTACT_ARCHIVE_AFTER_DAYS', '365'))
+
+# Contact notifications (see community.notifications)
+# New messages alert palace admins (plus any comma-separated addresses in
+# NOTIFICATION_ADMIN_EMAILS) and responses are mailed to the sender. Emails
+# are queued and sent by the background worker in batches over one SMTP
+# connection; failures are retried with exponential backoff.
+NOTIFICATION_ADMIN_EMAILS = [
+    email.strip() for email in os.environ.get('NOTIFICATION_ADMIN_EMAILS', '').split(',') if email.strip()
+]
+NOTIFICATION_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BATCH_SIZE', '50'))
+NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', '5'))
+NOTIFICATION_RETRY_SECONDS = int(os.environ.get('NOTIFICATION_RETRY_SECONDS', '60'))
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -234,4 +436,11 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'WARNING',
     },
+    'loggers': {
+        'ejeh_palace.queries': {
+            'handlers': ['console'],
+            'level': os.environ.get('QUERY_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
 }
@@ -0,0 +1,58 @@
+"""
+SQLite backend tuned for single-node deployments.
+
+Every new connection gets the ``SQLITE_PRAGMAS`` profile from settings
+(WAL journal, busy timeout, memory-mapped I/O, relaxed fsync, larger page
+cache) through the ``connection_created`` signal.
+
+Writes are serialized by starting transactions with ``BEGIN IMMEDIATE``
+(``TRANSACTION_MODE`` in the database settings). A deferred ``BEGIN``
+takes the write lock only at the first write, and when two readers
+upgrade at the same time one fails immediately with "database is locked"
+regardless of ``busy_timeout``. Taking the lock up front makes writers
+queue on the busy timeout instead. WAL keeps readers unblocked meanwhile.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+from django.dispatch import receiver
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'memory',
+}
+
+
+def apply_profile(dbapi_connection, pragmas=None):
+    """Apply the PRAGMA profile to a raw sqlite3 connection."""
+    pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply the SQLite performance profile to each new connection."""
+    if connection.vendor != 'sqlite':
+        return
+    apply_profile(
+        connection.connection,
+        getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS),
+    )
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE', 'IMMEDIATE')
+        self.cursor().execute(f'BEGIN {mode}')
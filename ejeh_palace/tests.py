@@ -0,0 +1,70 @@
+"""
+Tests for the live Server-Sent Events stream.
+"""
+
+import asyncio
+
+from django.test import TransactionTestCase, override_settings
+
+from palace.models import LiveMessage
+
+from . import live
+
+
+def stream(broker, last_event_id=None, frames=1, publish=None):
+    """
+    Open the stream, collect ``frames`` message frames, then disconnect.
+
+    ``publish`` runs in another thread once the stream is waiting.
+    """
+    headers = [(b'last-event-id', str(last_event_id).encode())] if last_event_id is not None else []
+    received = []
+
+    async def run():
+        done = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        async def receive():
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            body = message.get('body', b'')
+            if body.startswith(b'id:'):
+                received.extend(frame for frame in body.split(b'\n\n') if frame)
+                if len(received) >= frames:
+                    done.set()
+
+        if publish is not None:
+            loop.call_later(0.3, loop.run_in_executor, None, publish)
+        await asyncio.wait_for(live.events_stream({'method': 'GET', 'headers': headers}, receive, send), 10)
+
+    live._broker = broker
+    try:
+        asyncio.run(run())
+    finally:
+        live._broker = None
+    return [int(frame.split(b'\n')[0][4:]) for frame in received]
+
+
+@override_settings(LIVE_POLL_SECONDS=0.05, LIVE_KEEPALIVE_SECONDS=1)
+class DatabaseBrokerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.ids = [LiveMessage.objects.create(event='urgent', data={'n': n}).pk for n in range(5)]
+
+    def test_reconnect_with_old_id_replays_from_the_table(self):
+        # A fresh process (or another worker) has nothing buffered yet
+        self.assertEqual(stream(live.DatabaseBroker(), self.ids[1], frames=3), self.ids[2:])
+
+    def test_replay_beyond_the_buffer_size(self):
+        broker = live.DatabaseBroker(size=2)
+        self.assertEqual(stream(broker, self.ids[0], frames=4), self.ids[1:])
+
+    def test_new_subscribers_start_at_the_latest_message(self):
+        published = []
+
+        def publish():
+            published.append(LiveMessage.objects.create(event='urgent', data={'n': 'new'}).pk)
+
+        self.assertEqual(stream(live.DatabaseBroker(), publish=publish), published)
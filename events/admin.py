@@ -3,21 +3,30 @@ Admin configuration for events app.
 """
 
 from django.contrib import admin
-from .models import Event, EventCategory, TraditionalFestival
+from .models import Event, EventCategory, EventException, FestivalOccurrence, TraditionalFestival
 
 
 @admin.register(EventCategory)
 class EventCategoryAdmin(admin.ModelAdmin):
     """Admin for event categories."""
     
-    list_display = ['name', 'slug', 'color']
+    list_display = ['name', 'slug', 'color', 'upcoming_count']
     prepopulated_fields = {'slug': ('name',)}
 
 
+class EventExceptionInline(admin.TabularInline):
+    """Cancel or move single occurrences of a recurring event."""
+    
+    model = EventException
+    extra = 0
+    fields = ['original_start', 'is_cancelled', 'start_date', 'end_date', 'venue', 'note']
+
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     """Admin for events."""
     
+    inlines = [EventExceptionInline]
     list_display = [
         'title', 'category', 'event_type', 'start_date', 'venue',
         'is_published', 'is_featured', 'is_cancelled'
@@ -38,7 +47,7 @@ class EventAdmin(admin.ModelAdmin):
             'fields': ('category', 'event_type')
         }),
         ('Date & Time', {
-            'fields': ('start_date', 'end_date', 'is_all_day', 'recurrence')
+            'fields': ('start_date', 'end_date', 'is_all_day', 'recurrence', 'recurrence_end')
         }),
         ('Location', {
             'fields': ('venue', 'address', 'map_url')
@@ -51,7 +60,7 @@ class EventAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Status', {
-            'fields': ('is_published', 'is_featured', 'is_cancelled')
+            'fields': ('is_published', 'is_featured', 'is_cancelled', 'publish_at')
         }),
     )
 
@@ -64,3 +73,17 @@ class TraditionalFestivalAdmin(admin.ModelAdmin):
     list_filter = ['is_active', 'is_featured', 'typical_month']
     search_fields = ['name', 'description', 'history']
     prepopulated_fields = {'slug': ('name',)}
+
+
+@admin.register(FestivalOccurrence)
+class FestivalOccurrenceAdmin(admin.ModelAdmin):
+    """Read-only view of the festival next-occurrence index."""
+    
+    list_display = ['festival', 'start_date', 'end_date', 'event', 'is_estimated', 'refreshed_at']
+    list_filter = ['is_estimated']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,103 @@
+"""
+Event archive by year and month.
+
+``EventArchiveMonth`` stores how many published events start in each
+local month, so archive navigation is one small query and period pages
+are range scans on ``start_date`` instead of OFFSET paging through all
+history. The current month only lists events that are already over, like
+the past events list; its stored count covers the whole month, so it is
+recounted against ``now`` when shown.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Event, EventArchiveMonth
+from .occurrences import month_bounds
+
+
+def period_bounds(year, month=None):
+    """Aware ``[start, end)`` of a local year or month."""
+    if month is not None:
+        return month_bounds(year, month)
+    return month_bounds(year, 1)[0], month_bounds(year + 1, 1)[0]
+
+
+def period_of(event):
+    """``(year, month)`` an event is filed under, or ``None`` if not archived."""
+    if not event.is_published or event.is_cancelled:
+        return None
+    local = timezone.localtime(event.start_date)
+    return local.year, local.month
+
+
+def period_events(year, month=None, now=None):
+    """
+    Published events starting within the period, in date order.
+
+    With ``now``, a period that has not ended yet lists only the events
+    that finished before ``now``.
+    """
+    start, end = period_bounds(year, month)
+    events = Event.objects.published().filter(start_date__gte=start, start_date__lt=end)
+    if now is not None and end > now:
+        events = events.filter(effective_end__lt=now)
+    return events.select_related('category').order_by('start_date')
+
+
+def refresh_months(months):
+    """Recount the given ``(year, month)`` buckets."""
+    for year, month in set(months):
+        count = period_events(year, month).count()
+        if count:
+            EventArchiveMonth.objects.update_or_create(
+                year=year, month=month, defaults={'event_count': count}
+            )
+        else:
+            EventArchiveMonth.objects.filter(year=year, month=month).delete()
+
+
+def rebuild_archive():
+    """Recompute the whole histogram in one grouped query; returns the row count."""
+    totals = Event.objects.published().annotate(
+        period=TruncMonth('start_date')
+    ).order_by().values('period').annotate(total=Count('pk'))
+    rows = [
+        EventArchiveMonth(
+            year=row['period'].year, month=row['period'].month, event_count=row['total']
+        )
+        for row in totals
+    ]
+    with transaction.atomic():
+        EventArchiveMonth.objects.all().delete()
+        EventArchiveMonth.objects.bulk_create(rows)
+    return len(rows)
+
+
+def archive_months(now=None):
+    """Histogram rows up to and including the current month, newest first."""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    months = list(EventArchiveMonth.objects.filter(
+        Q(year__lt=today.year) | Q(year=today.year, month__lte=today.month)
+    ))
+    if months and (months[0].year, months[0].month) == (today.year, today.month):
+        # The stored count includes the rest of this month's events
+        current = months[0]
+        current.event_count = period_events(today.year, today.month, now).count()
+        if not current.event_count:
+            months.remove(current)
+    return months
+
+
+def archive_years(months):
+    """Group histogram rows into ``(year, total, [months])``, newest first."""
+    years = {}
+    for row in months:
+        years.setdefault(row.year, []).append(row)
+    return [
+        (year, sum(row.event_count for row in rows), rows)
+        for year, rows in sorted(years.items(), reverse=True)
+    ]
@@ -0,0 +1,96 @@
+"""
+Next-occurrence index for traditional festivals.
+
+Festivals only record a typical month and a duration. This module works
+out when each active festival next takes place and stores it in
+``FestivalOccurrence`` so "upcoming festivals" lists and countdowns are a
+single indexed lookup instead of per-festival computation.
+
+A scheduled published event matching the festival (see
+``TraditionalFestival.matching_events``) wins; otherwise the dates are
+estimated as the first days of the festival's typical month.
+"""
+
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import occurrences
+from .models import FestivalOccurrence, TraditionalFestival
+
+
+def estimate(festival, today):
+    """Estimated ``(start, end)`` dates from the typical month, or ``None``."""
+    if not festival.typical_month:
+        return None
+    length = timedelta(days=max(festival.duration_days, 1) - 1)
+    start = date(today.year, festival.typical_month, 1)
+    if start + length < today:
+        start = date(today.year + 1, festival.typical_month, 1)
+    return start, start + length
+
+
+def next_dates(festival, now=None):
+    """
+    Return ``(start, end, event)`` for the festival's next occurrence.
+
+    ``event`` is the matching scheduled event, or ``None`` when the dates
+    are estimated. Returns ``None`` when nothing can be worked out.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    upcoming = occurrences.upcoming(now, festival.matching_events().published(), limit=1)
+    if upcoming:
+        occurrence = upcoming[0]
+        start = timezone.localdate(occurrence.start_date)
+        if occurrence.end_date:
+            end = timezone.localdate(occurrence.end_date)
+        else:
+            end = start + timedelta(days=max(festival.duration_days, 1) - 1)
+        return start, end, getattr(occurrence, 'event', occurrence)
+
+    estimated = estimate(festival, today)
+    if estimated:
+        return estimated[0], estimated[1], None
+    return None
+
+
+def refresh_festival(festival, now=None):
+    """Recompute one festival's row; returns it, or ``None`` if removed."""
+    found = next_dates(festival, now) if festival.is_active else None
+    if found is None:
+        FestivalOccurrence.objects.filter(festival=festival).delete()
+        return None
+    start, end, event = found
+    row, _ = FestivalOccurrence.objects.update_or_create(
+        festival=festival,
+        defaults={
+            'start_date': start,
+            'end_date': end,
+            'event': event,
+            'is_estimated': event is None,
+        },
+    )
+    return row
+
+
+def refresh_festival_dates(now=None):
+    """Rebuild every festival's row; returns ``(refreshed, removed)`` counts."""
+    now = now or timezone.now()
+    refreshed = removed = 0
+    with transaction.atomic():
+        for festival in TraditionalFestival.objects.all():
+            if refresh_festival(festival, now):
+                refreshed += 1
+            else:
+                removed += 1
+    return refreshed, removed
+
+
+def upcoming_festivals(today=None):
+    """Festival occurrences that have not ended, soonest first."""
+    today = today or timezone.localdate()
+    return FestivalOccurrence.objects.filter(
+        end_date__gte=today, festival__is_active=True
+    ).select_related('festival', 'event').order_by('start_date')
@@ -17,15 +17,17 @@ class EventForm(forms.ModelForm):
         fields = [
             'title', 'slug', 'description', 'short_description',
             'category', 'event_type', 'start_date', 'end_date', 'is_all_day',
-            'recurrence', 'venue', 'address', 'map_url', 'featured_image',
+            'recurrence', 'recurrence_end', 'venue', 'address', 'map_url', 'featured_image',
             'dress_code', 'special_instructions', 'contact_info',
-            'is_published', 'is_featured', 'is_cancelled'
+            'is_published', 'is_featured', 'is_cancelled', 'publish_at'
         ]
         widgets = {
             'description': forms.Textarea(attrs={'rows': 5}),
             'short_description': forms.Textarea(attrs={'rows': 2}),
             'start_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
             'end_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+            'recurrence_end': forms.DateInput(attrs={'type': 'date'}),
+            'publish_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
             'address': forms.Textarea(attrs={'rows': 2}),
             'special_instructions': forms.Textarea(attrs={'rows': 3}),
             'contact_info': forms.Textarea(attrs={'rows': 2}),
@@ -58,7 +60,10 @@ class EventForm(forms.ModelForm):
                     Column('end_date', css_class='col-md-4'),
                     Column('is_all_day', css_class='col-md-4'),
                 ),
-                'recurrence',
+                Row(
+                    Column('recurrence', css_class='col-md-6'),
+                    Column('recurrence_end', css_class='col-md-6'),
+                ),
             ),
             Fieldset(
                 'Location',
@@ -80,6 +85,7 @@ class EventForm(forms.ModelForm):
                     Column('is_featured', css_class='col-md-4'),
                     Column('is_cancelled', css_class='col-md-4'),
                 ),
+                'publish_at',
             ),
             Submit('submit', 'Save Event', css_class='btn btn-primary')
         )
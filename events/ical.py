@@ -0,0 +1,254 @@
+"""
+iCalendar (RFC 5545) serialization for event feeds.
+
+Recurring events are written once with an ``RRULE`` derived from
+``Event.recurrence``; cancelled occurrences become ``EXDATE`` entries and
+moved ones a ``RECURRENCE-ID`` override, so subscribed calendars expand
+series exactly like ``events.occurrences`` does. Output is produced line
+by line so feeds can be streamed.
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+
+from django.utils import timezone
+
+from .models import Event
+
+
+PRODID = '-//Ejeh Ankpa Palace//Events//EN'
+
+# Years either side of today whose offset changes are written to VTIMEZONE
+VTIMEZONE_YEARS = 5
+
+RRULES = {
+    Event.RecurrenceType.WEEKLY: 'FREQ=WEEKLY',
+    Event.RecurrenceType.MONTHLY: 'FREQ=MONTHLY',
+    Event.RecurrenceType.ANNUAL: 'FREQ=YEARLY',
+}
+
+
+def escape(text):
+    """Escape a TEXT property value."""
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets without splitting UTF-8 characters."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, current, size, limit = [], [], 0, 75
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > limit:
+            parts.append(''.join(current))
+            current, size, limit = [], 0, 74
+        current.append(char)
+        size += width
+    parts.append(''.join(current))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _local(value):
+    return timezone.localtime(value).strftime('%Y%m%dT%H%M%S')
+
+
+def _date(value):
+    return timezone.localdate(value).strftime('%Y%m%d')
+
+
+def rrule(event):
+    """``RRULE`` value for a recurring event, clamping to short months like the engine."""
+    rule = RRULES[event.recurrence]
+    start = timezone.localtime(event.start_date)
+    if event.recurrence == Event.RecurrenceType.MONTHLY and start.day > 28:
+        days = ','.join(str(day) for day in range(28, start.day + 1))
+        rule += f';BYMONTHDAY={days};BYSETPOS=-1'
+    elif event.recurrence == Event.RecurrenceType.ANNUAL and start.month == 2 and start.day == 29:
+        rule += ';BYMONTH=2;BYMONTHDAY=28,29;BYSETPOS=-1'
+    if event.recurrence_end and event.is_all_day:
+        # UNTIL takes the value type of DTSTART
+        rule += f';UNTIL={event.recurrence_end:%Y%m%d}'
+    elif event.recurrence_end:
+        until = timezone.make_aware(datetime.combine(event.recurrence_end, time.max))
+        rule += f';UNTIL={_utc(until)}'
+    return rule
+
+
+def _offset(value):
+    sign = '-' if value < timedelta(0) else '+'
+    minutes = abs(int(value.total_seconds())) // 60
+    return f'{sign}{minutes // 60:02d}{minutes % 60:02d}'
+
+
+def _offset_at(tz, seconds):
+    return datetime.fromtimestamp(seconds, dt_timezone.utc).astimezone(tz).utcoffset()
+
+
+@lru_cache(maxsize=8)
+def _transitions(tz, first_year, last_year):
+    """
+    Offset changes of ``tz`` within the given years.
+
+    ``zoneinfo`` does not expose its transition table, so the offset is
+    sampled daily and each change narrowed down to the second. Returns
+    ``(utc, offset_before, offset_after, tzname, is_dst)`` tuples.
+    """
+    moment = int(datetime(first_year, 1, 1, tzinfo=dt_timezone.utc).timestamp())
+    end = int(datetime(last_year + 1, 1, 1, tzinfo=dt_timezone.utc).timestamp())
+    offset = _offset_at(tz, moment)
+    found = []
+    while moment < end:
+        following = moment + 86400
+        if _offset_at(tz, following) != offset:
+            low, high = moment, following
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset_at(tz, middle) == offset:
+                    low = middle
+                else:
+                    high = middle
+            utc = datetime.fromtimestamp(high, dt_timezone.utc)
+            local = utc.astimezone(tz)
+            found.append((utc, offset, local.utcoffset(), local.tzname(), bool(local.dst())))
+            offset = local.utcoffset()
+        moment = following
+    return tuple(found)
+
+
+def _observance(is_dst, start, offset_from, offset_to, name):
+    kind = 'DAYLIGHT' if is_dst else 'STANDARD'
+    return [
+        f'BEGIN:{kind}',
+        f'DTSTART:{start}',
+        f'TZOFFSETFROM:{_offset(offset_from)}',
+        f'TZOFFSETTO:{_offset(offset_to)}',
+        f'TZNAME:{name}',
+        f'END:{kind}',
+    ]
+
+
+def vtimezone(now=None):
+    """
+    ``VTIMEZONE`` for the site time zone.
+
+    Recurring events are anchored to local time so they keep their wall
+    clock time. The zone's offset changes within ``VTIMEZONE_YEARS`` of
+    today are written as STANDARD/DAYLIGHT observances, after one that
+    covers everything before them; a zone without daylight saving (such
+    as Africa/Lagos) is just that first observance.
+    """
+    tz = timezone.get_current_timezone()
+    year = timezone.localdate(now).year
+    first = datetime(year - VTIMEZONE_YEARS, 1, 1, tzinfo=dt_timezone.utc).astimezone(tz)
+    lines = ['BEGIN:VTIMEZONE', f'TZID:{tz}']
+    lines += _observance(
+        first.dst(), '19700101T000000', first.utcoffset(), first.utcoffset(), first.tzname()
+    )
+    for utc, before, after, name, is_dst in _transitions(
+        tz, year - VTIMEZONE_YEARS, year + VTIMEZONE_YEARS
+    ):
+        # DTSTART is the wall clock time just before the change
+        start = (utc + before).strftime('%Y%m%dT%H%M%S')
+        lines += _observance(is_dst, start, before, after, name)
+    lines.append('END:VTIMEZONE')
+    return lines
+
+
+def _times(event, start, end, recurring):
+    tzid = timezone.get_current_timezone_name()
+    if event.is_all_day:
+        last = end or start
+        return [
+            f'DTSTART;VALUE=DATE:{_date(start)}',
+            f'DTEND;VALUE=DATE:{_date(last + timedelta(days=1))}',
+        ]
+    if recurring:
+        lines = [f'DTSTART;TZID={tzid}:{_local(start)}']
+        if end:
+            lines.append(f'DTEND;TZID={tzid}:{_local(end)}')
+        return lines
+    lines = [f'DTSTART:{_utc(start)}']
+    if end:
+        lines.append(f'DTEND:{_utc(end)}')
+    return lines
+
+
+def _occurrence_id(event, original_start, tzid):
+    """Parameters and value naming one occurrence, typed like the series' DTSTART."""
+    if event.is_all_day:
+        return f'VALUE=DATE:{_date(original_start)}'
+    return f'TZID={tzid}:{_local(original_start)}'
+
+
+def vevent(event, host, url):
+    """Content lines for an event, plus overrides for moved occurrences."""
+    uid = f'event-{event.pk}@{host}'
+    recurring = event.recurrence in RRULES
+    tzid = timezone.get_current_timezone_name()
+    common = [
+        f'UID:{uid}',
+        f'DTSTAMP:{_utc(event.updated_at)}',
+        f'SUMMARY:{escape(event.title)}',
+        f'DESCRIPTION:{escape(event.short_description or event.description)}',
+        f'URL:{url}',
+    ]
+    if event.category_id:
+        common.append(f'CATEGORIES:{escape(event.category.name)}')
+
+    lines = ['BEGIN:VEVENT', *common]
+    lines += _times(event, event.start_date, event.end_date, recurring)
+    lines.append(f'LOCATION:{escape(event.venue)}')
+    if event.is_cancelled:
+        lines.append('STATUS:CANCELLED')
+    overrides = []
+    if recurring:
+        lines.append(f'RRULE:{rrule(event)}')
+        length = event.end_date - event.start_date if event.end_date else None
+        for exc in event.exceptions.all():
+            if exc.is_cancelled:
+                lines.append(f'EXDATE;{_occurrence_id(event, exc.original_start, tzid)}')
+                continue
+            start = exc.start_date or exc.original_start
+            end = exc.end_date or (start + length if length is not None else None)
+            overrides += ['BEGIN:VEVENT', *common]
+            overrides.append(f'RECURRENCE-ID;{_occurrence_id(event, exc.original_start, tzid)}')
+            overrides += _times(event, start, end, recurring)
+            overrides.append(f'LOCATION:{escape(exc.venue or event.venue)}')
+            if exc.note:
+                overrides.append(f'COMMENT:{escape(exc.note)}')
+            overrides.append('END:VEVENT')
+    lines.append('END:VEVENT')
+    return lines + overrides
+
+
+def calendar_lines(events, name, host, url_for):
+    """
+    Yield folded content lines for a ``VCALENDAR`` of ``events``.
+
+    ``url_for(event)`` returns the absolute URL of an event's page.
+    """
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape(name)}',
+        f'X-WR-TIMEZONE:{timezone.get_current_timezone_name()}',
+        *vtimezone(),
+    ]
+    for line in header:
+        yield fold(line)
+    for event in events:
+        for line in vevent(event, host, url_for(event)):
+            yield fold(line)
+    yield fold('END:VCALENDAR')
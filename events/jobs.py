@@ -0,0 +1,13 @@
+"""
+Periodic maintenance jobs for the events app (see palace.scheduler).
+"""
+
+from palace.scheduler import periodic
+
+from .festivals import refresh_festival_dates
+
+
+@periodic(every=24 * 60 * 60)
+def refresh_festivals():
+    """Roll festivals forward to their next dates once they end."""
+    refresh_festival_dates()
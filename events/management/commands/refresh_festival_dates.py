@@ -0,0 +1,20 @@
+"""
+Management command to refresh the festival next-occurrence index.
+
+Run daily (e.g. from cron or the platform scheduler) so festivals roll
+forward to their next dates once they end and pick up newly scheduled
+festival events.
+"""
+
+from django.core.management.base import BaseCommand
+
+from events.festivals import refresh_festival_dates
+
+
+class Command(BaseCommand):
+    help = 'Recompute the next occurrence of every traditional festival'
+
+    def handle(self, *args, **options):
+        refreshed, removed = refresh_festival_dates()
+        self.stdout.write(f'Refreshed {refreshed} festivals, removed {removed} without dates')
+        self.stdout.write(self.style.SUCCESS('Festival dates refreshed.'))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_cancelled', False), ('is_published', True)), fields=['start_date'], name='event_live_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_cancelled', False), ('is_published', True)), fields=['end_date'], name='event_live_end_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:48
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def count_upcoming(apps, schema_editor):
+    EventCategory = apps.get_model('events', 'EventCategory')
+    now = timezone.now()
+    for category in EventCategory.objects.all():
+        category.upcoming_count = category.events.filter(
+            Q(start_date__gte=now) | Q(end_date__gte=now),
+            is_published=True,
+            is_cancelled=False,
+        ).count()
+        category.save(update_fields=['upcoming_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventcategory',
+            name='upcoming_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Upcoming Events'),
+        ),
+        migrations.RunPython(count_upcoming, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_category_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_end',
+            field=models.DateField(blank=True, help_text='Last date a recurring event repeats; leave blank to repeat indefinitely', null=True, verbose_name='Repeat Until'),
+        ),
+        migrations.CreateModel(
+            name='EventException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_start', models.DateTimeField(verbose_name='Original Start')),
+                ('is_cancelled', models.BooleanField(default=False, verbose_name='Cancelled')),
+                ('start_date', models.DateTimeField(blank=True, null=True, verbose_name='New Start Date & Time')),
+                ('end_date', models.DateTimeField(blank=True, null=True, verbose_name='New End Date & Time')),
+                ('venue', models.CharField(blank=True, max_length=200, verbose_name='New Venue')),
+                ('note', models.CharField(blank=True, max_length=300, verbose_name='Note')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Occurrence Exception',
+                'verbose_name_plural': 'Occurrence Exceptions',
+                'ordering': ['original_start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='eventexception',
+            constraint=models.UniqueConstraint(fields=('event', 'original_start'), name='event_exception_unique_occurrence'),
+        ),
+    ]
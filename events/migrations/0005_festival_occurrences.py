@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_occurrences'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FestivalOccurrence',
+            fields=[
+                ('festival', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='next_occurrence', serialize=False, to='events.traditionalfestival')),
+                ('start_date', models.DateField(verbose_name='Starts')),
+                ('end_date', models.DateField(verbose_name='Ends')),
+                ('is_estimated', models.BooleanField(default=True, help_text='Derived from the typical month rather than a scheduled event', verbose_name='Estimated')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Refreshed')),
+                ('event', models.ForeignKey(blank=True, help_text='Scheduled event for this occurrence, when one exists', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Festival Occurrence',
+                'verbose_name_plural': 'Festival Occurrences',
+                'ordering': ['start_date'],
+                'indexes': [models.Index(fields=['end_date', 'start_date'], name='festival_next_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:20
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_effective_end(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    for event in Event.objects.all().only('start_date', 'end_date', 'is_all_day'):
+        end = event.end_date or event.start_date
+        if not event.end_date or event.is_all_day:
+            end = timezone.localtime(end).replace(hour=23, minute=59, second=59, microsecond=999999)
+        event.effective_end = end
+        event.save(update_fields=['effective_end'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_festival_occurrences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='effective_end',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Effective End'),
+        ),
+        migrations.RunPython(fill_effective_end, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='event',
+            name='effective_end',
+            field=models.DateTimeField(editable=False, verbose_name='Effective End'),
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_live_end_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_cancelled', False), ('is_published', True)), fields=['effective_end', 'start_date'], name='event_live_interval_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:03
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+
+def fill_archive(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventArchiveMonth = apps.get_model('events', 'EventArchiveMonth')
+    totals = Event.objects.filter(
+        is_published=True, is_cancelled=False
+    ).annotate(period=TruncMonth('start_date')).order_by().values('period').annotate(total=Count('pk'))
+    EventArchiveMonth.objects.bulk_create([
+        EventArchiveMonth(year=row['period'].year, month=row['period'].month, event_count=row['total'])
+        for row in totals
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_effective_end'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Year')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Month')),
+                ('event_count', models.PositiveIntegerField(default=0, verbose_name='Events')),
+            ],
+            options={
+                'verbose_name': 'Event Archive Month',
+                'verbose_name_plural': 'Event Archive Months',
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='eventarchivemonth',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='event_archive_month_unique'),
+        ),
+        migrations.RunPython(fill_archive, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Leave unpublished and set a time to publish automatically', null=True, verbose_name='Scheduled Publish Time'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('is_published', False), ('publish_at__isnull', False)), fields=['publish_at'], name='event_publish_due_idx'),
+        ),
+    ]
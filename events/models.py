@@ -3,6 +3,7 @@ Models for Events and Ceremonial Calendar.
 """
 
 from django.db import models
+from django.db.models import Case, DurationField, ExpressionWrapper, F, Q, Value, When
 from django.urls import reverse
 from django.utils import timezone
 from cloudinary.models import CloudinaryField
@@ -22,6 +23,14 @@ class EventCategory(models.Model):
     )
     icon = models.CharField('Icon Class', max_length=50, blank=True)
     
+    # Maintained by events.signals; events drift out of "upcoming" as
+    # time passes, so `manage.py recount` must run periodically
+    upcoming_count = models.PositiveIntegerField(
+        'Upcoming Events',
+        default=0,
+        editable=False
+    )
+    
     class Meta:
         verbose_name = 'Event Category'
         verbose_name_plural = 'Event Categories'
@@ -31,6 +40,87 @@ class EventCategory(models.Model):
         return self.name
 
 
+class EventQuerySet(models.QuerySet):
+    """QuerySet with database-computed event timing."""
+    
+    def with_status(self, now=None):
+        """
+        Annotate each event with its timing relative to ``now``.
+        
+        Adds ``status`` (upcoming/ongoing/past), ``status_rank`` for
+        ordering, ``time_until`` and ``span``. Pass the same ``now`` to
+        every queryset in a request so all status checks agree.
+        """
+        now = now or timezone.now()
+        return self.annotate(
+            status=Case(
+                When(start_date__gt=now, then=Value(Event.Status.UPCOMING)),
+                When(effective_end__gte=now, then=Value(Event.Status.ONGOING)),
+                default=Value(Event.Status.PAST),
+                output_field=models.CharField(max_length=10),
+            ),
+            time_until=ExpressionWrapper(
+                F('start_date') - Value(now),
+                output_field=DurationField()
+            ),
+            span=ExpressionWrapper(
+                F('end_date') - F('start_date'),
+                output_field=DurationField()
+            ),
+        ).annotate(
+            status_rank=Case(
+                When(status=Event.Status.ONGOING, then=Value(0)),
+                When(status=Event.Status.UPCOMING, then=Value(1)),
+                default=Value(2),
+                output_field=models.IntegerField(),
+            ),
+        )
+    
+    def published(self):
+        """Published, non-cancelled events."""
+        return self.filter(is_published=True, is_cancelled=False)
+    
+    def upcoming(self, now=None):
+        """Events that have not finished yet, ongoing first."""
+        now = now or timezone.now()
+        return self.filter(effective_end__gte=now).with_status(now).order_by(
+            'status_rank', 'start_date'
+        )
+    
+    def past(self, now=None):
+        """Finished events, most recent first."""
+        now = now or timezone.now()
+        return self.filter(effective_end__lt=now).exclude(
+            self.running_series(now)
+        ).with_status(now).order_by('-start_date')
+    
+    # Interval queries. Every event covers [start_date, effective_end], so
+    # these are two range conditions served by the interval index.
+    
+    def ongoing_at(self, moment=None):
+        """Events in progress at ``moment`` (default: now)."""
+        moment = moment or timezone.now()
+        return self.filter(start_date__lte=moment, effective_end__gte=moment)
+    
+    def overlapping(self, start, end):
+        """Events whose span intersects ``[start, end]``."""
+        return self.filter(start_date__lte=end, effective_end__gte=start)
+    
+    def starting_after(self, moment=None, limit=None):
+        """The next events to start after ``moment``, soonest first."""
+        moment = moment or timezone.now()
+        queryset = self.filter(start_date__gt=moment).order_by('start_date')
+        return queryset[:limit] if limit is not None else queryset
+    
+    @staticmethod
+    def running_series(now):
+        """Q for recurring events that still have occurrences to come."""
+        return ~Q(recurrence=Event.RecurrenceType.NONE) & (
+            Q(recurrence_end__isnull=True) |
+            Q(recurrence_end__gte=timezone.localdate(now))
+        )
+
+
 class Event(models.Model):
     """
     Events and ceremonial occasions.
@@ -53,6 +143,11 @@ class Event(models.Model):
         MONTHLY = 'monthly', 'Monthly'
         WEEKLY = 'weekly', 'Weekly'
     
+    class Status(models.TextChoices):
+        UPCOMING = 'upcoming', 'Upcoming'
+        ONGOING = 'ongoing', 'Happening Now'
+        PAST = 'past', 'Past Event'
+    
     # Basic Information
     title = models.CharField('Event Title', max_length=200)
     slug = models.SlugField('Slug', unique=True, max_length=220)
@@ -78,6 +173,8 @@ class Event(models.Model):
     start_date = models.DateTimeField('Start Date & Time')
     end_date = models.DateTimeField('End Date & Time', null=True, blank=True)
     is_all_day = models.BooleanField('All Day Event', default=False)
+    # Set on save from the fields above; see ``compute_effective_end``
+    effective_end = models.DateTimeField('Effective End', editable=False)
     
     # Recurrence
     recurrence = models.CharField(
@@ -86,6 +183,12 @@ class Event(models.Model):
         choices=RecurrenceType.choices,
         default=RecurrenceType.NONE
     )
+    recurrence_end = models.DateField(
+        'Repeat Until',
+        null=True,
+        blank=True,
+        help_text='Last date a recurring event repeats; leave blank to repeat indefinitely'
+    )
     
     # Location
     venue = models.CharField('Venue', max_length=200)
@@ -104,59 +207,156 @@ class Event(models.Model):
     is_published = models.BooleanField('Published', default=False)
     is_featured = models.BooleanField('Featured Event', default=False)
     is_cancelled = models.BooleanField('Cancelled', default=False)
+    publish_at = models.DateTimeField(
+        'Scheduled Publish Time',
+        null=True,
+        blank=True,
+        help_text='Leave unpublished and set a time to publish automatically'
+    )
     
     # Timestamps
     created_at = models.DateTimeField('Created', auto_now_add=True)
     updated_at = models.DateTimeField('Updated', auto_now=True)
     
+    objects = EventQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['start_date']
+        indexes = [
+            models.Index(
+                fields=['start_date'],
+                condition=models.Q(is_published=True, is_cancelled=False),
+                name='event_live_start_idx'
+            ),
+            models.Index(
+                fields=['effective_end', 'start_date'],
+                condition=models.Q(is_published=True, is_cancelled=False),
+                name='event_live_interval_idx'
+            ),
+            models.Index(
+                fields=['publish_at'],
+                condition=models.Q(is_published=False, publish_at__isnull=False),
+                name='event_publish_due_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        self.effective_end = self.compute_effective_end()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'start_date', 'end_date', 'is_all_day'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'effective_end'}
+        super().save(*args, **kwargs)
+    
+    def compute_effective_end(self):
+        """
+        The last moment the event is in progress.
+        
+        Events without an end run to the end of their start day, and
+        all-day events to the end of their last day (local time). Code
+        that bypasses ``save()`` (``bulk_create``) must set it itself.
+        """
+        end = self.end_date or self.start_date
+        if self.end_date and not self.is_all_day:
+            return end
+        return timezone.localtime(end).replace(hour=23, minute=59, second=59, microsecond=999999)
+    
     def get_absolute_url(self):
         return reverse('events:detail', kwargs={'slug': self.slug})
     
+    # The properties below prefer the values annotated by
+    # ``EventQuerySet.with_status()`` and only fall back to Python
+    # when the instance was loaded without them.
+    
     @property
     def is_upcoming(self):
         """Check if event is in the future."""
+        if hasattr(self, 'status'):
+            return self.status == self.Status.UPCOMING
         return self.start_date > timezone.now()
     
     @property
     def is_ongoing(self):
         """Check if event is currently happening."""
-        now = timezone.now()
-        if self.end_date:
-            return self.start_date <= now <= self.end_date
-        return self.start_date.date() == now.date()
+        if hasattr(self, 'status'):
+            return self.status == self.Status.ONGOING
+        return self.start_date <= timezone.now() <= self.compute_effective_end()
     
     @property
     def is_past(self):
         """Check if event has ended."""
-        if self.end_date:
-            return self.end_date < timezone.now()
-        return self.start_date < timezone.now()
+        if hasattr(self, 'status'):
+            return self.status == self.Status.PAST
+        return self.compute_effective_end() < timezone.now()
     
     @property
     def days_until(self):
         """Return days until event starts."""
-        if self.is_upcoming:
-            delta = self.start_date - timezone.now()
-            return delta.days
-        return 0
+        if not self.is_upcoming:
+            return 0
+        if hasattr(self, 'time_until'):
+            return self.time_until.days
+        return (self.start_date - timezone.now()).days
     
     @property
     def duration(self):
         """Return event duration in hours."""
+        if hasattr(self, 'span'):
+            return self.span.total_seconds() / 3600 if self.span is not None else None
         if self.end_date:
             delta = self.end_date - self.start_date
             return delta.total_seconds() / 3600
         return None
 
 
+class EventException(models.Model):
+    """
+    A change to one occurrence of a recurring event.
+    
+    ``original_start`` identifies the occurrence; it can be cancelled or
+    moved to a different time or venue without touching the series.
+    """
+    
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='exceptions'
+    )
+    original_start = models.DateTimeField('Original Start')
+    is_cancelled = models.BooleanField('Cancelled', default=False)
+    start_date = models.DateTimeField('New Start Date & Time', null=True, blank=True)
+    end_date = models.DateTimeField('New End Date & Time', null=True, blank=True)
+    venue = models.CharField('New Venue', max_length=200, blank=True)
+    note = models.CharField('Note', max_length=300, blank=True)
+    
+    class Meta:
+        verbose_name = 'Occurrence Exception'
+        verbose_name_plural = 'Occurrence Exceptions'
+        ordering = ['original_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'original_start'],
+                name='event_exception_unique_occurrence'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} @ {self.original_start:%Y-%m-%d %H:%M}"
+    
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        from .occurrences import occurs_at
+        
+        if self.event_id and self.original_start and not occurs_at(self.event, self.original_start):
+            raise ValidationError({
+                'original_start': 'This is not an occurrence of the selected event.'
+            })
+
+
 class TraditionalFestival(models.Model):
     """
     Traditional festivals of Ankpa Kingdom.
@@ -205,6 +405,13 @@ class TraditionalFestival(models.Model):
     def get_absolute_url(self):
         return reverse('events:festival_detail', kwargs={'slug': self.slug})
     
+    def matching_events(self):
+        """Festival events whose title mentions this festival."""
+        return Event.objects.filter(
+            event_type=Event.EventType.FESTIVAL,
+            title__icontains=self.name
+        )
+    
     @property
     def month_name(self):
         """Return the month name."""
@@ -212,3 +419,87 @@ class TraditionalFestival(models.Model):
         if self.typical_month:
             return calendar.month_name[self.typical_month]
         return 'Various'
+
+
+class FestivalOccurrence(models.Model):
+    """
+    The next (or current) dates of a traditional festival.
+    
+    Rows are derived data: ``events.festivals.refresh_festival_dates``
+    rebuilds them from matching published events, falling back to an
+    estimate from ``typical_month``. The ``refresh_festival_dates``
+    command should run daily so rows roll forward once a festival ends.
+    """
+    
+    festival = models.OneToOneField(
+        TraditionalFestival,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='next_occurrence'
+    )
+    start_date = models.DateField('Starts')
+    end_date = models.DateField('Ends')
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Scheduled event for this occurrence, when one exists'
+    )
+    is_estimated = models.BooleanField(
+        'Estimated',
+        default=True,
+        help_text='Derived from the typical month rather than a scheduled event'
+    )
+    refreshed_at = models.DateTimeField('Refreshed', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Festival Occurrence'
+        verbose_name_plural = 'Festival Occurrences'
+        ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['end_date', 'start_date'], name='festival_next_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.festival} ({self.start_date:%Y-%m-%d})"
+    
+    @property
+    def is_ongoing(self):
+        return self.start_date <= timezone.localdate() <= self.end_date
+    
+    @property
+    def days_until(self):
+        """Days until the festival starts (0 while it is under way)."""
+        return max((self.start_date - timezone.localdate()).days, 0)
+
+
+class EventArchiveMonth(models.Model):
+    """
+    Histogram of published events per local calendar month.
+    
+    Backs the event archive navigation. Maintained by ``events.signals``
+    as events change; ``rebuild_event_archive`` recomputes it in full.
+    """
+    
+    year = models.PositiveSmallIntegerField('Year')
+    month = models.PositiveSmallIntegerField('Month')
+    event_count = models.PositiveIntegerField('Events', default=0)
+    
+    class Meta:
+        verbose_name = 'Event Archive Month'
+        verbose_name_plural = 'Event Archive Months'
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='event_archive_month_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.year}-{self.month:02d} ({self.event_count})"
+    
+    @property
+    def month_name(self):
+        import calendar
+        return calendar.month_name[self.month]
+
@@ -0,0 +1,392 @@
+"""
+Occurrence engine for recurring events.
+
+An ``Event`` with a ``recurrence`` other than "one-time" stands for a
+series. This module turns series into concrete ``Occurrence`` objects
+inside a date range, applying per-occurrence ``EventException`` rows
+(cancellations, moves, venue changes).
+
+Expansion is arithmetic: the occurrence numbers that can fall inside a
+window are computed directly from the series start, so a weekly meeting
+that began years ago costs the same to expand as one that began last
+week. Recurrences keep their local wall-clock time across DST changes,
+and monthly/annual series that start on the 29th-31st fall back to the
+last day of shorter months.
+
+Expanded occurrences are cached per calendar month. Saving or deleting
+an event, category or exception bumps a generation number (see
+``events.signals``) so every cached month is rebuilt on next use.
+"""
+
+import calendar
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from palace import caching
+
+from .models import Event
+
+
+GENERATION = 'events:occurrences'
+
+
+class Occurrence:
+    """
+    One concrete occurrence of an event.
+
+    ``start_date``, ``end_date``, ``venue`` and ``is_cancelled`` belong to
+    the occurrence; every other attribute reads through to the event, so
+    templates written for ``Event`` render occurrences unchanged.
+    """
+
+    def __init__(self, event, start_date, end_date, original_start=None,
+                 is_cancelled=False, venue='', note=''):
+        self.event = event
+        self.start_date = start_date
+        self.end_date = end_date
+        self.original_start = original_start or start_date
+        self.is_cancelled = is_cancelled or event.is_cancelled
+        self.venue = venue or event.venue
+        self.note = note
+        self.now = None
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name == 'event':
+            raise AttributeError(name)
+        return getattr(self.event, name)
+
+    def __repr__(self):
+        return f'<Occurrence: {self.event} @ {self.start_date:%Y-%m-%d %H:%M}>'
+
+    @property
+    def key(self):
+        """Stable identifier for this occurrence within its series."""
+        return f'{self.event.pk}:{self.original_start:%Y%m%dT%H%M}'
+
+    @property
+    def is_recurring(self):
+        return self.event.recurrence != Event.RecurrenceType.NONE
+
+    @property
+    def effective_end(self):
+        """Last moment the occurrence is in progress (see ``Event.compute_effective_end``)."""
+        if self.end_date and not self.event.is_all_day:
+            return self.end_date
+        end = timezone.localtime(self.end_date or self.start_date)
+        return end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    
+    @property
+    def status(self):
+        now = self.now or timezone.now()
+        if self.start_date > now:
+            return Event.Status.UPCOMING
+        if self.effective_end >= now:
+            return Event.Status.ONGOING
+        return Event.Status.PAST
+
+    @property
+    def status_rank(self):
+        return {Event.Status.ONGOING: 0, Event.Status.UPCOMING: 1}.get(self.status, 2)
+
+    @property
+    def is_upcoming(self):
+        return self.status == Event.Status.UPCOMING
+
+    @property
+    def is_ongoing(self):
+        return self.status == Event.Status.ONGOING
+
+    @property
+    def is_past(self):
+        return self.status == Event.Status.PAST
+
+    @property
+    def days_until(self):
+        if not self.is_upcoming:
+            return 0
+        return (self.start_date - (self.now or timezone.now())).days
+
+    @property
+    def duration(self):
+        if self.end_date:
+            return (self.end_date - self.start_date).total_seconds() / 3600
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Series arithmetic (naive local time, so recurrences keep wall-clock time)
+# ---------------------------------------------------------------------------
+
+def _local(value):
+    return timezone.localtime(value).replace(tzinfo=None)
+
+
+def _aware(value):
+    return timezone.make_aware(value)
+
+
+def _add_months(value, months):
+    year, month = divmod(value.year * 12 + value.month - 1 + months, 12)
+    month += 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def _nth(first, rule, n):
+    """Start of occurrence number ``n`` of a series starting at ``first``."""
+    if rule == Event.RecurrenceType.WEEKLY:
+        return first + timedelta(weeks=n)
+    if rule == Event.RecurrenceType.MONTHLY:
+        return _add_months(first, n)
+    return _add_months(first, 12 * n)
+
+
+def _candidates(first, rule, lower, upper):
+    """Occurrence numbers that may start within ``[lower, upper)``."""
+    if rule == Event.RecurrenceType.WEEKLY:
+        low = (lower - first) // timedelta(weeks=1)
+        high = (upper - first) // timedelta(weeks=1)
+    else:
+        step = 1 if rule == Event.RecurrenceType.MONTHLY else 12
+
+        def months(value):
+            return (value.year - first.year) * 12 + value.month - first.month
+
+        # Clamped month ends can shift a start by a few days; one extra
+        # step either side keeps the range safe and is filtered below.
+        low = months(lower) // step - 1
+        high = months(upper) // step + 1
+    return range(max(low, 0), high + 1)
+
+
+def series_starts(event, start, end):
+    """Original start datetimes of ``event`` overlapping ``[start, end)``."""
+    length = event.compute_effective_end() - event.start_date
+    if event.recurrence == Event.RecurrenceType.NONE:
+        if event.start_date < end and event.start_date + length >= start:
+            return [event.start_date]
+        return []
+
+    first = _local(event.start_date)
+    lower, upper = _local(start) - length, _local(end)
+    last_day = event.recurrence_end
+    starts = []
+    for n in _candidates(first, event.recurrence, lower, upper):
+        local_start = _nth(first, event.recurrence, n)
+        if local_start >= upper or (last_day and local_start.date() > last_day):
+            break
+        if local_start >= lower:
+            starts.append(_aware(local_start))
+    return starts
+
+
+def has_upcoming(event, now=None):
+    """
+    Whether ``event`` has an occurrence that has not finished by ``now``.
+
+    A running series whose first start is long past still counts. Every
+    series has an occurrence within any year-long window until it ends,
+    so only the next year is expanded.
+    """
+    now = now or timezone.now()
+    if event.recurrence == Event.RecurrenceType.NONE:
+        return event.compute_effective_end() >= now
+    return bool(series_starts(event, now, now + timedelta(days=367)))
+
+
+def occurs_at(event, moment):
+    """Whether ``moment`` is the original start of one of the event's occurrences."""
+    return moment in series_starts(event, moment, moment + timedelta(seconds=1))
+
+
+def expand(event, start, end):
+    """
+    All occurrences of ``event`` overlapping ``[start, end)``.
+
+    Cancelled occurrences are included with ``is_cancelled`` set; use
+    ``exceptions`` prefetching to avoid one query per event.
+    """
+    length = event.end_date - event.start_date if event.end_date else None
+    exceptions = {exc.original_start: exc for exc in event.exceptions.all()}
+    occurrences = []
+    for original in series_starts(event, start, end):
+        exc = exceptions.pop(original, None)
+        occurrences.append(_build(event, original, length, exc))
+
+    # Occurrences moved into the window from outside it
+    for original, exc in exceptions.items():
+        if exc.start_date and start <= exc.start_date < end and occurs_at(event, original):
+            occurrences.append(_build(event, original, length, exc))
+
+    return [
+        occ for occ in occurrences
+        if occ.start_date < end and occ.effective_end >= start
+    ]
+
+
+def _build(event, original, length, exc=None):
+    start_date = exc.start_date if exc and exc.start_date else original
+    if exc and exc.end_date:
+        end_date = exc.end_date
+    else:
+        end_date = start_date + length if length is not None else None
+    return Occurrence(
+        event,
+        start_date,
+        end_date,
+        original_start=original,
+        is_cancelled=bool(exc and exc.is_cancelled),
+        venue=exc.venue if exc else '',
+        note=exc.note if exc else '',
+    )
+
+
+# ---------------------------------------------------------------------------
+# Month-window cache
+# ---------------------------------------------------------------------------
+
+def invalidate():
+    """Discard every cached occurrence window."""
+    caching.bump(GENERATION)
+
+
+def generation():
+    """Token that changes whenever cached occurrences become stale."""
+    return caching.generation(GENERATION)
+
+
+def month_bounds(year, month):
+    """Aware ``[start, end)`` datetimes of a local calendar month."""
+    start = _aware(datetime(year, month, 1))
+    end = _aware(_add_months(datetime(year, month, 1), 1))
+    return start, end
+
+
+def month_windows(start, end):
+    """``(year, month)`` pairs of the local months overlapping ``[start, end)``."""
+    local = _local(start).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    months = []
+    while _aware(local) < end:
+        months.append((local.year, local.month))
+        local = _add_months(local, 1)
+    return months
+
+
+def _series_overlapping(start, end):
+    """Published events with at least one occurrence that may fall in range."""
+    one_time = Q(recurrence=Event.RecurrenceType.NONE, effective_end__gte=start)
+    recurring = ~Q(recurrence=Event.RecurrenceType.NONE) & (
+        Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=timezone.localdate(start))
+    )
+    return Event.objects.published().filter(
+        Q(start_date__lt=end) | Q(exceptions__start_date__lt=end),
+        one_time | recurring,
+    ).distinct().select_related('category').prefetch_related('exceptions')
+
+
+def _windows(months):
+    """Cached occurrences for each ``(year, month)``, building misses in one query."""
+    current = generation()
+    keys = {month: f'events:occurrences:{current}:{month[0]}-{month[1]:02d}' for month in months}
+    found = cache.get_many(keys.values())
+    windows = {month: found[key] for month, key in keys.items() if key in found}
+
+    missing = [month for month in months if month not in windows]
+    if missing:
+        bounds = {month: month_bounds(*month) for month in missing}
+        events = list(_series_overlapping(
+            min(b[0] for b in bounds.values()), max(b[1] for b in bounds.values())
+        ))
+        for month, (start, end) in bounds.items():
+            windows[month] = [occ for event in events for occ in expand(event, start, end)]
+        cache.set_many(
+            {keys[month]: windows[month] for month in missing},
+            getattr(settings, 'EVENT_OCCURRENCE_CACHE_TIMEOUT', 300)
+        )
+    return windows
+
+
+def between(start, end, queryset=None, include_cancelled=False, now=None):
+    """
+    Occurrences of published events overlapping ``[start, end)``.
+
+    Pass ``queryset`` to keep only occurrences of the events it matches
+    (e.g. a category or search filter). Results are ordered by start.
+    """
+    allowed = set(queryset.values_list('pk', flat=True)) if queryset is not None else None
+    now = now or timezone.now()
+    seen = set()
+    occurrences = []
+    for month, window in sorted(_windows(month_windows(start, end)).items()):
+        for occ in window:
+            if occ.key in seen or occ.start_date >= end or occ.effective_end < start:
+                continue
+            if allowed is not None and occ.event.pk not in allowed:
+                continue
+            if occ.is_cancelled and not include_cancelled:
+                continue
+            seen.add(occ.key)
+            occ.now = now
+            occurrences.append(occ)
+    occurrences.sort(key=lambda occ: (occ.start_date, occ.event.pk))
+    return occurrences
+
+
+def _upcoming_range(now):
+    today = _aware(datetime.combine(timezone.localdate(now), time.min))
+    return today, now + timedelta(days=getattr(settings, 'EVENT_OCCURRENCE_HORIZON_DAYS', 365))
+
+
+def _beyond_horizon(queryset, horizon, now):
+    """One-time events starting after the expanded range."""
+    return (queryset if queryset is not None else Event.objects.published()).filter(
+        recurrence=Event.RecurrenceType.NONE, start_date__gte=horizon
+    ).with_status(now).order_by('start_date')
+
+
+def upcoming_queries(now=None):
+    """
+    The event querysets ``upcoming`` runs when no month window is cached.
+
+    Used by ``suggest_indexes`` and ``benchmark_indexes`` to replay what
+    the event list actually asks the database.
+    """
+    now = now or timezone.now()
+    today, horizon = _upcoming_range(now)
+    bounds = [month_bounds(*month) for month in month_windows(today, horizon)]
+    return [
+        _series_overlapping(bounds[0][0], bounds[-1][1]),
+        _beyond_horizon(None, horizon, now),
+    ]
+
+
+def upcoming(now=None, queryset=None, limit=None):
+    """
+    Occurrences that have not finished yet, ongoing first.
+
+    Occurrences are expanded up to ``EVENT_OCCURRENCE_HORIZON_DAYS`` ahead;
+    one-time events beyond the horizon are appended from the database.
+    """
+    now = now or timezone.now()
+    today, horizon = _upcoming_range(now)
+
+    occurrences = [occ for occ in between(today, horizon, queryset, now=now) if not occ.is_past]
+    occurrences.sort(key=lambda occ: (occ.status_rank, occ.start_date))
+    if limit is not None and len(occurrences) >= limit:
+        return occurrences[:limit]
+
+    later = _beyond_horizon(queryset, horizon, now)
+    if limit is not None:
+        later = later[:limit - len(occurrences)]
+    return occurrences + list(later)
+
+
+def calendar_window(now=None):
+    """Default range shown by the calendar: this month and the next year."""
+    now = now or timezone.now()
+    start = _aware(_local(now).replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+    return start, _aware(_add_months(_local(start), 13))
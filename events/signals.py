@@ -0,0 +1,117 @@
+"""
+Signal handlers for the events app.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from ejeh_palace import live
+from palace.counters import track_category_count
+from palace.publishing import schedule_publishing
+from palace.snapshots import previous_row, track_previous
+
+from . import occurrences
+from .archive import period_of, refresh_months
+from .festivals import refresh_festival
+from .models import Event, EventCategory, EventException, TraditionalFestival
+
+
+# One stored-row lookup per save, shared by the pre_save handlers below
+track_previous(Event)
+track_previous(EventException)
+
+
+track_category_count(
+    Event,
+    category_field='category',
+    counter_field='upcoming_count',
+    is_counted=lambda event: (
+        event.is_published and not event.is_cancelled and occurrences.has_upcoming(event)
+    ),
+)
+
+
+schedule_publishing(
+    Event,
+    generations=[occurrences.GENERATION],
+    pages=['events:list', 'events:calendar_events', 'palace:home'],
+)
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventCategory)
+@receiver([post_save, post_delete], sender=EventException)
+def invalidate_occurrences(sender, **kwargs):
+    """Cached occurrence windows embed events and categories; rebuild them."""
+    occurrences.invalidate()
+
+
+@receiver(post_save, sender=TraditionalFestival)
+def refresh_festival_occurrence(sender, instance, raw=False, **kwargs):
+    """Keep the festival's next-occurrence row current as it is edited."""
+    if not raw:
+        refresh_festival(instance)
+
+
+@receiver(pre_save, sender=Event, dispatch_uid='events.archive.pre_save')
+def remember_archive_period(sender, instance, raw=False, **kwargs):
+    previous = None if raw else previous_row(instance)
+    instance._archive_period = period_of(previous) if previous else None
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events.archive.post_save')
+def update_archive_on_save(sender, instance, raw=False, **kwargs):
+    """Recount the archive months an event moved out of and into."""
+    if raw:
+        return
+    before, after = getattr(instance, '_archive_period', None), period_of(instance)
+    if before != after:
+        refresh_months(period for period in (before, after) if period)
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='events.archive.post_delete')
+def update_archive_on_delete(sender, instance, **kwargs):
+    period = period_of(instance)
+    if period:
+        refresh_months([period])
+
+
+@receiver(pre_save, sender=Event, dispatch_uid='events.live.pre_save')
+@receiver(pre_save, sender=EventException, dispatch_uid='events.live.exception_pre_save')
+def remember_cancellation(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._was_cancelled = True
+    if raw or (update_fields is not None and not {'is_published', 'is_cancelled'} & set(update_fields)):
+        return
+    fields = ['is_cancelled', 'is_published'] if sender is Event else ['is_cancelled']
+    previous = previous_row(instance)
+    instance._was_cancelled = previous is not None and all(getattr(previous, name) for name in fields)
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events.live.post_save')
+def push_event_cancellation(sender, instance, raw=False, **kwargs):
+    """Tell connected browsers when a published event is cancelled."""
+    if raw or getattr(instance, '_was_cancelled', True):
+        return
+    if instance.is_published and instance.is_cancelled:
+        live.publish('cancelled', {
+            'id': instance.pk,
+            'title': instance.title,
+            'start': instance.start_date,
+            'occurrence': False,
+            'url': instance.get_absolute_url(),
+        })
+
+
+@receiver(post_save, sender=EventException, dispatch_uid='events.live.exception_post_save')
+def push_occurrence_cancellation(sender, instance, raw=False, **kwargs):
+    """Same for a single cancelled occurrence of a recurring event."""
+    if raw or getattr(instance, '_was_cancelled', True):
+        return
+    if instance.is_cancelled and instance.event.is_published:
+        live.publish('cancelled', {
+            'id': instance.event_id,
+            'title': instance.event.title,
+            'start': instance.original_start,
+            'occurrence': True,
+            'url': instance.event.get_absolute_url(),
+        })
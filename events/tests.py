@@ -0,0 +1,94 @@
+"""
+Tests for the event archive views and save signals.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Event, EventCategory
+
+
+class ArchivePeriodTests(TestCase):
+
+    def test_years_outside_the_calendar_are_not_found(self):
+        for kwargs in ({'year': 0}, {'year': 1}, {'year': 1, 'month': 1}, {'year': 9999}, {'year': 10000}, {'year': 9999, 'month': 12}):
+            name = 'events:archive_month' if 'month' in kwargs else 'events:archive_year'
+            with self.subTest(**kwargs):
+                self.assertEqual(self.client.get(reverse(name, kwargs=kwargs)).status_code, 404)
+
+    def test_first_and_last_supported_years_render(self):
+        for kwargs in ({'year': 2}, {'year': 2, 'month': 1}, {'year': 9998}, {'year': 9998, 'month': 12}):
+            name = 'events:archive_month' if 'month' in kwargs else 'events:archive_year'
+            with self.subTest(**kwargs):
+                self.assertEqual(self.client.get(reverse(name, kwargs=kwargs)).status_code, 200)
+
+    def test_invalid_month_is_not_found(self):
+        response = self.client.get(reverse('events:archive_month', kwargs={'year': 2024, 'month': 13}))
+        self.assertEqual(response.status_code, 404)
+
+
+class CalendarEventsTests(TestCase):
+
+    def test_ranges_at_the_edges_of_the_calendar(self):
+        for query in (
+            {'start': '0001-01-01', 'end': '0001-03-01'},
+            {'start': '0001-01-01T00:00:00'},
+            {'start': '0001-01-01T00:00:00+14:00'},
+            {'start': '9999-12-01'},
+            {'start': '9999-12-01', 'end': '9999-12-31T23:59:59'},
+            {'end': '0001-01-02'},
+        ):
+            with self.subTest(**query):
+                response = self.client.get(reverse('events:calendar_events'), query)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(b''.join(response.streaming_content), b'[]')
+
+
+class SaveSignalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = EventCategory.objects.create(name='Festivals', slug='festivals')
+        cls.event = Event.objects.create(
+            title='New yam festival',
+            slug='new-yam-festival',
+            description='Dancers and drummers at the palace.',
+            venue='Palace grounds',
+            category=cls.category,
+            start_date=timezone.now() + timedelta(days=10),
+            is_published=True,
+        )
+
+    def test_stored_row_is_fetched_once_per_save(self):
+        lookup = f'FROM "events_event" WHERE "events_event"."id" = {self.event.pk}'
+        with mock.patch('ejeh_palace.live.publish') as publish:
+            with CaptureQueriesContext(connection) as queries:
+                self.event.is_cancelled = True
+                self.event.save()
+        self.assertEqual(sum(lookup in query['sql'] for query in queries), 1)
+
+        # Every handler still saw the stored row
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.upcoming_count, 0)
+        self.assertEqual(publish.call_args[0][0], 'cancelled')
+
+    def test_new_rows_skip_the_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            Event.objects.create(
+                title='Council meeting',
+                slug='council-meeting',
+                description='Chiefs meet at the palace.',
+                venue='Council hall',
+                category=self.category,
+                start_date=timezone.now() + timedelta(days=3),
+                is_published=True,
+            )
+        self.assertFalse(any(query['sql'].startswith('SELECT "events_event"') for query in queries))
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.upcoming_count, 2)
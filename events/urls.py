@@ -12,6 +12,13 @@ urlpatterns = [
     path('', views.EventListView.as_view(), name='list'),
     path('calendar/', views.CalendarView.as_view(), name='calendar'),
     path('calendar/events/', views.calendar_events, name='calendar_events'),
+    path('feeds/events.ics', views.ical_all, name='ical_all'),
+    path('feeds/category/<slug:slug>.ics', views.ical_category, name='ical_category'),
+    path('feeds/type/<slug:event_type>.ics', views.ical_type, name='ical_type'),
+    path('feeds/festival/<slug:slug>.ics', views.ical_festival, name='ical_festival'),
+    path('archive/', views.EventArchiveView.as_view(), name='archive'),
+    path('archive/<int:year>/', views.EventArchivePeriodView.as_view(), name='archive_year'),
+    path('archive/<int:year>/<int:month>/', views.EventArchivePeriodView.as_view(), name='archive_month'),
     path('festivals/', views.TraditionalFestivalListView.as_view(), name='festivals'),
     path('festival/<slug:slug>/', views.TraditionalFestivalDetailView.as_view(), name='festival_detail'),
     path('<slug:slug>/', views.EventDetailView.as_view(), name='detail'),
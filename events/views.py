@@ -8,16 +8,39 @@ from django.views.generic import (
 )
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
-from django.db.models import Q
-from django.http import JsonResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from datetime import datetime, time, timedelta
+import hashlib
 import json
 
+from . import ical, occurrences
+from .archive import archive_months, archive_years, period_events
+from .festivals import upcoming_festivals
 from .models import Event, EventCategory, TraditionalFestival
 from .forms import EventForm, TraditionalFestivalForm
 
 
+CALENDAR_COLORS = {
+    'ceremony': '#8B4513',
+    'festival': '#228B22',
+    'meeting': '#17a2b8',
+    'celebration': '#ffc107',
+    'other': '#6c757d',
+}
+
+EVENT_TYPE_LABELS = dict(Event.EventType.choices)
+
+
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """Mixin for views that require palace admin access."""
     
@@ -36,10 +59,9 @@ class EventListView(ListView):
     paginate_by = 12
     
     def get_queryset(self):
-        queryset = Event.objects.filter(
-            is_published=True,
-            is_cancelled=False
-        )
+        # One timestamp for the whole request so every status agrees
+        self.now = timezone.now()
+        queryset = Event.objects.published()
         
         # Filter by category
         category_slug = self.request.GET.get('category')
@@ -51,17 +73,6 @@ class EventListView(ListView):
         if event_type:
             queryset = queryset.filter(event_type=event_type)
         
-        # Filter by time frame
-        time_frame = self.request.GET.get('time', 'upcoming')
-        now = timezone.now()
-        
-        if time_frame == 'upcoming':
-            queryset = queryset.filter(start_date__gte=now)
-        elif time_frame == 'past':
-            queryset = queryset.filter(start_date__lt=now)
-        elif time_frame == 'today':
-            queryset = queryset.filter(start_date__date=now.date())
-        
         # Search
         search = self.request.GET.get('search')
         if search:
@@ -71,7 +82,23 @@ class EventListView(ListView):
                 Q(venue__icontains=search)
             )
         
-        return queryset
+        # Filter by time frame; upcoming and today expand recurring events.
+        # Occurrences only need restricting when a filter was applied.
+        time_frame = self.request.GET.get('time', 'upcoming')
+        scope = queryset if (category_slug or event_type or search) else None
+        
+        if time_frame == 'upcoming':
+            return occurrences.upcoming(self.now, scope)
+        elif time_frame == 'past':
+            return queryset.past(self.now)
+        elif time_frame == 'today':
+            today = timezone.make_aware(
+                datetime.combine(timezone.localdate(self.now), time.min)
+            )
+            return occurrences.between(
+                today, today + timedelta(days=1), scope, now=self.now
+            )
+        return queryset.with_status(self.now).order_by('status_rank', 'start_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -82,12 +109,9 @@ class EventListView(ListView):
         context['current_time'] = self.request.GET.get('time', 'upcoming')
         
         # Featured events
-        context['featured_events'] = Event.objects.filter(
-            is_published=True,
-            is_featured=True,
-            is_cancelled=False,
-            start_date__gte=timezone.now()
-        )[:3]
+        context['featured_events'] = occurrences.upcoming(
+            self.now, Event.objects.published().filter(is_featured=True), limit=3
+        )
         
         return context
 
@@ -102,58 +126,91 @@ class EventDetailView(DetailView):
     slug_url_kwarg = 'slug'
     
     def get_queryset(self):
+        self.now = timezone.now()
         if self.request.user.is_authenticated and self.request.user.can_manage_content:
-            return Event.objects.all()
-        return Event.objects.filter(is_published=True)
+            return Event.objects.with_status(self.now)
+        return Event.objects.filter(is_published=True).with_status(self.now)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Related events
-        context['related_events'] = Event.objects.filter(
-            is_published=True,
-            is_cancelled=False,
-            category=self.object.category,
-            start_date__gte=timezone.now()
-        ).exclude(pk=self.object.pk)[:3]
+        context['related_events'] = Event.objects.published().filter(
+            category=self.object.category
+        ).upcoming(self.now).exclude(pk=self.object.pk)[:3]
         return context
 
 
 class CalendarView(TemplateView):
-    """Calendar view of events."""
+    """
+    Calendar view of events.
+    
+    The page carries no event data: FullCalendar fetches each visible
+    range from ``calendar_events``, so the page size and render time stay
+    constant however many events exist.
+    """
     
     template_name = 'events/calendar.html'
     
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # Only base.html's per-user navigation and CSRF token vary, so the
+        # browser may reuse the page unless it is showing flash messages.
+        if not len(messages.get_messages(request)):
+            patch_cache_control(response, private=True, max_age=300)
+            patch_vary_headers(response, ['Cookie'])
+        return response
+
+
+class EventArchiveView(TemplateView):
+    """Archive landing page: event counts per year and month."""
+    
+    template_name = 'events/archive.html'
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['archive_years'] = archive_years(archive_months(timezone.now()))
+        return context
+
+
+class EventArchivePeriodView(ListView):
+    """Events of one archived year or month."""
+    
+    template_name = 'events/archive_period.html'
+    context_object_name = 'events'
+    paginate_by = 12
+    
+    def get_queryset(self):
+        self.year = self.kwargs['year']
+        self.month = self.kwargs.get('month')
+        if self.month is not None and not 1 <= self.month <= 12:
+            raise Http404('Invalid month.')
+        # Bounds run to the start of the next year, and local year 1 begins
+        # before datetime.min in UTC east of Greenwich
+        if not 2 <= self.year <= 9998:
+            raise Http404('Invalid year.')
+        self.now = timezone.now()
+        return period_events(self.year, self.month, self.now)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        months = archive_months(self.now)
+        context['archive_years'] = archive_years(months)
+        context['year'] = self.year
+        context['month'] = self.month
+        if self.month is not None:
+            context['period_label'] = f"{datetime(self.year, self.month, 1):%B} {self.year}"
+        else:
+            context['period_label'] = str(self.year)
+            context['year_months'] = sorted(
+                (row for row in months if row.year == self.year), key=lambda row: row.month
+            )
         
-        # Get events for calendar
-        events = Event.objects.filter(
-            is_published=True,
-            is_cancelled=False
-        ).values(
-            'id', 'title', 'slug', 'start_date', 'end_date',
-            'is_all_day', 'venue', 'category__color'
-        )
-        
-        # Format for FullCalendar
-        calendar_events = []
-        for event in events:
-            calendar_events.append({
-                'id': event['id'],
-                'title': event['title'],
-                'start': event['start_date'].isoformat(),
-                'end': event['end_date'].isoformat() if event['end_date'] else None,
-                'allDay': event['is_all_day'],
-                'url': f"/events/{event['slug']}/",
-                'backgroundColor': event['category__color'] or '#8B4513',
-                'extendedProps': {
-                    'venue': event['venue']
-                }
-            })
-        
-        context['calendar_events'] = json.dumps(calendar_events)
-        context['categories'] = EventCategory.objects.all()
-        
+        # Neighbouring periods that have events; the histogram is newest first
+        periods = [(row.year, row.month) for row in months]
+        if self.month is not None and (self.year, self.month) in periods:
+            index = periods.index((self.year, self.month))
+            context['newer_period'] = periods[index - 1] if index > 0 else None
+            context['older_period'] = periods[index + 1] if index + 1 < len(periods) else None
         return context
 
 
@@ -165,7 +222,14 @@ class TraditionalFestivalListView(ListView):
     context_object_name = 'festivals'
     
     def get_queryset(self):
-        return TraditionalFestival.objects.filter(is_active=True)
+        return TraditionalFestival.objects.filter(
+            is_active=True
+        ).select_related('next_occurrence')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['upcoming_festivals'] = upcoming_festivals()[:3]
+        return context
 
 
 class TraditionalFestivalDetailView(DetailView):
@@ -271,7 +335,7 @@ class EventManageListView(AdminRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        return Event.objects.all().order_by('-start_date')
+        return Event.objects.with_status().order_by('-start_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -279,36 +343,247 @@ class EventManageListView(AdminRequiredMixin, ListView):
         return context
 
 
+def _parse_bound(value):
+    """Parse a FullCalendar ``start``/``end`` parameter (date or datetime)."""
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value.replace(' ', '+'))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        try:
+            day = parse_date(value[:10])
+        except ValueError:
+            return None
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    # Month windows reach a month either side of the range and the range
+    # can grow by 400 days, so stay well inside what datetime can hold
+    lowest = timezone.make_aware(datetime(2, 1, 1))
+    highest = timezone.make_aware(datetime(9998, 1, 1))
+    return min(max(parsed, lowest), highest)
+
+
+def _calendar_months(months):
+    """
+    Serialized calendar entries for each ``(year, month)``.
+    
+    Entries are ``(start, status_end, key, payload)`` tuples cached under
+    the occurrence generation, so edits to events invalidate them too.
+    Missing months are built from a single occurrence lookup.
+    """
+    current = occurrences.generation()
+    keys = {month: f'events:calendar:{current}:{month[0]}-{month[1]:02d}' for month in months}
+    found = cache.get_many(keys.values())
+    windows = {month: found[key] for month, key in keys.items() if key in found}
+    
+    missing = [month for month in months if month not in windows]
+    if missing:
+        bounds = {month: occurrences.month_bounds(*month) for month in missing}
+        events = occurrences.between(
+            bounds[missing[0]][0], bounds[missing[-1]][1], include_cancelled=True
+        )
+        # One reverse() for all events; slugs are substituted below
+        detail_url = reverse('events:detail', kwargs={'slug': 'event-slug'})
+        entries = []
+        for event in events:
+            local_start = timezone.localtime(event.start_date)
+            status_end = event.effective_end
+            description = event.description
+            entries.append((event.start_date, status_end, event.key, {
+                'id': event.key,
+                'groupId': event.event.pk,
+                'title': event.title,
+                'start': event.start_date.isoformat(),
+                'end': event.end_date.isoformat() if event.end_date else None,
+                'allDay': event.is_all_day,
+                'url': detail_url.replace('event-slug', event.slug),
+                'backgroundColor': CALENDAR_COLORS.get(event.event_type, '#8B4513'),
+                'extendedProps': {
+                    'venue': event.venue,
+                    'eventType': EVENT_TYPE_LABELS.get(event.event_type, event.event_type),
+                    'cancelled': event.is_cancelled,
+                    'recurring': event.is_recurring,
+                    'note': event.note,
+                    'time': local_start.strftime('%I:%M %p') if not event.is_all_day else None,
+                    'description': description[:100] + '...' if len(description) > 100 else description,
+                }
+            }))
+        for month, (start, end) in bounds.items():
+            windows[month] = [
+                entry for entry in entries
+                if entry[0] < end and entry[1] >= start
+            ]
+        cache.set_many(
+            {keys[month]: windows[month] for month in missing},
+            getattr(settings, 'EVENT_OCCURRENCE_CACHE_TIMEOUT', 300)
+        )
+    return current, windows
+
+
+def _entry_status(start, status_end, now):
+    if start > now:
+        return Event.Status.UPCOMING
+    if status_end >= now:
+        return Event.Status.ONGOING
+    return Event.Status.PAST
+
+
+def _stream_entries(entries, now, batch_size=100):
+    """Encode entries as a JSON array in batches, adding the live status."""
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    yield '['
+    for offset in range(0, len(entries), batch_size):
+        chunk = []
+        for start, status_end, key, payload in entries[offset:offset + batch_size]:
+            payload = dict(payload, extendedProps=dict(
+                payload['extendedProps'], status=_entry_status(start, status_end, now)
+            ))
+            chunk.append(encode(payload))
+        yield (',' if offset else '') + ','.join(chunk)
+    yield ']'
+
+
 def calendar_events(request):
-    """API endpoint for calendar events (JSON)."""
-    events = Event.objects.filter(
-        is_published=True,
-        is_cancelled=False
-    )
+    """
+    API endpoint for calendar events (JSON).
+    
+    Honours FullCalendar's ``start``/``end`` parameters. The ETag covers
+    the cache generation, the range and how many start/end boundaries
+    have passed, so it changes exactly when an entry or its status does.
+    """
+    default_start, default_end = occurrences.calendar_window()
+    start = _parse_bound(request.GET.get('start')) or default_start
+    end = _parse_bound(request.GET.get('end')) or default_end
+    # Keep expansion bounded however wide the requested range is
+    end = min(end, start + timedelta(days=400))
+    
+    current, windows = _calendar_months(occurrences.month_windows(start, end))
+    now = timezone.now()
+    seen = set()
+    entries = []
+    passed = 0
+    for month in sorted(windows):
+        for entry in windows[month]:
+            if entry[2] in seen or entry[0] >= end or entry[1] < start:
+                continue
+            seen.add(entry[2])
+            entries.append(entry)
+            passed += (entry[0] <= now) + (entry[1] < now)
+    
+    etag = quote_etag(hashlib.md5(
+        f'{current}|{start.isoformat()}|{end.isoformat()}|{passed}'.encode()
+    ).hexdigest())
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+    else:
+        entries.sort(key=lambda entry: entry[0])
+        response = StreamingHttpResponse(
+            _stream_entries(entries, now), content_type='application/json'
+        )
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
+# ============== ICALENDAR FEEDS ==============
+
+def _feed_events(queryset, now):
+    """Published events worth subscribing to: recent, upcoming or still recurring."""
+    cutoff = now - timedelta(days=getattr(settings, 'ICAL_FEED_HISTORY_DAYS', 365))
+    return queryset.filter(is_published=True).filter(
+        Q(start_date__gte=cutoff) |
+        Q(end_date__gte=cutoff) |
+        (~Q(recurrence=Event.RecurrenceType.NONE) &
+         (Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=cutoff.date())))
+    ).select_related('category').prefetch_related('exceptions').order_by('start_date')
+
+
+def _ical_response(request, feed_key, name, queryset):
+    """
+    Serve an .ics feed, streaming it on a cache miss.
+    
+    The body is cached under the occurrence generation, which changes on
+    every event, category or exception edit, so feeds are regenerated
+    only when events change. Conditional requests are answered from the
+    ETag/Last-Modified stored with the body.
+    """
+    host = request.get_host()
+    current = occurrences.generation()
+    key = 'events:ics:' + hashlib.md5(f'{current}|{host}|{feed_key}'.encode()).hexdigest()
+    etag = quote_etag(key.rsplit(':', 1)[1])
+    cached = cache.get(key)
+    
+    now = timezone.now()
+    events = _feed_events(queryset, now)
+    if cached is not None:
+        last_modified, body = cached
+    else:
+        latest = events.order_by().aggregate(latest=Max('updated_at'))['latest']
+        last_modified, body = int((latest or now).timestamp()), None
     
-    event_data = []
-    for event in events:
-        color_map = {
-            'ceremony': '#8B4513',
-            'festival': '#228B22',
-            'meeting': '#17a2b8',
-            'celebration': '#ffc107',
-            'other': '#6c757d',
-        }
-        event_data.append({
-            'id': event.id,
-            'title': event.title,
-            'start': event.start_date.isoformat(),
-            'end': event.end_date.isoformat() if event.end_date else None,
-            'allDay': event.is_all_day,
-            'url': event.get_absolute_url(),
-            'backgroundColor': color_map.get(event.event_type, '#8B4513'),
-            'extendedProps': {
-                'venue': event.venue,
-                'eventType': event.get_event_type_display(),
-                'time': event.start_date.strftime('%I:%M %p') if not event.is_all_day else None,
-                'description': event.description[:100] + '...' if len(event.description) > 100 else event.description,
-            }
-        })
-    
-    return JsonResponse(event_data, safe=False)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is None and body is not None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    elif not_modified is None:
+        detail_url = request.build_absolute_uri(reverse('events:detail', kwargs={'slug': 'event-slug'}))
+        
+        def stream():
+            chunks = []
+            for line in ical.calendar_lines(
+                events.iterator(chunk_size=200), name, host,
+                lambda event: detail_url.replace('event-slug', event.slug),
+            ):
+                chunks.append(line)
+                yield line
+            cache.set(
+                key, (last_modified, ''.join(chunks)),
+                getattr(settings, 'ICAL_FEED_CACHE_TIMEOUT', 3600)
+            )
+        
+        response = StreamingHttpResponse(stream(), content_type='text/calendar; charset=utf-8')
+    else:
+        response = not_modified
+    
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Content-Disposition'] = f'inline; filename="{feed_key.replace(":", "-")}.ics"'
+    patch_cache_control(response, public=True, max_age=900)
+    return response
+
+
+def ical_all(request):
+    """iCalendar feed of all public events."""
+    return _ical_response(request, 'events', 'Ejeh Ankpa Palace Events', Event.objects.all())
+
+
+def ical_category(request, slug):
+    """iCalendar feed of one event category."""
+    category = get_object_or_404(EventCategory, slug=slug)
+    return _ical_response(
+        request, f'category:{slug}', f'Palace Events - {category.name}',
+        Event.objects.filter(category=category)
+    )
+
+
+def ical_type(request, event_type):
+    """iCalendar feed of one event type."""
+    if event_type not in EVENT_TYPE_LABELS:
+        raise Http404('Unknown event type.')
+    return _ical_response(
+        request, f'type:{event_type}', f'Palace Events - {EVENT_TYPE_LABELS[event_type]}',
+        Event.objects.filter(event_type=event_type)
+    )
+
+
+def ical_festival(request, slug):
+    """iCalendar feed of the events held for a traditional festival."""
+    festival = get_object_or_404(TraditionalFestival, slug=slug, is_active=True)
+    return _ical_response(
+        request, f'festival:{slug}', festival.name, festival.matching_events()
+    )
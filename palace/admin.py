@@ -3,9 +3,10 @@ Admin configuration for palace app.
 """
 
 from django.contrib import admin
+from django.utils import timezone
 from .models import (
     EjehProfile, GalleryCategory, GalleryImage,
-    HistoryArticle, TraditionalTitle, PalaceInfo
+    HistoryArticle, TraditionalTitle, PalaceInfo, Task, PeriodicJob
 )
 
 
@@ -53,7 +54,7 @@ class EjehProfileAdmin(admin.ModelAdmin):
 class GalleryCategoryAdmin(admin.ModelAdmin):
     """Admin for gallery categories."""
     
-    list_display = ['name', 'slug', 'display_order', 'is_active']
+    list_display = ['name', 'slug', 'display_order', 'is_active', 'image_count']
     prepopulated_fields = {'slug': ('name',)}
     ordering = ['display_order', 'name']
 
@@ -139,3 +140,40 @@ class PalaceInfoAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Admin for queued and finished background tasks."""
+    
+    list_display = ['name', 'status', 'attempts', 'queued_at', 'started_at', 'duration']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    date_hierarchy = 'queued_at'
+    readonly_fields = [
+        'name', 'args', 'kwargs', 'attempts', 'claimed_by', 'locked_until',
+        'last_error', 'queued_at', 'started_at', 'finished_at', 'duration'
+    ]
+    actions = ['retry_tasks']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Retry selected failed tasks')
+    def retry_tasks(self, request, queryset):
+        retried = queryset.filter(status=Task.Status.FAILED).update(
+            status=Task.Status.QUEUED, attempts=0, run_after=timezone.now()
+        )
+        self.message_user(request, f'{retried} task(s) queued again.')
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    """Admin showing when maintenance jobs ran and whether they failed."""
+    
+    list_display = ['name', 'next_run_at', 'last_run_at', 'last_duration', 'run_count', 'failure_count']
+    readonly_fields = ['name', 'last_run_at', 'last_duration', 'last_error', 'run_count', 'failure_count']
+    fields = ['name', 'next_run_at'] + readonly_fields[1:]
+    
+    def has_add_permission(self, request):
+        return False
@@ -5,3 +5,6 @@ class PalaceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'palace'
     verbose_name = 'Palace & Royal Gallery'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,55 @@
+"""
+Cache generations.
+
+Cached fragments embed a generation token in their keys; bumping the
+generation makes every such key unreachable at once, so stale entries
+simply age out instead of having to be found and deleted.
+
+The current tokens live in ``CacheGeneration`` rows rather than in the
+cache itself: with a per-process cache (LocMem) a bump by the worker or
+the scheduler would otherwise never reach the web workers. Each process
+re-reads a token at most every ``CACHE_GENERATION_CHECK_SECONDS``; the
+process that bumps sees the new token at once.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import CacheGeneration
+
+
+# Token of a generation that has never been bumped
+INITIAL = 'initial'
+
+
+def _key(name):
+    return f'{name}:generation'
+
+
+def _remember(name, token):
+    cache.set(_key(name), token, getattr(settings, 'CACHE_GENERATION_CHECK_SECONDS', 5))
+
+
+def shared():
+    """Whether every process sees the same cache, so warming it helps visitors."""
+    backend = settings.CACHES['default']['BACKEND']
+    return not backend.endswith(('LocMemCache', 'DummyCache'))
+
+
+def bump(name):
+    """Invalidate everything cached under generation ``name``."""
+    token = uuid.uuid4().hex
+    CacheGeneration.objects.update_or_create(name=name, defaults={'token': token})
+    _remember(name, token)
+
+
+def generation(name):
+    """Token that changes whenever entries cached under ``name`` become stale."""
+    current = cache.get(_key(name))
+    if current is None:
+        # Reads never write: a generation nobody has bumped yet has no row
+        current = CacheGeneration.objects.filter(name=name).values_list('token', flat=True).first() or INITIAL
+        _remember(name, current)
+    return current
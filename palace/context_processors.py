@@ -2,6 +2,8 @@
 Context processor for palace-wide template variables.
 """
 
+from django.conf import settings
+
 from .models import PalaceInfo, EjehProfile
 
 
@@ -36,4 +38,5 @@ def palace_context(request):
         'present_ejeh': present_ejeh,
         'palace_logo_url': palace_logo_url,
         'palace_favicon_url': palace_favicon_url,
+        'live_events_url': settings.LIVE_EVENTS_PATH if settings.LIVE_EVENTS_ENABLED else None,
     }
@@ -0,0 +1,62 @@
+"""
+Denormalized per-category content counters.
+
+``track_category_count`` keeps a counter column on a category model in
+step with the rows that belong to it. Signals apply ``F()`` increments
+and decrements as rows are created, re-categorised, (un)published or
+deleted. Bulk ``QuerySet.update()`` calls bypass signals, so the
+``recount`` management command rebuilds every counter from scratch.
+"""
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .snapshots import previous_row, track_previous
+
+
+def _adjust(category_model, counter_field, category_id, delta, using):
+    if category_id is None or not delta:
+        return
+    category_model.objects.using(using).filter(pk=category_id).update(
+        **{counter_field: F(counter_field) + delta}
+    )
+
+
+def track_category_count(model, category_field, counter_field, is_counted):
+    """
+    Maintain ``counter_field`` on the model behind ``category_field``.
+
+    ``is_counted(instance)`` decides whether a row contributes to its
+    category's count (e.g. published images only).
+    """
+    category_model = model._meta.get_field(category_field).related_model
+    attname = model._meta.get_field(category_field).attname
+    uid = f'{model._meta.label}.{counter_field}'
+
+    track_previous(model)
+
+    def remember_previous(sender, instance, raw=False, **kwargs):
+        previous = None if raw else previous_row(instance)
+        instance._counted_before = (
+            (getattr(previous, attname), is_counted(previous)) if previous else (None, False)
+        )
+
+    def apply_change(sender, instance, raw=False, using=None, **kwargs):
+        if raw:
+            return
+        old_category, was_counted = getattr(instance, '_counted_before', (None, False))
+        new_category, now_counted = getattr(instance, attname), is_counted(instance)
+        if (old_category, was_counted) == (new_category, now_counted):
+            return
+        with transaction.atomic(using=using):
+            _adjust(category_model, counter_field, old_category, -int(was_counted), using)
+            _adjust(category_model, counter_field, new_category, int(now_counted), using)
+
+    def apply_delete(sender, instance, using=None, **kwargs):
+        if is_counted(instance):
+            _adjust(category_model, counter_field, getattr(instance, attname), -1, using)
+
+    pre_save.connect(remember_previous, sender=model, weak=False, dispatch_uid=f'{uid}.pre_save')
+    post_save.connect(apply_change, sender=model, weak=False, dispatch_uid=f'{uid}.post_save')
+    post_delete.connect(apply_delete, sender=model, weak=False, dispatch_uid=f'{uid}.post_delete')
@@ -0,0 +1,42 @@
+"""
+Periodic maintenance jobs for the palace app (see palace.scheduler).
+"""
+
+from ejeh_palace import live
+
+from . import caching, publishing, taskqueue
+from .management.commands.recount import recount_all
+from .scheduler import periodic
+
+
+@periodic(every=60)
+def publish_scheduled():
+    """Publish announcements, royal messages and events whose time has come."""
+    publishing.publish_due()
+
+
+@periodic(every=60 * 60, queue=True)
+def recount_categories():
+    """Repair category counters; "upcoming" event counts drift as time passes."""
+    recount_all()
+
+
+@periodic(every=5 * 60)
+def warm_pages():
+    """Keep the busiest public pages rendered in the shared cache."""
+    # A per-process cache would only be warmed for this process
+    if not caching.shared():
+        return
+    publishing.warm_pages(['palace:home', 'events:list', 'announcements:list'])
+
+
+@periodic(every=24 * 60 * 60)
+def purge_tasks():
+    """Delete finished background tasks past their retention period."""
+    taskqueue.purge()
+
+
+@periodic(every=60 * 60)
+def purge_live_messages():
+    """Delete live messages every browser has had time to receive."""
+    live.purge()
@@ -0,0 +1,169 @@
+"""
+Management command to benchmark the hot-filter indexes.
+
+Seeds the gallery, events, announcements, contact message and newsletter
+tables with synthetic rows, then runs the public view workload with the
+models' ``Meta.indexes`` in place and again with them dropped, printing
+the query plans and timings. Everything happens inside one transaction
+that is rolled back, so the database is left untouched. Run it against a
+scratch or staging database: dropping indexes locks the tables on
+PostgreSQL until the rollback.
+"""
+
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .suggest_indexes import build_queryset, get_workload, time_queryset
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hot queries with and without the declared indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Synthetic rows per table (default: 100000)'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Executions per query when measuring timings (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        workload = self.get_benchmark_workload()
+        models = {entry['model'] for entry in workload}
+
+        with transaction.atomic():
+            self.stdout.write(self.style.NOTICE(
+                f"Seeding {options['rows']} rows per table..."
+            ))
+            self.seed(options['rows'])
+            self.analyze()
+
+            with_indexes = self.measure(workload, options['runs'])
+
+            editor = connection.schema_editor()
+            with connection.cursor() as cursor:
+                for model in models:
+                    for index in model._meta.indexes:
+                        cursor.execute(str(index.remove_sql(model, editor)))
+            self.analyze()
+
+            without_indexes = self.measure(workload, options['runs'])
+            transaction.set_rollback(True)
+
+        self.report(workload, without_indexes, with_indexes)
+
+    def get_benchmark_workload(self):
+        """The suggest_indexes workload plus the past events list."""
+        from events.models import Event
+
+        workload = get_workload()
+        workload.append({
+            'label': 'event list (past by status)',
+            'model': Event,
+            'queryset': lambda: Event.objects.published().past(),
+        })
+        return workload
+
+    def seed(self, rows):
+        from announcements.models import Announcement
+        from community.models import ContactMessage, Newsletter
+        from events.models import Event
+        from palace.models import GalleryCategory, GalleryImage
+
+        rng = random.Random(42)
+        now = timezone.now()
+        batch = 5000
+        categories = [
+            GalleryCategory.objects.get_or_create(slug=slug, defaults={'name': slug.title()})[0]
+            for slug in ['ceremonies'] + [f'bench-{i}' for i in range(10)]
+        ]
+        occasions = [choice for choice, label in GalleryImage.OccasionType.choices]
+
+        GalleryImage.objects.bulk_create((
+            GalleryImage(
+                image='bench',
+                title=f'Bench image {i}',
+                category=rng.choice(categories),
+                occasion_type=rng.choice(occasions),
+                date_taken=date(2000, 1, 1) + timedelta(days=rng.randrange(9000)),
+                is_published=rng.random() < 0.9,
+                is_featured=rng.random() < 0.02,
+            ) for i in range(rows)
+        ), batch_size=batch)
+
+        def bench_event(i):
+            event = Event(
+                title=f'Bench event {i}',
+                slug=f'bench-event-{i}',
+                description='Benchmark event',
+                start_date=now + timedelta(hours=rng.randrange(-24 * 3650, 24 * 365)),
+                venue='Palace',
+                is_published=rng.random() < 0.9,
+                is_cancelled=rng.random() < 0.03,
+            )
+            # bulk_create skips save(), which normally sets this
+            event.effective_end = event.compute_effective_end()
+            return event
+
+        Event.objects.bulk_create((bench_event(i) for i in range(rows)), batch_size=batch)
+
+        Announcement.objects.bulk_create((
+            Announcement(
+                title=f'Bench announcement {i}',
+                slug=f'bench-announcement-{i}',
+                content='Benchmark announcement',
+                publish_date=now - timedelta(minutes=rng.randrange(60 * 24 * 3650)),
+                is_published=rng.random() < 0.9,
+                is_pinned=rng.random() < 0.001,
+            ) for i in range(rows)
+        ), batch_size=batch)
+
+        ContactMessage.objects.bulk_create((
+            ContactMessage(
+                full_name='Bench Sender',
+                email=f'sender{i}@example.com',
+                subject='Benchmark',
+                message='Benchmark message',
+                is_read=rng.random() < 0.95,
+                is_archived=rng.random() < 0.8,
+            ) for i in range(rows)
+        ), batch_size=batch)
+
+        Newsletter.objects.bulk_create((
+            Newsletter(email=f'bench{i}@example.com', is_active=rng.random() < 0.85)
+            for i in range(rows)
+        ), batch_size=batch)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def measure(self, workload, runs):
+        results = []
+        for entry in workload:
+            queryset = build_queryset(entry)
+            results.append((
+                ' | '.join(line.strip() for line in queryset.explain().splitlines()),
+                time_queryset(queryset, runs),
+            ))
+        return results
+
+    def report(self, workload, before, after):
+        self.stdout.write('')
+        for entry, (plan_before, ms_before), (plan_after, ms_after) in zip(workload, before, after):
+            speedup = ms_before / ms_after if ms_after else 0
+            self.stdout.write(self.style.MIGRATE_HEADING(entry['label']))
+            self.stdout.write(f'  without: {ms_before:8.2f} ms  {plan_before}')
+            self.stdout.write(f'  with:    {ms_after:8.2f} ms  {plan_after}')
+            self.stdout.write(f'  speedup: {speedup:.1f}x')
+        self.stdout.write(self.style.SUCCESS('\nBenchmark data rolled back.'))
@@ -0,0 +1,156 @@
+"""
+Management command to benchmark SQLite under concurrent web-like load.
+
+Worker processes hammer a scratch SQLite file with the platform's write
+pattern: mostly page reads, view counter increments (read-then-write in
+one transaction, as ``get_object()`` + ``save()`` does) and contact form
+inserts. The run is repeated with SQLite's defaults and with the tuned
+profile from ``ejeh_palace.sqlite_backend`` and throughput, latency and
+"database is locked" failures are compared. The project database is
+never touched.
+"""
+
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ejeh_palace.sqlite_backend.base import DEFAULT_PRAGMAS, apply_profile
+
+
+SCHEMA = '''
+CREATE TABLE article (id INTEGER PRIMARY KEY, title TEXT, view_count INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE message (
+    id INTEGER PRIMARY KEY, subject TEXT, body TEXT,
+    is_read INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL
+);
+CREATE INDEX message_unread ON message (created_at) WHERE NOT is_read;
+'''
+
+
+def connect(path, profile):
+    # isolation_level=None: explicit BEGIN, like Django's autocommit mode
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    if profile['pragmas'] is not None:
+        apply_profile(conn, profile['pragmas'])
+    return conn
+
+
+def worker(path, profile, duration, seed, results):
+    rng = random.Random(seed)
+    conn = connect(path, profile)
+    begin = f"BEGIN {profile['begin']}".strip()
+    latencies, ops, locked = [], 0, 0
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        start = time.perf_counter()
+        try:
+            if roll < 0.7:
+                conn.execute('SELECT id, title, view_count FROM article ORDER BY id DESC LIMIT 12').fetchall()
+                conn.execute('SELECT COUNT(*) FROM message WHERE NOT is_read').fetchone()
+            elif roll < 0.9:
+                # Read then write in one transaction (view counter)
+                conn.execute(begin)
+                pk = rng.randint(1, 500)
+                count = conn.execute('SELECT view_count FROM article WHERE id = ?', (pk,)).fetchone()[0]
+                conn.execute('UPDATE article SET view_count = ? WHERE id = ?', (count + 1, pk))
+                conn.execute('COMMIT')
+            else:
+                conn.execute(begin)
+                conn.execute(
+                    'INSERT INTO message (subject, body, created_at) VALUES (?, ?, ?)',
+                    ('Benchmark', 'x' * 500, time.time())
+                )
+                conn.execute('COMMIT')
+            ops += 1
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError as exc:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            if 'locked' not in str(exc):
+                raise
+            locked += 1
+
+    conn.close()
+    results.put((ops, locked, latencies))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SQLite concurrency with default and tuned settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent worker processes (default: 8)'
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10,
+            help='Duration of each run in seconds (default: 10)'
+        )
+
+    def handle(self, *args, **options):
+        profiles = [
+            {'name': 'default', 'pragmas': None, 'begin': ''},
+            {
+                'name': 'tuned',
+                'pragmas': getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS),
+                'begin': 'IMMEDIATE',
+            },
+        ]
+        for profile in profiles:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'bench.sqlite3')
+                self.prepare(path)
+                self.report(profile['name'], self.run(path, profile, options))
+
+    def prepare(self, path):
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            'INSERT INTO article (title) VALUES (?)',
+            [(f'Article {i}',) for i in range(500)]
+        )
+        conn.close()
+
+    def run(self, path, profile, options):
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=worker,
+                args=(path, profile, options['seconds'], seed, results)
+            )
+            for seed in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        ops = sum(item[0] for item in collected)
+        locked = sum(item[1] for item in collected)
+        latencies = sorted(lat for item in collected for lat in item[2])
+        return {
+            'ops_per_sec': ops / options['seconds'],
+            'locked': locked,
+            'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else 0,
+            'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+        }
+
+    def report(self, name, stats):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(
+            f"  {stats['ops_per_sec']:10.0f} ops/s   p50 {stats['p50_ms']:.2f} ms   "
+            f"p99 {stats['p99_ms']:.2f} ms   locked errors {stats['locked']}"
+        )
@@ -0,0 +1,39 @@
+"""
+Management command to publish content whose scheduled time has come.
+
+Run it every minute (e.g. from cron or the platform scheduler). Each run
+publishes due announcements, royal messages and events, bumps the cache
+generations that embed them and pre-warms the pages that list them.
+"""
+
+from django.core.management.base import BaseCommand
+
+from palace.publishing import publish_due, scheduled
+
+
+class Command(BaseCommand):
+    help = 'Publish announcements, royal messages and events scheduled for now or earlier'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-warm', action='store_true',
+            help='Skip re-rendering the affected pages after publishing',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only list what would be published',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for model, rows in scheduled():
+                for row in rows:
+                    self.stdout.write(f'{model._meta.verbose_name}: {row} ({row.publish_at:%Y-%m-%d %H:%M})')
+            self.stdout.write(self.style.NOTICE('Dry run; nothing published.'))
+            return
+
+        published = publish_due(warm=not options['no_warm'])
+        for model, rows in published.items():
+            self.stdout.write(f'Published {len(rows)} {model._meta.verbose_name_plural.lower()}')
+        total = sum(len(rows) for rows in published.values())
+        self.stdout.write(self.style.SUCCESS(f'Published {total} scheduled items.'))
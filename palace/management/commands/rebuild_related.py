@@ -0,0 +1,21 @@
+"""
+Management command to recompute the stored related-content lists.
+
+Signals queue a refresh of the affected lists (run by the background
+worker) whenever an announcement, gallery image or history article is
+saved or deleted. Run this after bulk imports or updates, which bypass
+signals, or to re-weight every list once the vocabulary has drifted.
+"""
+
+from django.core.management.base import BaseCommand
+
+from palace.related import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute related announcements, gallery images and history articles'
+
+    def handle(self, *args, **options):
+        for model, rows in rebuild().items():
+            self.stdout.write(f'Stored {rows} related {model._meta.verbose_name_plural.lower()}')
+        self.stdout.write(self.style.SUCCESS('Related items rebuilt.'))
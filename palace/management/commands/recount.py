@@ -0,0 +1,83 @@
+"""
+Management command to rebuild the denormalized category counters.
+
+Signals keep the counters current on ordinary saves and deletes, but
+bulk updates bypass them and events leave the "upcoming" count as time
+passes. Run this periodically (and after bulk imports) to repair them.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from collections import Counter
+
+from django.db.models import Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def count_subquery(queryset):
+    """Correlated COUNT(*) of ``queryset`` rows for the outer category."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(category=OuterRef('pk'))
+            .order_by()
+            .values('category')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        Value(0),
+    )
+
+
+def upcoming_by_category(now=None):
+    """
+    Counts of events with occurrences still to come, per category id.
+
+    Matches the events list: recurring series count while they run, even
+    when their first start is past. The database narrows the candidates
+    and the occurrence engine makes the final call.
+    """
+    from events import occurrences
+    from events.models import Event, EventQuerySet
+
+    now = now or timezone.now()
+    candidates = Event.objects.published().filter(
+        Q(effective_end__gte=now) | EventQuerySet.running_series(now), category__isnull=False
+    )
+    return Counter(
+        event.category_id for event in candidates if occurrences.has_upcoming(event, now)
+    )
+
+
+def recount_all():
+    """Recompute every category counter; returns rows updated per model."""
+    from announcements.models import Announcement, AnnouncementCategory
+    from events.models import EventCategory
+    from palace.models import GalleryCategory, GalleryImage
+
+    upcoming = upcoming_by_category()
+
+    with transaction.atomic():
+        return {
+            'gallery categories': GalleryCategory.objects.update(
+                image_count=count_subquery(GalleryImage.objects.filter(is_published=True))
+            ),
+            'event categories': EventCategory.objects.update(
+                upcoming_count=Case(
+                    *[When(pk=pk, then=Value(total)) for pk, total in upcoming.items()],
+                    default=Value(0),
+                )
+            ),
+            'announcement categories': AnnouncementCategory.objects.update(
+                published_count=count_subquery(Announcement.objects.filter(is_published=True))
+            ),
+        }
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-category content counters'
+
+    def handle(self, *args, **options):
+        for label, rows in recount_all().items():
+            self.stdout.write(f'Recounted {rows} {label}')
+        self.stdout.write(self.style.SUCCESS('Category counters rebuilt.'))
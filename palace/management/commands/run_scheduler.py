@@ -0,0 +1,65 @@
+"""
+Management command that runs the periodic maintenance jobs.
+
+Start it as a long-running process (or use ``run_worker --scheduler`` to
+run it inside the worker). Any number of nodes may run it; the
+scheduler lease makes sure only one of them runs each tick. ``--once``
+runs a single tick, for platforms that do have cron.
+"""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from palace import scheduler
+from palace.models import PeriodicJob
+
+
+class Command(BaseCommand):
+    help = 'Run periodic maintenance jobs declared in the apps\' jobs.py modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run the jobs that are due now and exit',
+        )
+        parser.add_argument(
+            '--list', action='store_true',
+            help='List the registered jobs and when they run next',
+        )
+
+    def handle(self, *args, **options):
+        jobs = scheduler.discover()
+        if options['list']:
+            states = PeriodicJob.objects.in_bulk(list(jobs), field_name='name')
+            for name, job in sorted(jobs.items()):
+                state = states.get(name)
+                next_run = f'{timezone.localtime(state.next_run_at):%Y-%m-%d %H:%M}' if state else 'now'
+                self.stdout.write(f'{name}: every {job.every}, next {next_run}')
+            return
+
+        if options['once']:
+            holder = scheduler.holder_id()
+            try:
+                ran = scheduler.tick(holder)
+            finally:
+                scheduler.release(holder)
+            for name in ran:
+                self.stdout.write(f'Ran {name}')
+            self.stdout.write(self.style.SUCCESS(f'Ran {len(ran)} jobs.'))
+            return
+
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write(self.style.NOTICE('Stopping scheduler...'))
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        self.stdout.write(f'Scheduler started ({len(jobs)} jobs).')
+        scheduler.run_scheduler(stop)
+        self.stdout.write(self.style.SUCCESS('Scheduler stopped.'))
@@ -0,0 +1,104 @@
+"""
+Management command that runs queued background tasks.
+
+Start one (or more) alongside the web process, e.g.
+``python manage.py run_worker --concurrency 4``. SIGINT/SIGTERM stop
+claiming new tasks and let running ones finish. Per-task timings are
+printed on exit; ``--stats`` prints the stored history instead.
+``--scheduler`` also runs the periodic maintenance jobs in this process.
+"""
+
+import signal
+import threading
+from multiprocessing import get_all_start_methods
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from palace import scheduler, taskqueue
+
+
+class Command(BaseCommand):
+    help = 'Run background tasks from the database queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'TASK_WORKER_CONCURRENCY', 4),
+            help='Number of tasks to run at once',
+        )
+        parser.add_argument(
+            '--pool', choices=['thread', 'process'], default='thread',
+            help='Run tasks in threads (I/O-bound work) or processes (CPU-bound work)',
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue is empty instead of waiting for more tasks',
+        )
+        parser.add_argument(
+            '--poll', type=float,
+            default=getattr(settings, 'TASK_POLL_SECONDS', 1.0),
+            help='Seconds to wait between checks of an empty queue',
+        )
+        parser.add_argument(
+            '--scheduler', action='store_true',
+            help='Also run the periodic maintenance jobs (see run_scheduler)',
+        )
+        parser.add_argument(
+            '--stats', action='store_true',
+            help='Print per-task counts and timings of stored tasks and exit',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.print_stats()
+            return
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1.')
+        if options['pool'] == 'process' and 'fork' not in get_all_start_methods():
+            raise CommandError('The process pool needs a Unix system.')
+        if options['pool'] == 'process' and options['scheduler']:
+            # Forked children would inherit the scheduler thread's connection
+            raise CommandError('Run the scheduler separately when using the process pool.')
+
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write(self.style.NOTICE('Stopping after running tasks finish...'))
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        self.stdout.write(
+            f"Worker started ({options['concurrency']} {options['pool']}s)."
+        )
+        if options['scheduler']:
+            thread = scheduler.start_in_thread(stop)
+        metrics = taskqueue.run_worker(
+            concurrency=options['concurrency'],
+            pool=options['pool'],
+            burst=options['burst'],
+            poll=options['poll'],
+            stop=stop,
+        )
+        if options['scheduler']:
+            stop.set()
+            thread.join()
+        for line in metrics.lines():
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS('Worker stopped.'))
+
+    def print_stats(self):
+        rows = list(taskqueue.stats())
+        if not rows:
+            self.stdout.write(self.style.NOTICE('No tasks stored.'))
+            return
+        for row in rows:
+            timing = ''
+            if row['avg_duration'] is not None:
+                timing = f", avg {row['avg_duration'] * 1000:.0f} ms, max {row['max_duration'] * 1000:.0f} ms"
+            self.stdout.write(
+                f"{row['name']}: {row['done']} done, {row['failed']} failed, "
+                f"{row['waiting']} waiting{timing}"
+            )
@@ -0,0 +1,405 @@
+"""
+Management command that proposes indexes for the public view workload.
+
+Each hot query from the public (and message admin) views is replayed with
+EXPLAIN on the active database. When the plan shows a full scan or a
+separate sort step, a composite index is proposed (partial where the
+backend supports it), tried inside a rolled-back transaction, and the
+before/after timings are reported. ``--emit-migrations`` writes the
+accepted proposals as AddIndex migrations.
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, migrations, models, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django.db.models import Q
+
+
+def get_workload():
+    """
+    Return the replayed workload.
+
+    Each entry mirrors a queryset built by a public view. Boolean values
+    in ``filters`` are constant flags that become the partial index
+    condition; ``index_fields`` are the remaining equality columns
+    followed by the ordering. Entries whose view query cannot be written
+    as plain filters give a ``queryset`` factory that is replayed instead.
+    """
+    from announcements.models import Announcement
+    from community.models import ContactMessage, Newsletter
+    from events import occurrences
+    from events.models import Event
+    from palace.models import GalleryImage
+
+    gallery_order = ['-date_taken', '-created_at']
+    announcement_order = ['-is_pinned', '-publish_date', '-created_at']
+
+    return [
+        {
+            'label': 'gallery',
+            'model': GalleryImage,
+            'filters': {'is_published': True},
+            'ordering': gallery_order,
+            'index_fields': gallery_order,
+        },
+        {
+            'label': 'gallery by category',
+            'model': GalleryImage,
+            'filters': {'is_published': True, 'category__slug': 'ceremonies'},
+            'ordering': gallery_order,
+            'index_fields': ['category'] + gallery_order,
+        },
+        {
+            'label': 'gallery by occasion',
+            'model': GalleryImage,
+            'filters': {'is_published': True, 'occasion_type': 'festival'},
+            'ordering': gallery_order,
+            'index_fields': ['occasion_type'] + gallery_order,
+        },
+        {
+            'label': 'featured gallery',
+            'model': GalleryImage,
+            'filters': {'is_published': True, 'is_featured': True},
+            'ordering': gallery_order,
+            'index_fields': gallery_order,
+        },
+        {
+            # What events.occurrences.upcoming() runs on a cold month cache:
+            # every series that may occur between today and the horizon
+            'label': 'upcoming events (occurrence windows)',
+            'model': Event,
+            'filters': {'is_published': True, 'is_cancelled': False, 'effective_end__gte': None},
+            'queryset': lambda: occurrences.upcoming_queries()[0],
+            'ordering': [],
+            'index_fields': ['effective_end', 'start_date'],
+        },
+        {
+            # ...then the one-time events starting beyond the horizon
+            'label': 'upcoming events (beyond horizon)',
+            'model': Event,
+            'filters': {'is_published': True, 'is_cancelled': False, 'start_date__gte': None},
+            'queryset': lambda: occurrences.upcoming_queries()[1],
+            'ordering': ['start_date'],
+            'index_fields': ['start_date'],
+        },
+        {
+            'label': 'announcements',
+            'model': Announcement,
+            'filters': {'is_published': True},
+            'ordering': announcement_order,
+            'index_fields': announcement_order,
+        },
+        {
+            'label': 'pinned announcements',
+            'model': Announcement,
+            'filters': {'is_published': True, 'is_pinned': True},
+            'ordering': announcement_order,
+            'index_fields': ['-publish_date', '-created_at'],
+        },
+        {
+            'label': 'inbox messages',
+            'model': ContactMessage,
+            'filters': {'is_archived': False},
+            'ordering': ['-created_at'],
+            'index_fields': ['-created_at'],
+        },
+        {
+            'label': 'unread messages',
+            'model': ContactMessage,
+            'filters': {'is_read': False},
+            'ordering': [],
+            'index_fields': ['-created_at'],
+        },
+        {
+            'label': 'newsletter subscribers',
+            'model': Newsletter,
+            'filters': {'is_active': True},
+            'ordering': ['-subscribed_at'],
+            'index_fields': ['-subscribed_at'],
+        },
+    ]
+
+
+def build_queryset(entry):
+    """Build the replayed queryset, filling in time-relative values."""
+    from django.utils import timezone
+
+    if 'queryset' in entry:
+        return entry['queryset']()
+
+    filters = {
+        key: (timezone.now() if value is None else value)
+        for key, value in entry['filters'].items()
+    }
+    queryset = entry['model'].objects.filter(**filters)
+    if entry['ordering']:
+        queryset = queryset.order_by(*entry['ordering'])
+    return queryset
+
+
+def plan_needs_index(plan):
+    """Return True when an EXPLAIN plan shows a full scan or an explicit sort."""
+    markers = ('SCAN ', 'TEMP B-TREE', 'Seq Scan', 'Sort  (', 'Sort (')
+    return any(marker in plan for marker in markers)
+
+
+def index_definition(name):
+    """Return the CREATE INDEX statement of an index, or '' if unknown."""
+    if connection.vendor == 'sqlite':
+        sql = "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s"
+    else:
+        sql = 'SELECT indexdef FROM pg_indexes WHERE indexname = %s'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [name])
+        row = cursor.fetchone()
+    return (row and row[0]) or ''
+
+
+def existing_indexes(model):
+    """
+    Return ``(columns, condition)`` for the indexes on the model's table.
+
+    Introspection does not report partial conditions, so those come from
+    the model's ``Meta.indexes``. An index missing from ``Meta`` whose
+    definition has a WHERE clause gets the condition ``False``, which
+    matches no query.
+    """
+    declared = {index.name: index.condition for index in model._meta.indexes}
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    existing = []
+    for name, info in constraints.items():
+        if not (info['index'] or info['unique'] or info['primary_key']):
+            continue
+        if name in declared:
+            condition = declared[name]
+        elif info['index'] and ' WHERE ' in index_definition(name).upper():
+            condition = False
+        else:
+            condition = None
+        existing.append((tuple(info['columns']), condition))
+    return existing
+
+
+def condition_covers(condition, flags):
+    """
+    Whether an index with partial ``condition`` can serve a query on ``flags``.
+
+    A full index always can; a partial one only when the query's flag
+    filters imply its condition. Conditions other than a plain AND of
+    field lookups are not analysed and never match.
+    """
+    if condition is None:
+        return True
+    if not isinstance(condition, Q) or condition.negated or condition.connector != Q.AND:
+        return False
+    if not all(isinstance(child, tuple) for child in condition.children):
+        return False
+    return set(condition.children) <= set(flags.items())
+
+
+def flag_filters(entry):
+    """The constant boolean filters of a workload entry."""
+    return {
+        name: value for name, value in entry['filters'].items()
+        if isinstance(value, bool)
+    }
+
+
+def make_index(entry, partial):
+    """
+    Return a named ``models.Index`` for a workload entry.
+
+    With partial index support the flag filters become the condition.
+    Otherwise they lead the column list, which is the best a plain
+    composite index can do (SQLite compares booleans as bare columns, so
+    leading flag columns are rarely usable there).
+    """
+    model = entry['model']
+    flags = flag_filters(entry)
+    fields = list(entry['index_fields'])
+    if not partial:
+        fields = [name for name in flags if name not in fields] + fields
+    # Name from flags + columns so partial variants on the same columns differ
+    index = models.Index(fields=[name for name in flags if name not in fields] + fields)
+    index.set_name_with_model(model)
+    if partial and flags:
+        return models.Index(fields=fields, condition=Q(**flags), name=index.name)
+    return models.Index(fields=fields, name=index.name)
+
+
+def index_columns(index, model):
+    return tuple(
+        model._meta.get_field(name.lstrip('-')).column for name in index.fields
+    )
+
+
+def time_queryset(queryset, runs):
+    """Return the mean execution time of a queryset in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        list(queryset[:24])
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+class Command(BaseCommand):
+    help = 'Replay the public view queries, EXPLAIN them and suggest indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Executions per query when measuring timings (default: 20)'
+        )
+        parser.add_argument(
+            '--no-trial',
+            action='store_true',
+            help='Only EXPLAIN; do not try the proposed indexes'
+        )
+        parser.add_argument(
+            '--emit-migrations',
+            action='store_true',
+            help='Write AddIndex migrations for the proposed indexes'
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            self.stdout.write(self.style.WARNING(
+                f'EXPLAIN analysis is only supported on SQLite and PostgreSQL, not {vendor}.'
+            ))
+            return
+
+        partial = connection.features.supports_partial_indexes
+        self.stdout.write(self.style.NOTICE(
+            f'Analysing public view workload on {vendor}...'
+        ))
+
+        proposals = {}
+        for entry in get_workload():
+            model = entry['model']
+            queryset = build_queryset(entry)
+            plan = queryset.explain()
+            index = make_index(entry, partial)
+            columns = index_columns(index, model)
+
+            flags = flag_filters(entry) if partial else {}
+            covered = any(
+                existing[:len(columns)] == columns and condition_covers(condition, flags)
+                for existing, condition in existing_indexes(model)
+            )
+            self.stdout.write(f"\n{entry['label']} ({model._meta.label})")
+            self.stdout.write(f'  plan:   {self.summarise(plan)}')
+
+            if covered:
+                self.stdout.write(self.style.SUCCESS('  already covered by an index'))
+                continue
+            if not plan_needs_index(plan):
+                self.stdout.write(self.style.SUCCESS('  plan already uses an index'))
+                continue
+
+            self.stdout.write(f'  propose: {self.describe(index)}')
+            if not options['no_trial'] and not self.trial(queryset, plan, model, index, options['runs']):
+                continue
+            proposals.setdefault(model, {})[index.name] = index
+
+        if not proposals:
+            self.stdout.write(self.style.SUCCESS('\nNo new indexes suggested.'))
+            return
+
+        if options['emit_migrations']:
+            self.emit_migrations(proposals)
+        else:
+            total = sum(len(indexes) for indexes in proposals.values())
+            self.stdout.write(self.style.SUCCESS(
+                f'\n{total} index(es) suggested. Re-run with --emit-migrations to write them.'
+            ))
+
+    def summarise(self, plan):
+        return ' | '.join(line.strip() for line in plan.splitlines() if line.strip())
+
+    def describe(self, index):
+        text = f"{index.name} on ({', '.join(index.fields)})"
+        if index.condition is not None:
+            text += f' WHERE {index.condition}'
+        return text
+
+    def declaration(self, index):
+        args = [f'fields={index.fields!r}']
+        if index.condition is not None:
+            lookups = ', '.join(f'{k}={v!r}' for k, v in index.condition.children)
+            args.append(f'condition=Q({lookups})')
+        args.append(f'name={index.name!r}')
+        return f"models.Index({', '.join(args)})"
+
+    def trial(self, queryset, plan_before, model, index, runs):
+        """
+        Create the index inside a transaction, measure, then roll back.
+
+        Returns False when the planner ignores the index; the timing
+        difference is then noise and no gain is reported.
+        """
+        before = time_queryset(queryset, runs)
+        with transaction.atomic():
+            editor = connection.schema_editor()
+            with connection.cursor() as cursor:
+                cursor.execute(str(index.create_sql(model, editor)))
+                if connection.vendor == 'sqlite':
+                    cursor.execute('ANALYZE')
+            plan = queryset.explain()
+            after = time_queryset(queryset, runs)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'  with index: {self.summarise(plan)}')
+        if self.summarise(plan) == self.summarise(plan_before):
+            self.stdout.write(self.style.WARNING(
+                f'  timing: {before:.2f} ms -> {after:.2f} ms (plan unchanged; index not used, not suggested)'
+            ))
+            return False
+        gain = (before - after) / before * 100 if before else 0
+        self.stdout.write(
+            f'  timing: {before:.2f} ms -> {after:.2f} ms ({gain:+.0f}% estimated gain)'
+        )
+        return True
+
+    def emit_migrations(self, proposals):
+        """Write one AddIndex migration per affected app."""
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        leaves = loader.graph.leaf_nodes()
+
+        by_app = {}
+        for model, indexes in proposals.items():
+            by_app.setdefault(model._meta.app_label, []).extend(
+                migrations.AddIndex(model_name=model._meta.model_name, index=index)
+                for index in indexes.values()
+            )
+
+        for app_label, operations in by_app.items():
+            parent = max(name for app, name in leaves if app == app_label)
+            number = int(parent.split('_')[0]) + 1
+            migration = type('Migration', (migrations.Migration,), {
+                'dependencies': [(app_label, parent)],
+                'operations': operations,
+            })(f'{number:04d}_suggested_indexes', app_label)
+
+            writer = MigrationWriter(migration)
+            os.makedirs(os.path.dirname(writer.path), exist_ok=True)
+            with open(writer.path, 'w', encoding='utf-8') as fh:
+                fh.write(writer.as_string())
+            self.stdout.write(self.style.SUCCESS(f'Wrote {writer.path}'))
+
+        self.stdout.write(self.style.WARNING(
+            'Add the indexes to each model\'s Meta.indexes so makemigrations '
+            'does not try to remove them:'
+        ))
+        for model, indexes in proposals.items():
+            self.stdout.write(f'  {model._meta.label}:')
+            for index in indexes.values():
+                self.stdout.write(f'    {self.declaration(index)},')
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0002_seed_present_ejeh'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-date_taken', '-created_at'], name='gallery_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['-date_taken', '-created_at'], name='gallery_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-date_taken', '-created_at'], name='gallery_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['occasion_type', '-date_taken', '-created_at'], name='gallery_occasion_idx'),
+        ),
+    ]
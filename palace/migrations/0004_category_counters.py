@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:48
+
+from django.db import migrations, models
+
+
+def count_images(apps, schema_editor):
+    GalleryCategory = apps.get_model('palace', 'GalleryCategory')
+    for category in GalleryCategory.objects.all():
+        category.image_count = category.images.filter(is_published=True).count()
+        category.save(update_fields=['image_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0003_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gallerycategory',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Published Images'),
+        ),
+        migrations.RunPython(count_images, migrations.RunPython.noop),
+    ]
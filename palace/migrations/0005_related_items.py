@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('palace', '0004_category_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_id', models.PositiveBigIntegerField(verbose_name='Source ID')),
+                ('target_id', models.PositiveBigIntegerField(verbose_name='Related Object ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Rank')),
+                ('score', models.FloatField(verbose_name='Similarity')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Related Item',
+                'verbose_name_plural': 'Related Items',
+                'ordering': ['content_type', 'source_id', 'rank'],
+                'indexes': [models.Index(fields=['content_type', 'target_id'], name='related_item_target_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relateditem',
+            constraint=models.UniqueConstraint(fields=('content_type', 'source_id', 'rank'), name='related_item_rank_unique'),
+        ),
+    ]
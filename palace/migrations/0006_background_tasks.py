@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0005_related_items'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Task')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='Arguments')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Keyword Arguments')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10, verbose_name='Status')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Lower runs first', verbose_name='Priority')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Max Attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Run After')),
+                ('claimed_by', models.CharField(blank=True, max_length=100, verbose_name='Claimed By')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Lease Expires')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last Error')),
+                ('queued_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Queued')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished')),
+                ('duration', models.FloatField(blank=True, null=True, verbose_name='Duration (s)')),
+            ],
+            options={
+                'verbose_name': 'Background Task',
+                'verbose_name_plural': 'Background Tasks',
+                'ordering': ['-queued_at'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['priority', 'run_after'], name='task_queued_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['locked_until'], name='task_running_idx'), models.Index(fields=['name', 'status'], name='task_name_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0006_background_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodicJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True, verbose_name='Job')),
+                ('next_run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next Run')),
+                ('last_run_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Run')),
+                ('last_duration', models.FloatField(blank=True, null=True, verbose_name='Last Duration (s)')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last Error')),
+                ('run_count', models.PositiveIntegerField(default=0, verbose_name='Runs')),
+                ('failure_count', models.PositiveIntegerField(default=0, verbose_name='Failures')),
+            ],
+            options={
+                'verbose_name': 'Periodic Job',
+                'verbose_name_plural': 'Periodic Jobs',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SchedulerLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Lock')),
+                ('holder', models.CharField(blank=True, max_length=100, verbose_name='Holder')),
+                ('expires_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Expires')),
+            ],
+            options={
+                'verbose_name': 'Scheduler Lease',
+                'verbose_name_plural': 'Scheduler Leases',
+            },
+        ),
+    ]
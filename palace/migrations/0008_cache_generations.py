@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0007_periodic_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Generation')),
+                ('token', models.CharField(max_length=32, verbose_name='Token')),
+                ('bumped_at', models.DateTimeField(auto_now=True, verbose_name='Bumped')),
+            ],
+            options={
+                'verbose_name': 'Cache Generation',
+                'verbose_name_plural': 'Cache Generations',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:50
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('palace', '0008_cache_generations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=50, verbose_name='Event')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Data')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Created')),
+            ],
+            options={
+                'verbose_name': 'Live Message',
+                'verbose_name_plural': 'Live Messages',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('palace', '0009_live_messages'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=50, verbose_name='Word')),
+                ('documents', models.IntegerField(default=0, verbose_name='Documents')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Related Word',
+                'verbose_name_plural': 'Related Words',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Object ID')),
+                ('word', models.CharField(max_length=50, verbose_name='Word')),
+                ('value', models.FloatField(verbose_name='Weight')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Related Term',
+                'verbose_name_plural': 'Related Terms',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedword',
+            constraint=models.UniqueConstraint(fields=('content_type', 'word'), name='related_word_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='relatedterm',
+            index=models.Index(fields=['content_type', 'word'], name='related_term_word_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='relatedterm',
+            constraint=models.UniqueConstraint(fields=('content_type', 'object_id', 'word'), name='related_term_unique'),
+        ),
+    ]
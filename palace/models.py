@@ -2,8 +2,12 @@
 Models for Ejeh Ankpa Palace - Profiles, Gallery, History, and Culture.
 """
 
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from cloudinary.models import CloudinaryField
 
 
@@ -144,6 +148,13 @@ class GalleryCategory(models.Model):
     display_order = models.PositiveIntegerField('Display Order', default=0)
     is_active = models.BooleanField('Active', default=True)
     
+    # Maintained by palace.signals; repaired by `manage.py recount`
+    image_count = models.PositiveIntegerField(
+        'Published Images',
+        default=0,
+        editable=False
+    )
+    
     class Meta:
         verbose_name = 'Gallery Category'
         verbose_name_plural = 'Gallery Categories'
@@ -217,10 +228,38 @@ class GalleryImage(models.Model):
     created_at = models.DateTimeField('Uploaded', auto_now_add=True)
     updated_at = models.DateTimeField('Updated', auto_now=True)
     
+    # Maintained by palace.related
+    related_entries = GenericRelation('palace.RelatedItem', object_id_field='target_id')
+    
     class Meta:
         verbose_name = 'Gallery Image'
         verbose_name_plural = 'Gallery Images'
         ordering = ['-date_taken', '-created_at']
+        # Partial indexes cover the published-only gallery queries. SQLite
+        # compares booleans as bare columns, so a leading flag column in a
+        # plain composite index would not be used there.
+        indexes = [
+            models.Index(
+                fields=['-date_taken', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='gallery_published_idx'
+            ),
+            models.Index(
+                fields=['-date_taken', '-created_at'],
+                condition=models.Q(is_published=True, is_featured=True),
+                name='gallery_featured_idx'
+            ),
+            models.Index(
+                fields=['category', '-date_taken', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='gallery_category_idx'
+            ),
+            models.Index(
+                fields=['occasion_type', '-date_taken', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='gallery_occasion_idx'
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -270,6 +309,9 @@ class HistoryArticle(models.Model):
     created_at = models.DateTimeField('Created', auto_now_add=True)
     updated_at = models.DateTimeField('Updated', auto_now=True)
     
+    # Maintained by palace.related
+    related_entries = GenericRelation('palace.RelatedItem', object_id_field='target_id')
+    
     class Meta:
         verbose_name = 'History & Culture Article'
         verbose_name_plural = 'History & Culture Articles'
@@ -361,3 +403,251 @@ class PalaceInfo(models.Model):
         """Get or create the singleton instance."""
         obj, created = cls.objects.get_or_create(pk=1)
         return obj
+
+
+class RelatedItem(models.Model):
+    """
+    Precomputed "related content" for detail pages.
+    
+    Each row links an object to one of its most similar objects of the
+    same model, ranked by TF-IDF cosine similarity (see palace.related).
+    """
+    
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    source_id = models.PositiveBigIntegerField('Source ID')
+    target_id = models.PositiveBigIntegerField('Related Object ID')
+    rank = models.PositiveSmallIntegerField('Rank')
+    score = models.FloatField('Similarity')
+    
+    class Meta:
+        verbose_name = 'Related Item'
+        verbose_name_plural = 'Related Items'
+        ordering = ['content_type', 'source_id', 'rank']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'source_id', 'rank'],
+                name='related_item_rank_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'target_id'], name='related_item_target_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.content_type} {self.source_id} -> {self.target_id} (#{self.rank})'
+
+
+class RelatedTerm(models.Model):
+    """
+    One term of an object's unit-length TF-IDF vector.
+    
+    Together the rows are the inverted index that incremental refreshes
+    score a changed object against (see palace.related).
+    """
+    
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField('Object ID')
+    word = models.CharField('Word', max_length=50)
+    value = models.FloatField('Weight')
+    
+    class Meta:
+        verbose_name = 'Related Term'
+        verbose_name_plural = 'Related Terms'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id', 'word'],
+                name='related_term_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'word'], name='related_term_word_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.content_type} {self.object_id}: {self.word}'
+
+
+class RelatedWord(models.Model):
+    """
+    Document frequency of a word: how many live objects of a model use it.
+    
+    Kept up to date as objects change so only the changed object has to be
+    re-vectorized (see palace.related).
+    """
+    
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    word = models.CharField('Word', max_length=50)
+    documents = models.IntegerField('Documents', default=0)
+    
+    class Meta:
+        verbose_name = 'Related Word'
+        verbose_name_plural = 'Related Words'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'word'],
+                name='related_word_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return f'{self.content_type} {self.word} ({self.documents})'
+
+
+class Task(models.Model):
+    """
+    A unit of background work for the ``run_worker`` command.
+    
+    Rows are inserted by ``palace.taskqueue.enqueue`` (usually inside the
+    request's transaction, so the task only becomes visible if the
+    request commits) and claimed by workers; see palace.taskqueue.
+    """
+    
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+    
+    name = models.CharField('Task', max_length=200)
+    args = models.JSONField('Arguments', default=list, blank=True)
+    kwargs = models.JSONField('Keyword Arguments', default=dict, blank=True)
+    status = models.CharField(
+        'Status',
+        max_length=10,
+        choices=Status.choices,
+        default=Status.QUEUED
+    )
+    priority = models.SmallIntegerField('Priority', default=0, help_text='Lower runs first')
+    attempts = models.PositiveSmallIntegerField('Attempts', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Max Attempts', default=3)
+    run_after = models.DateTimeField('Run After', default=timezone.now)
+    
+    # Claim bookkeeping; a running task whose lease ran out is claimed again
+    claimed_by = models.CharField('Claimed By', max_length=100, blank=True)
+    locked_until = models.DateTimeField('Lease Expires', null=True, blank=True)
+    
+    last_error = models.TextField('Last Error', blank=True)
+    queued_at = models.DateTimeField('Queued', default=timezone.now)
+    started_at = models.DateTimeField('Started', null=True, blank=True)
+    finished_at = models.DateTimeField('Finished', null=True, blank=True)
+    duration = models.FloatField('Duration (s)', null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Background Task'
+        verbose_name_plural = 'Background Tasks'
+        ordering = ['-queued_at']
+        indexes = [
+            models.Index(
+                fields=['priority', 'run_after'],
+                condition=models.Q(status='queued'),
+                name='task_queued_idx'
+            ),
+            models.Index(
+                fields=['locked_until'],
+                condition=models.Q(status='running'),
+                name='task_running_idx'
+            ),
+            models.Index(fields=['name', 'status'], name='task_name_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+
+class PeriodicJob(models.Model):
+    """
+    Run state of a maintenance job declared in an app's ``jobs.py``.
+    
+    ``next_run_at`` is advanced before the job runs, so a restart or a
+    second node does not run the same tick twice (see palace.scheduler).
+    """
+    
+    name = models.CharField('Job', max_length=200, unique=True)
+    next_run_at = models.DateTimeField('Next Run', default=timezone.now)
+    last_run_at = models.DateTimeField('Last Run', null=True, blank=True)
+    last_duration = models.FloatField('Last Duration (s)', null=True, blank=True)
+    last_error = models.TextField('Last Error', blank=True)
+    run_count = models.PositiveIntegerField('Runs', default=0)
+    failure_count = models.PositiveIntegerField('Failures', default=0)
+    
+    class Meta:
+        verbose_name = 'Periodic Job'
+        verbose_name_plural = 'Periodic Jobs'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class SchedulerLease(models.Model):
+    """
+    Database lock electing the node that runs periodic jobs.
+    
+    The holder renews ``expires_at`` every tick; another node may take the
+    lease over once it has expired.
+    """
+    
+    name = models.CharField('Lock', max_length=50, unique=True)
+    holder = models.CharField('Holder', max_length=100, blank=True)
+    expires_at = models.DateTimeField('Expires', default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Scheduler Lease'
+        verbose_name_plural = 'Scheduler Leases'
+    
+    def __str__(self):
+        return f'{self.name}: {self.holder or "free"}'
+
+
+class CacheGeneration(models.Model):
+    """
+    Current token of a cache generation (see palace.caching).
+    
+    Kept in the database so a bump by the worker or the scheduler reaches
+    every web process, whatever the cache backend.
+    """
+    
+    name = models.CharField('Generation', max_length=100, unique=True)
+    token = models.CharField('Token', max_length=32)
+    bumped_at = models.DateTimeField('Bumped', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Cache Generation'
+        verbose_name_plural = 'Cache Generations'
+    
+    def __str__(self):
+        return f'{self.name}: {self.token}'
+
+
+class LiveMessage(models.Model):
+    """
+    Live message waiting to be streamed to browsers (see ejeh_palace.live).
+    
+    Every ASGI process reads new rows by id, so messages published by the
+    worker, the scheduler or another web process reach all connected
+    browsers. Old rows are purged by a periodic job.
+    """
+    
+    event = models.CharField('Event', max_length=50)
+    data = models.JSONField('Data', encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField('Created', default=timezone.now, db_index=True)
+    
+    class Meta:
+        verbose_name = 'Live Message'
+        verbose_name_plural = 'Live Messages'
+        ordering = ['pk']
+    
+    def __str__(self):
+        return f'{self.event} #{self.pk}'
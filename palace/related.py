@@ -0,0 +1,302 @@
+"""
+Content-based "related items".
+
+Registered models are indexed as TF-IDF vectors over their text fields
+(titles weighted up) and each live object's nearest neighbours by cosine
+similarity are stored in ``RelatedItem``. Detail pages read them back
+with ``similar()``, a single join on the ``(content_type, source_id,
+rank)`` index.
+
+Vectors are sparse and stored term by term in ``RelatedTerm``, which
+doubles as an inverted index, so only objects sharing at least one term
+are compared; ``RelatedWord`` keeps each word's document frequency.
+Saving or deleting an object queues the ``refresh_related`` background
+task, which re-vectorizes that object alone against the stored
+frequencies and recomputes the lists it enters or leaves. Other objects
+keep the weights they were indexed with, so the ``rebuild_related``
+command re-weights everything from scratch (e.g. after bulk imports).
+"""
+
+import heapq
+import math
+import re
+from collections import Counter, defaultdict, namedtuple
+from operator import itemgetter
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.utils.html import strip_tags
+
+from .models import RelatedItem, RelatedTerm, RelatedWord
+
+
+WORD = re.compile(r'[^\W\d_]{3,}')
+
+# Longer runs of letters are not words (and would not fit RelatedTerm.word)
+MAX_WORD = 50
+
+# Keeps ``IN`` lists under SQLite's parameter limit
+CHUNK = 500
+
+STOP_WORDS = frozenset('''
+    about above after again against all also and any are because been before
+    being below between both but can could did does doing down during each
+    few for from further had has have having her here hers him his how into
+    its itself just more most not now off once only other our ours out over
+    own same she should some such than that the their theirs them then there
+    these they this those through too under until very was were what when
+    where which while who whom why will with would you your yours
+'''.split())
+
+Entry = namedtuple('Entry', ['model', 'fields', 'live', 'limit'])
+
+_entries = {}
+
+
+def tokenize(text):
+    """Lower-cased words of three or more letters, without stop words."""
+    return [
+        word for word in WORD.findall(strip_tags(text or '').lower())
+        if word not in STOP_WORDS and len(word) <= MAX_WORD
+    ]
+
+
+def track_related(model, fields, live=None, limit=4):
+    """
+    Keep the ``limit`` most similar objects of ``model`` in ``RelatedItem``.
+
+    ``fields`` maps text field names to weights; ``live`` holds filter
+    keyword arguments selecting objects that may be shown (e.g. published).
+    """
+    entry = Entry(model, dict(fields), dict(live or {}), limit)
+    _entries[model] = entry
+    watched = set(entry.fields) | set(entry.live)
+    uid = f'{model._meta.label}.related'
+
+    def refresh_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+        # View counters and similar bookkeeping saves do not change the text
+        if raw or (update_fields is not None and not watched & set(update_fields)):
+            return
+        _queue(instance)
+
+    def remember_sources(sender, instance, **kwargs):
+        # The generic relation deletes rows pointing at the object before
+        # post_delete runs, so note whose lists need a replacement now.
+        instance._related_sources = set(
+            _stored(model).filter(target_id=instance.pk).values_list('source_id', flat=True)
+        )
+
+    def refresh_on_delete(sender, instance, **kwargs):
+        _queue(instance, sources=getattr(instance, '_related_sources', ()))
+
+    post_save.connect(refresh_on_save, sender=model, weak=False, dispatch_uid=f'{uid}.post_save')
+    pre_delete.connect(remember_sources, sender=model, weak=False, dispatch_uid=f'{uid}.pre_delete')
+    post_delete.connect(refresh_on_delete, sender=model, weak=False, dispatch_uid=f'{uid}.post_delete')
+
+
+def _queue(instance, sources=()):
+    """Refresh in the background; the task row commits or rolls back with the change."""
+    from .tasks import refresh_related
+
+    refresh_related.enqueue(instance._meta.label, instance.pk, sorted(sources))
+
+
+def similar(obj, queryset=None):
+    """Stored neighbours of ``obj`` (restricted to ``queryset``), most similar first."""
+    if queryset is None:
+        queryset = type(obj)._default_manager.all()
+    return queryset.filter(related_entries__source_id=obj.pk).order_by('related_entries__rank')
+
+
+def _stored(model):
+    return RelatedItem.objects.filter(content_type=ContentType.objects.get_for_model(model))
+
+
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), CHUNK):
+        yield values[start:start + CHUNK]
+
+
+def _terms(entry, values):
+    """Weighted term counts of one object's text field ``values``."""
+    terms = Counter()
+    for weight, value in zip(entry.fields.values(), values):
+        for word in tokenize(value):
+            terms[word] += weight
+    return terms
+
+
+def _idf(total, documents):
+    return math.log((1 + total) / (1 + documents)) + 1
+
+
+def _unit(terms, idf):
+    """Unit-length TF-IDF vector of ``terms``."""
+    vector = {word: (1 + math.log(count)) * idf[word] for word, count in terms.items()}
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {word: value / norm for word, value in vector.items()} if norm else {}
+
+
+def _vectors(entry):
+    """Vectors of every live object of ``entry.model`` and each word's document frequency."""
+    rows = entry.model._default_manager.filter(**entry.live).values_list('pk', *entry.fields)
+    counts = {pk: _terms(entry, values) for pk, *values in rows.iterator(chunk_size=500)}
+    frequency = Counter(word for terms in counts.values() for word in terms)
+    total = len(counts)
+    idf = {word: _idf(total, documents) for word, documents in frequency.items()}
+    return {pk: _unit(terms, idf) for pk, terms in counts.items()}, frequency
+
+
+def _postings(vectors):
+    index = defaultdict(list)
+    for pk, vector in vectors.items():
+        for word, value in vector.items():
+            index[word].append((pk, value))
+    return index
+
+
+def _stored_vectors(content_type, pks):
+    vectors = defaultdict(dict)
+    for chunk in _chunks(pks):
+        rows = RelatedTerm.objects.filter(content_type=content_type, object_id__in=chunk)
+        for pk, word, value in rows.values_list('object_id', 'word', 'value'):
+            vectors[pk][word] = value
+    return vectors
+
+
+def _stored_postings(content_type, words):
+    """The slice of the stored inverted index covering ``words``."""
+    index = defaultdict(list)
+    for chunk in _chunks(words):
+        rows = RelatedTerm.objects.filter(content_type=content_type, word__in=chunk)
+        for word, pk, value in rows.values_list('word', 'object_id', 'value').iterator(chunk_size=2000):
+            index[word].append((pk, value))
+    return index
+
+
+def _count_documents(content_type, added, removed):
+    """Adjust document frequencies for an object that gained and lost words."""
+    words = RelatedWord.objects.filter(content_type=content_type)
+    for chunk in _chunks(added):
+        RelatedWord.objects.bulk_create(
+            [RelatedWord(content_type=content_type, word=word) for word in chunk], ignore_conflicts=True
+        )
+        words.filter(word__in=chunk).update(documents=F('documents') + 1)
+    for chunk in _chunks(removed):
+        words.filter(word__in=chunk).update(documents=F('documents') - 1)
+        words.filter(word__in=chunk, documents__lte=0).delete()
+
+
+def _frequencies(content_type, words):
+    frequency = {}
+    for chunk in _chunks(words):
+        frequency.update(
+            RelatedWord.objects.filter(content_type=content_type, word__in=chunk).values_list('word', 'documents')
+        )
+    return frequency
+
+
+def _scores(pk, vector, index):
+    """Cosine similarity of ``vector`` with every object sharing a term."""
+    scores = defaultdict(float)
+    for word, value in vector.items():
+        for other, other_value in index[word]:
+            if other != pk:
+                scores[other] += value * other_value
+    return scores
+
+
+def _rows(entry, content_type, vectors, index, sources):
+    rows = []
+    for source in sources:
+        if source not in vectors:
+            continue
+        best = heapq.nlargest(entry.limit, _scores(source, vectors[source], index).items(), key=itemgetter(1))
+        rows += [
+            RelatedItem(content_type=content_type, source_id=source, target_id=target, rank=rank, score=score)
+            for rank, (target, score) in enumerate(best, start=1)
+        ]
+    return rows
+
+
+def refresh(model, pk, sources=()):
+    """
+    Re-index object ``pk`` of ``model`` and recompute the lists it affects.
+
+    Only this object is re-vectorized, against the stored document
+    frequencies, and it is scored through the stored inverted index. The
+    lists recomputed are its own, those that listed it (``sources`` for a
+    deleted object, whose rows are already gone) and those whose weakest
+    stored neighbour it now outscores.
+    """
+    entry = _entries[model]
+    content_type = ContentType.objects.get_for_model(model)
+    if not RelatedTerm.objects.filter(content_type=content_type).exists():
+        # Nothing indexed yet (e.g. lists stored before the index existed)
+        rebuild([model])
+        return
+    stored = _stored(model)
+    live = model._default_manager.filter(**entry.live)
+    values = live.filter(pk=pk).values_list(*entry.fields).first()
+    terms = _terms(entry, values) if values else Counter()
+
+    with transaction.atomic():
+        indexed = RelatedTerm.objects.filter(content_type=content_type, object_id=pk)
+        previous = set(indexed.values_list('word', flat=True))
+        _count_documents(content_type, added=terms.keys() - previous, removed=previous - terms.keys())
+        total = live.count()
+        frequency = _frequencies(content_type, terms)
+        vector = _unit(terms, {word: _idf(total, frequency.get(word, 1)) for word in terms})
+        indexed.delete()
+        RelatedTerm.objects.bulk_create([
+            RelatedTerm(content_type=content_type, object_id=pk, word=word, value=value)
+            for word, value in vector.items()
+        ], batch_size=500)
+
+        affected = {pk, *sources}
+        affected.update(stored.filter(target_id=pk).values_list('source_id', flat=True))
+        if vector:
+            weakest = {
+                row['source_id']: (row['links'], row['weakest'])
+                for row in stored.values('source_id').annotate(links=Count('pk'), weakest=Min('score'))
+            }
+            for other, score in _scores(pk, vector, _stored_postings(content_type, vector)).items():
+                links, low = weakest.get(other, (0, 0))
+                if links < entry.limit or score > low:
+                    affected.add(other)
+
+        vectors = _stored_vectors(content_type, affected)
+        index = _stored_postings(content_type, {word for vector in vectors.values() for word in vector})
+        rows = _rows(entry, content_type, vectors, index, affected)
+        stored.filter(source_id__in=affected).delete()
+        RelatedItem.objects.bulk_create(rows)
+
+
+def rebuild(models=None):
+    """Re-index and recompute every stored neighbour list; returns rows written per model."""
+    written = {}
+    for model, entry in _entries.items():
+        if models is not None and model not in models:
+            continue
+        content_type = ContentType.objects.get_for_model(model)
+        vectors, frequency = _vectors(entry)
+        rows = _rows(entry, content_type, vectors, _postings(vectors), vectors)
+        with transaction.atomic():
+            _stored(model).delete()
+            RelatedItem.objects.bulk_create(rows, batch_size=500)
+            RelatedTerm.objects.filter(content_type=content_type).delete()
+            RelatedTerm.objects.bulk_create([
+                RelatedTerm(content_type=content_type, object_id=pk, word=word, value=value)
+                for pk, vector in vectors.items()
+                for word, value in vector.items()
+            ], batch_size=500)
+            RelatedWord.objects.filter(content_type=content_type).delete()
+            RelatedWord.objects.bulk_create([
+                RelatedWord(content_type=content_type, word=word, documents=documents)
+                for word, documents in frequency.items()
+            ], batch_size=500)
+        written[model] = len(rows)
+    return written
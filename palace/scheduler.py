@@ -0,0 +1,238 @@
+"""
+In-process periodic scheduler for maintenance jobs.
+
+Apps declare jobs in their ``jobs.py`` with ``@periodic(every=seconds)``.
+``run_scheduler`` (or ``run_worker --scheduler``) wakes up every
+``SCHEDULER_TICK_SECONDS`` and, on the one node holding the
+``SchedulerLease``, runs the jobs that are due. The lease is a row
+claimed with a conditional ``UPDATE`` (free, expired or already ours),
+so it works the same on SQLite and PostgreSQL; if the leader stops, the
+lease expires after ``SCHEDULER_LEASE_SECONDS`` and another node takes
+over.
+
+Each job's ``PeriodicJob`` row is advanced to its next run before the
+job starts, with a compare-and-set on the old time, so a slow job that
+outlives the lease is still never started twice for the same tick.
+
+Slow jobs are declared with ``queue=True``: the scheduler only queues
+them as background tasks (see palace.taskqueue), so one long run cannot
+hold up the minute-by-minute jobs behind it. Other jobs run in a thread
+while the scheduler keeps renewing its lease.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import PeriodicJob, SchedulerLease, Task
+
+
+logger = logging.getLogger(__name__)
+
+
+LEASE = 'scheduler'
+
+Job = namedtuple('Job', ['name', 'func', 'every', 'queue'])
+
+_jobs = {}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def periodic(every, name=None, queue=False):
+    """
+    Run the decorated function every ``every`` seconds on the leader node.
+
+    With ``queue`` the run is handed to the background worker instead.
+    """
+    def register(func):
+        job_name = name or f'{func.__module__}.{func.__qualname__}'
+        _jobs[job_name] = Job(job_name, func, timedelta(seconds=every), queue)
+        return func
+
+    return register
+
+
+def discover():
+    """Import every installed app's ``jobs`` module; returns the registered jobs."""
+    autodiscover_modules('jobs')
+    return dict(_jobs)
+
+
+def holder_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+
+
+def acquire(holder, now=None):
+    """Take or renew the scheduler lease; ``True`` if ``holder`` is the leader."""
+    now = now or timezone.now()
+    try:
+        SchedulerLease.objects.get_or_create(name=LEASE, defaults={'expires_at': now})
+    except IntegrityError:
+        pass  # Another node created it first
+    return bool(
+        SchedulerLease.objects.filter(name=LEASE).filter(
+            Q(holder=holder) | Q(holder='') | Q(expires_at__lt=now)
+        ).update(
+            holder=holder,
+            expires_at=now + timedelta(seconds=_setting('SCHEDULER_LEASE_SECONDS', 60)),
+        )
+    )
+
+
+def release(holder):
+    SchedulerLease.objects.filter(name=LEASE, holder=holder).update(holder='', expires_at=timezone.now())
+
+
+def _claim(job, state, now):
+    """Advance the job's next run; ``False`` if another node already did."""
+    return bool(
+        PeriodicJob.objects.filter(pk=state.pk, next_run_at=state.next_run_at).update(
+            next_run_at=now + job.every
+        )
+    )
+
+
+def _record(name, now, duration, error):
+    PeriodicJob.objects.filter(name=name).update(
+        last_run_at=now,
+        last_duration=duration,
+        last_error=error[-4000:],
+        run_count=F('run_count') + 1,
+        failure_count=F('failure_count') + bool(error),
+    )
+
+
+def _call(job, outcome):
+    try:
+        job.func()
+    except Exception:
+        outcome['error'] = traceback.format_exc()
+        logger.exception('Periodic job %s failed', job.name)
+    finally:
+        # This thread's connections are not closed by anyone else
+        connections.close_all()
+
+
+def _enqueue(job):
+    """Queue ``job`` for the worker unless an earlier run is still waiting or running."""
+    from .tasks import run_periodic_job
+
+    pending = Task.objects.filter(
+        name=run_periodic_job.task_name, args=[job.name],
+        status__in=[Task.Status.QUEUED, Task.Status.RUNNING],
+    )
+    if pending.exists():
+        return False
+    run_periodic_job.enqueue(job.name)
+    return True
+
+
+def run_job(job, state, now=None, holder=None):
+    """Run (or queue) one job and record how it went; returns the error text (empty on success)."""
+    now = now or timezone.now()
+    if not _claim(job, state, now):
+        return ''
+    if job.queue:
+        _enqueue(job)
+        return ''
+    started = time.monotonic()
+    outcome = {'error': ''}
+    thread = threading.Thread(target=_call, args=(job, outcome), name=f'job:{job.name}', daemon=True)
+    thread.start()
+    renew_every = _setting('SCHEDULER_LEASE_SECONDS', 60) / 3
+    while True:
+        thread.join(renew_every)
+        if not thread.is_alive():
+            break
+        # Keep the lease while the job runs so no other node starts leading
+        if holder is not None:
+            acquire(holder)
+    _record(job.name, now, time.monotonic() - started, outcome['error'])
+    return outcome['error']
+
+
+def run_queued(name):
+    """Run a job the scheduler queued; called by the ``run_periodic_job`` task."""
+    job = discover()[name]
+    now = timezone.now()
+    started = time.monotonic()
+    error = ''
+    try:
+        job.func()
+    except Exception:
+        error = traceback.format_exc()
+        raise
+    finally:
+        _record(name, now, time.monotonic() - started, error)
+
+
+def run_due(holder, now=None):
+    """Run every due job while ``holder`` keeps the lease; returns the names run."""
+    now = now or timezone.now()
+    states = {state.name: state for state in PeriodicJob.objects.filter(name__in=_jobs)}
+    missing = [PeriodicJob(name=name, next_run_at=now) for name in _jobs if name not in states]
+    if missing:
+        PeriodicJob.objects.bulk_create(missing, ignore_conflicts=True)
+        states = {state.name: state for state in PeriodicJob.objects.filter(name__in=_jobs)}
+
+    ran = []
+    for state in sorted(states.values(), key=lambda state: state.next_run_at):
+        if state.next_run_at > now:
+            continue
+        # Jobs can be slow; make sure we are still the leader before each one
+        if not acquire(holder):
+            break
+        run_job(_jobs[state.name], state, holder=holder)
+        ran.append(state.name)
+    return ran
+
+
+def tick(holder):
+    """One scheduler round; returns the names of the jobs that ran."""
+    try:
+        if not acquire(holder):
+            return []
+        return run_due(holder)
+    finally:
+        close_old_connections()
+
+
+def run_scheduler(stop=None, tick_seconds=None):
+    """Tick until ``stop`` is set, then hand the lease back."""
+    discover()
+    stop = stop or threading.Event()
+    tick_seconds = tick_seconds or _setting('SCHEDULER_TICK_SECONDS', 10)
+    holder = holder_id()
+    try:
+        while not stop.is_set():
+            try:
+                tick(holder)
+            except Exception:
+                # A database hiccup should not kill the scheduler thread
+                logger.exception('Scheduler tick failed')
+            stop.wait(tick_seconds)
+    finally:
+        release(holder)
+        close_old_connections()
+
+
+def start_in_thread(stop):
+    """Run the scheduler in a daemon thread next to another loop (e.g. the worker)."""
+    thread = threading.Thread(target=run_scheduler, args=(stop,), name='scheduler', daemon=True)
+    thread.start()
+    return thread
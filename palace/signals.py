@@ -0,0 +1,28 @@
+"""
+Signal handlers for the palace app.
+"""
+
+from .counters import track_category_count
+from .models import GalleryImage, HistoryArticle
+from .related import track_related
+
+
+track_category_count(
+    GalleryImage,
+    category_field='category',
+    counter_field='image_count',
+    is_counted=lambda image: image.is_published,
+)
+
+track_related(
+    GalleryImage,
+    fields={'title': 3, 'caption': 1, 'location': 1},
+    live={'is_published': True},
+    limit=4,
+)
+track_related(
+    HistoryArticle,
+    fields={'title': 3, 'excerpt': 1, 'content': 1},
+    live={'is_published': True},
+    limit=3,
+)
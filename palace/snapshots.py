@@ -0,0 +1,46 @@
+"""
+Stored version of a row that is being saved.
+
+Several ``pre_save`` handlers compare an instance with its stored row
+(category counters, archive months, live notifications). Models
+registered with ``track_previous`` fetch that row at most once per save,
+the first time a handler asks ``previous_row`` for it, so the handlers
+share one query and handlers that bail out early cost none.
+"""
+
+from django.db.models.signals import post_save, pre_save
+
+
+_UNSET = object()
+
+
+def track_previous(model):
+    """
+    Let ``pre_save`` handlers of ``model`` share ``previous_row``.
+
+    Call it before connecting those handlers; registering a model twice
+    is harmless.
+    """
+    uid = f'{model._meta.label}.previous'
+
+    def reset(sender, instance, raw=False, using=None, **kwargs):
+        # Raw (fixture) saves and new rows have nothing stored to compare with
+        instance._previous = (None if raw or instance.pk is None else _UNSET, using)
+
+    def forget(sender, instance, **kwargs):
+        instance.__dict__.pop('_previous', None)
+
+    pre_save.connect(reset, sender=model, weak=False, dispatch_uid=f'{uid}.pre_save')
+    post_save.connect(forget, sender=model, weak=False, dispatch_uid=f'{uid}.post_save')
+
+
+def previous_row(instance):
+    """The stored row ``instance`` is about to overwrite, or ``None`` for a new row."""
+    row, using = getattr(instance, '_previous', (_UNSET, None))
+    if row is _UNSET:
+        row = None
+        if instance.pk is not None:
+            row = type(instance)._base_manager.using(using).filter(pk=instance.pk).first()
+        if hasattr(instance, '_previous'):
+            instance._previous = (row, using)
+    return row
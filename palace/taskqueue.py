@@ -0,0 +1,297 @@
+"""
+Database-backed background tasks.
+
+Functions decorated with ``@task`` in an app's ``tasks.py`` are queued
+with ``func.enqueue(*args, **kwargs)``; arguments must be JSON
+serializable (pass primary keys, not model instances). The row is
+written in the caller's transaction, so work queued by a request that
+rolls back never runs.
+
+The ``run_worker`` command claims due tasks in batches. On PostgreSQL
+(and other backends with ``SKIP LOCKED``) the claim is a
+``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent workers take
+disjoint rows without waiting on each other; on SQLite it is a single
+``UPDATE ... WHERE id IN (SELECT ... LIMIT n)`` statement, which the
+database applies atomically. Claimed rows carry a lease that the worker
+renews while the task runs; if a worker dies, other workers put its tasks
+back in the queue once the lease expires. Failures are retried with exponential backoff up
+to ``max_attempts`` and every run records its duration.
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import defaultdict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Avg, Count, F, Max, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Task
+
+
+logger = logging.getLogger(__name__)
+
+
+TaskSpec = namedtuple('TaskSpec', ['func', 'max_attempts', 'backoff', 'priority'])
+
+_registry = {}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def task(func=None, *, max_attempts=3, backoff=30, priority=0):
+    """
+    Register ``func`` as a background task and give it an ``enqueue`` method.
+
+    Failed runs are retried after ``backoff`` seconds, doubling each time,
+    until ``max_attempts`` runs have failed. Lower ``priority`` runs first.
+    """
+    def register(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        _registry[name] = TaskSpec(func, max_attempts, backoff, priority)
+        func.task_name = name
+        func.enqueue = lambda *args, **kwargs: enqueue(name, args, kwargs)
+        return func
+
+    return register(func) if func is not None else register
+
+
+def discover():
+    """Import every installed app's ``tasks`` module so its tasks are registered."""
+    autodiscover_modules('tasks')
+
+
+def enqueue(name, args=(), kwargs=None, delay=0, priority=None):
+    """Queue a registered task to run after ``delay`` seconds; returns the ``Task`` row."""
+    if name not in _registry:
+        raise LookupError(f'{name} is not a registered task')
+    spec = _registry[name]
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=dict(kwargs or {}),
+        priority=spec.priority if priority is None else priority,
+        max_attempts=spec.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _lease():
+    return timedelta(seconds=_setting('TASK_LEASE_SECONDS', 300))
+
+
+def claimable(now=None):
+    """Queued tasks that are due."""
+    return Task.objects.filter(status=Task.Status.QUEUED, run_after__lte=now or timezone.now())
+
+
+def requeue_expired(now=None):
+    """Give tasks whose worker stopped renewing the lease back to the queue."""
+    now = now or timezone.now()
+    expired = Task.objects.filter(status=Task.Status.RUNNING, locked_until__lt=now)
+    failed = expired.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.Status.FAILED, locked_until=None, finished_at=now,
+        last_error='Worker stopped while running the task'
+    )
+    queued = expired.update(status=Task.Status.QUEUED, locked_until=None, run_after=now)
+    return queued + failed
+
+
+def claim(worker, limit):
+    """Mark up to ``limit`` due tasks as running for ``worker``; returns their ids."""
+    now = timezone.now()
+    token = f'{worker}:{uuid.uuid4().hex[:8]}'
+    due = claimable(now).order_by('priority', 'run_after', 'pk')
+    changes = {
+        'status': Task.Status.RUNNING,
+        'claimed_by': token,
+        'locked_until': now + _lease(),
+        'started_at': now,
+        'attempts': F('attempts') + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            if ids:
+                Task.objects.filter(pk__in=ids).update(**changes)
+        return ids
+    # One statement: SQLite serializes writers, so two workers cannot both
+    # match the same row.
+    if not Task.objects.filter(pk__in=due.values('pk')[:limit]).update(**changes):
+        return []
+    return list(Task.objects.filter(claimed_by=token, status=Task.Status.RUNNING).values_list('pk', flat=True))
+
+
+def renew(ids):
+    """Extend the leases of tasks still running."""
+    if ids:
+        Task.objects.filter(pk__in=ids, status=Task.Status.RUNNING).update(
+            locked_until=timezone.now() + _lease()
+        )
+
+
+def _retry_delay(spec, attempts):
+    delay = spec.backoff * 2 ** (attempts - 1)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def execute(pk):
+    """Run one claimed task and record the outcome; returns ``(name, status, duration)``."""
+    close_old_connections()
+    try:
+        row = Task.objects.get(pk=pk)
+        spec = _registry.get(row.name)
+        error = ''
+        started = time.monotonic()
+        if spec is None:
+            error = f'{row.name} is not a registered task'
+        else:
+            try:
+                spec.func(*row.args, **row.kwargs)
+            except Exception:
+                error = traceback.format_exc()
+                logger.warning('Task %s (%s) failed on attempt %s', row.name, pk, row.attempts, exc_info=True)
+        duration = time.monotonic() - started
+
+        changes = {'duration': duration, 'finished_at': timezone.now(), 'locked_until': None}
+        if not error:
+            changes.update(status=Task.Status.DONE, last_error='')
+        elif spec is not None and row.attempts < row.max_attempts:
+            changes.update(
+                status=Task.Status.QUEUED, last_error=error[-4000:],
+                run_after=timezone.now() + _retry_delay(spec, row.attempts)
+            )
+        else:
+            changes.update(status=Task.Status.FAILED, last_error=error[-4000:])
+        # Leave the row alone if the lease lapsed and another worker took over
+        Task.objects.filter(pk=pk, claimed_by=row.claimed_by).update(**changes)
+        return row.name, changes['status'], duration
+    finally:
+        close_old_connections()
+
+
+def purge(days=None):
+    """Delete finished tasks older than ``TASK_RETENTION_DAYS``; failed ones are kept."""
+    days = _setting('TASK_RETENTION_DAYS', 7) if days is None else days
+    deleted, _ = Task.objects.filter(
+        status=Task.Status.DONE, finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
+
+
+def stats(since=None):
+    """Per-task counts by status and timing, from the rows still stored."""
+    rows = Task.objects.all()
+    if since is not None:
+        rows = rows.filter(queued_at__gte=since)
+    return rows.order_by('name').values('name').annotate(
+        total=Count('pk'),
+        done=Count('pk', filter=Q(status=Task.Status.DONE)),
+        failed=Count('pk', filter=Q(status=Task.Status.FAILED)),
+        waiting=Count('pk', filter=Q(status__in=[Task.Status.QUEUED, Task.Status.RUNNING])),
+        avg_duration=Avg('duration'),
+        max_duration=Max('duration'),
+    )
+
+
+class Metrics:
+    """Timing of the tasks one worker has run, per task name."""
+
+    def __init__(self):
+        self.runs = defaultdict(lambda: {'count': 0, 'failed': 0, 'total': 0.0, 'max': 0.0})
+
+    def record(self, name, status, duration):
+        entry = self.runs[name]
+        entry['count'] += 1
+        entry['failed'] += status != Task.Status.DONE
+        entry['total'] += duration
+        entry['max'] = max(entry['max'], duration)
+
+    def lines(self):
+        for name, entry in sorted(self.runs.items()):
+            yield (
+                f"{name}: {entry['count']} run(s), {entry['failed']} failed, "
+                f"avg {entry['total'] / entry['count'] * 1000:.0f} ms, max {entry['max'] * 1000:.0f} ms"
+            )
+
+
+def _process_pool(concurrency):
+    """
+    A fork pool whose children hold no database connection.
+
+    Children fork on the first submit, which would be long after the parent
+    has used the database, so fork them all now with every connection
+    closed; each child then opens its own on its first query.
+    """
+    executor = ProcessPoolExecutor(max_workers=concurrency, mp_context=get_context('fork'))
+    connections.close_all()
+    executor.submit(int).result()
+    return executor
+
+
+def run_worker(concurrency=4, pool='thread', burst=False, poll=1.0, stop=None, metrics=None):
+    """
+    Claim and run tasks until ``stop`` is set (or, with ``burst``, the queue is empty).
+
+    ``pool`` is ``'thread'`` (good for I/O such as SMTP and uploads) or
+    ``'process'`` (CPU-bound work; Unix only). Returns the ``Metrics``.
+    """
+    discover()
+    stop = stop or threading.Event()
+    metrics = metrics or Metrics()
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    executor = _process_pool(concurrency) if pool == 'process' else ThreadPoolExecutor(concurrency)
+    running = {}
+    renew_every = _lease().total_seconds() / 3
+    last_renewal = last_purge = time.monotonic()
+    requeue_expired()
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            if now - last_renewal > renew_every:
+                renew(list(running.values()))
+                requeue_expired()
+                last_renewal = now
+            if now - last_purge > 3600:
+                purge()
+                last_purge = now
+
+            free = concurrency - len(running)
+            for pk in claim(worker, free) if free else []:
+                running[executor.submit(execute, pk)] = pk
+            if not running:
+                if burst:
+                    break
+                stop.wait(poll)
+                continue
+
+            done, _ = wait(running, timeout=poll, return_when=FIRST_COMPLETED)
+            for future in done:
+                pk = running.pop(future)
+                try:
+                    metrics.record(*future.result())
+                except Exception:
+                    logger.exception('Worker could not record task %s', pk)
+        # Finish what was started; unstarted claims run again after their lease
+        for future in list(running):
+            try:
+                metrics.record(*future.result())
+            except Exception:
+                logger.exception('Worker could not record task %s', running[future])
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        close_old_connections()
+    return metrics
@@ -0,0 +1,20 @@
+"""
+Background tasks for the palace app (see palace.taskqueue).
+"""
+
+from django.apps import apps
+
+from . import related, scheduler
+from .taskqueue import task
+
+
+@task(priority=10)
+def refresh_related(label, pk, sources=()):
+    """Re-index one saved or deleted object and recompute the related lists it affects."""
+    related.refresh(apps.get_model(label), pk, sources)
+
+
+@task(max_attempts=1)
+def run_periodic_job(name):
+    """Run a slow periodic job off the scheduler thread; the next tick queues it again."""
+    scheduler.run_queued(name)
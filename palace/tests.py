@@ -0,0 +1,292 @@
+"""
+Tests for the per-view query budgets, the related-items index and the
+periodic scheduler.
+"""
+
+import time
+from datetime import timedelta
+
+import cloudinary
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from announcements.models import Announcement, AnnouncementCategory
+from community.models import ContactMessage
+from events.models import Event, EventCategory
+
+from . import scheduler
+from .models import (
+    CacheGeneration, GalleryCategory, GalleryImage, HistoryArticle, PalaceInfo, PeriodicJob, RelatedTerm, RelatedWord,
+    SchedulerLease, Task,
+)
+from .related import rebuild, similar
+from .tasks import refresh_related, run_periodic_job
+
+
+# URL names walked by staff; everything else is a public page
+STAFF_VIEWS = {'community:admin_messages'}
+
+# No template ships for the gallery image page yet, so it cannot render
+UNRENDERABLE_VIEWS = {'palace:gallery_image'}
+
+# Query strings that take their own path through a view, walked as well
+# as the bare URL
+VARIANTS = {
+    'events:list': [
+        'category=festivals', 'type=festival', 'search=festival',
+        'time=past', 'time=today', 'category=festivals&time=past',
+    ],
+}
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Image URLs are built locally and only need a cloud name
+        if not cloudinary.config().cloud_name:
+            cloudinary.config(cloud_name='test')
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        PalaceInfo.objects.create()
+        cls.staff = get_user_model().objects.create_user(
+            email='admin@example.com', password='x', role='palace_admin', is_staff=True
+        )
+
+        category = AnnouncementCategory.objects.create(name='Notices', slug='notices')
+        cls.announcements = [
+            Announcement.objects.create(
+                title=f'Palace market notice {n}',
+                slug=f'market-notice-{n}',
+                content='The palace market opens early for the new yam festival.',
+                category=category,
+                is_published=True,
+            )
+            for n in range(4)
+        ]
+        # Shares no words with the others, so its page takes the category fallback
+        cls.lone_announcement = Announcement.objects.create(
+            title='Coronation anniversary',
+            slug='coronation-anniversary',
+            content='Chiefs gather to mark another year of the reign.',
+            category=category,
+            is_published=True,
+        )
+
+        event_category = EventCategory.objects.create(name='Festivals', slug='festivals')
+        cls.events = [
+            Event.objects.create(
+                title=f'Festival day {n}',
+                slug=f'festival-day-{n}',
+                description='Dancers and drummers at the palace.',
+                venue='Palace grounds',
+                category=event_category,
+                start_date=now + timedelta(days=n * 10 - 15),
+                is_published=True,
+            )
+            for n in range(4)
+        ]
+        Event.objects.create(
+            title='Council meeting',
+            slug='council-meeting',
+            description='Weekly meeting of the chiefs.',
+            venue='Council hall',
+            category=event_category,
+            start_date=now - timedelta(days=60),
+            recurrence=Event.RecurrenceType.WEEKLY,
+            is_published=True,
+        )
+
+        gallery_category = GalleryCategory.objects.create(name='Ceremonies', slug='ceremonies')
+        cls.images = [
+            GalleryImage.objects.create(
+                image='palace', title=f'Coronation photo {n}', category=gallery_category
+            )
+            for n in range(4)
+        ]
+        cls.article = HistoryArticle.objects.create(
+            title='Founding of Ankpa', slug='founding-of-ankpa', content='The story of the palace.'
+        )
+        for n in range(3):
+            ContactMessage.objects.create(
+                full_name='Ada Okpe', email='ada@example.com', subject=f'Question {n}', message='Hello'
+            )
+        rebuild()
+
+    def url_for(self, view_name):
+        today = timezone.localdate()
+        kwargs = {
+            'palace:gallery_image': {'pk': self.images[0].pk},
+            'palace:history_detail': {'slug': self.article.slug},
+            'announcements:detail': {'slug': self.lone_announcement.slug},
+            'events:detail': {'slug': self.events[0].slug},
+            'events:archive_year': {'year': today.year},
+            'events:archive_month': {'year': today.year, 'month': today.month},
+        }.get(view_name, {})
+        return reverse(view_name, kwargs=kwargs)
+
+    def test_budgeted_views_stay_within_budget(self):
+        # As on a fresh database, before anything bumped a cache generation
+        CacheGeneration.objects.all().delete()
+        for view_name in settings.QUERY_BUDGETS:
+            if view_name in UNRENDERABLE_VIEWS:
+                continue
+            for query in ['', *VARIANTS.get(view_name, [])]:
+                with self.subTest(view_name, query=query):
+                    client = Client()
+                    if view_name in STAFF_VIEWS:
+                        client.force_login(self.staff)
+                    # Measure the first hit, before any cache is warm
+                    cache.clear()
+                    ContentType.objects.clear_cache()
+                    response = client.get(f'{self.url_for(view_name)}?{query}' if query else self.url_for(view_name))
+                    self.assertEqual(response.status_code, 200)
+
+
+class RelatedItemsTests(TestCase):
+
+    def setUp(self):
+        self.category = AnnouncementCategory.objects.create(name='Notices', slug='notices')
+        texts = {
+            'festival': 'Yam festival dancers and drummers at the palace square.',
+            'market': 'Yam festival market stalls open near the palace square.',
+            'council': 'Council of chiefs meets to discuss land disputes.',
+            'levy': 'Council of chiefs sets the market levy for traders.',
+        }
+        self.items = {
+            slug: Announcement.objects.create(
+                title=slug.title(), slug=slug, content=content, category=self.category, is_published=True
+            )
+            for slug, content in texts.items()
+        }
+        rebuild()
+        Task.objects.all().delete()
+
+    def run_queued(self):
+        for row in Task.objects.filter(name=refresh_related.task_name).order_by('pk'):
+            refresh_related(*row.args, **row.kwargs)
+            row.delete()
+
+    def neighbours(self, slug):
+        return [item.slug for item in similar(self.items[slug])]
+
+    def assertIndexMatchesRebuild(self):
+        incremental = dict(RelatedWord.objects.values_list('word', 'documents'))
+        lists = {slug: set(self.neighbours(slug)) for slug in self.items}
+        rebuild()
+        self.assertEqual(incremental, dict(RelatedWord.objects.values_list('word', 'documents')))
+        self.assertEqual(lists, {slug: set(self.neighbours(slug)) for slug in self.items})
+
+    def test_save_queues_refresh_instead_of_recomputing(self):
+        council = self.items['council']
+        council.content = 'Yam festival dancers gather at the palace square.'
+        council.save()
+        row = Task.objects.get(name=refresh_related.task_name)
+        self.assertEqual(row.args, ['announcements.Announcement', council.pk, []])
+        self.assertNotEqual(self.neighbours('council')[0], 'festival')
+
+        self.run_queued()
+        self.assertEqual(self.neighbours('council')[0], 'festival')
+        self.assertIn('council', self.neighbours('festival'))
+        self.assertIndexMatchesRebuild()
+
+    def test_bookkeeping_saves_are_ignored(self):
+        self.items['festival'].save(update_fields=['view_count'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_new_object_joins_existing_lists(self):
+        self.items['drums'] = Announcement.objects.create(
+            title='Drums', slug='drums', content='Drummers lead the yam festival procession.',
+            category=self.category, is_published=True,
+        )
+        self.run_queued()
+        self.assertIn('drums', self.neighbours('festival'))
+        self.assertIn('festival', self.neighbours('drums'))
+        self.assertIndexMatchesRebuild()
+
+    def test_unpublished_and_deleted_objects_leave_lists(self):
+        market = self.items.pop('market')
+        market.is_published = False
+        market.save()
+        self.run_queued()
+        self.assertNotIn('market', self.neighbours('festival'))
+        self.assertNotIn('market', self.neighbours('levy'))
+        self.assertEqual(self.neighbours('levy'), ['council'])
+        self.assertIndexMatchesRebuild()
+
+        self.items.pop('levy').delete()
+        self.run_queued()
+        self.assertEqual(self.neighbours('council'), [])
+        self.assertIndexMatchesRebuild()
+
+    def test_refresh_without_index_rebuilds(self):
+        RelatedTerm.objects.all().delete()
+        RelatedWord.objects.all().delete()
+        refresh_related('announcements.Announcement', self.items['festival'].pk)
+        self.assertEqual(self.neighbours('festival')[0], 'market')
+        self.assertTrue(RelatedWord.objects.exists())
+
+
+@override_settings(SCHEDULER_LEASE_SECONDS=0.6)
+class SchedulerTests(TransactionTestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.holder = scheduler.holder_id()
+        registered = dict(scheduler._jobs)
+        scheduler._jobs.clear()
+        self.addCleanup(self.restore_jobs, registered)
+
+    def restore_jobs(self, registered):
+        scheduler._jobs.clear()
+        scheduler._jobs.update(registered)
+
+    def add_job(self, name, func, queue=False):
+        scheduler.periodic(every=60, name=name, queue=queue)(func)
+
+    def test_queued_jobs_go_to_the_worker_once(self):
+        self.add_job('slow', lambda: self.calls.append('slow'), queue=True)
+        self.assertEqual(scheduler.tick(self.holder), ['slow'])
+        self.assertEqual(self.calls, [])
+        row = Task.objects.get(name=run_periodic_job.task_name)
+        self.assertEqual(row.args, ['slow'])
+
+        # Due again before the worker got to it: no second copy
+        PeriodicJob.objects.update(next_run_at=timezone.now())
+        scheduler.tick(self.holder)
+        self.assertEqual(Task.objects.count(), 1)
+
+        run_periodic_job(*row.args)
+        self.assertEqual(self.calls, ['slow'])
+        self.assertEqual(PeriodicJob.objects.get(name='slow').run_count, 1)
+
+    def test_lease_is_renewed_while_an_inline_job_runs(self):
+        def slow():
+            time.sleep(1.5)
+            self.calls.append(SchedulerLease.objects.get().expires_at)
+
+        self.add_job('slow', slow)
+        started = timezone.now()
+        scheduler.tick(self.holder)
+        # Without renewal the lease would have lapsed 0.6s after the tick began
+        self.assertGreater(self.calls[0], started + timedelta(seconds=1))
+        self.assertTrue(scheduler.acquire(self.holder))
+
+    def test_failures_are_recorded(self):
+        def broken():
+            raise RuntimeError('boom')
+
+        self.add_job('broken', broken)
+        scheduler.tick(self.holder)
+        state = PeriodicJob.objects.get(name='broken')
+        self.assertEqual((state.run_count, state.failure_count), (1, 1))
+        self.assertIn('boom', state.last_error)
@@ -11,6 +11,7 @@ from django.contrib import messages
 from django.urls import reverse_lazy
 from django.db.models import Q
 
+from . import related
 from .models import (
     EjehProfile, GalleryImage, GalleryCategory,
     HistoryArticle, TraditionalTitle, PalaceInfo
@@ -40,7 +41,7 @@ class HomeView(TemplateView):
         
         # Import here to avoid circular imports
         from announcements.models import Announcement
-        from events.models import Event
+        from events import occurrences
         
         context['present_ejeh'] = EjehProfile.get_present_ejeh()
         context['featured_images'] = GalleryImage.objects.filter(
@@ -49,9 +50,7 @@ class HomeView(TemplateView):
         context['recent_announcements'] = Announcement.objects.filter(
             is_published=True
         )[:3]
-        context['upcoming_events'] = Event.objects.filter(
-            is_published=True
-        ).order_by('start_date')[:4]
+        context['upcoming_events'] = occurrences.upcoming(limit=4)
         context['featured_articles'] = HistoryArticle.objects.filter(
             is_published=True, is_featured=True
         )[:3]
@@ -219,9 +218,9 @@ class GalleryImageDetailView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Related images
-        context['related_images'] = GalleryImage.objects.filter(
-            is_published=True,
+        # Related images, falling back to the same category
+        published = GalleryImage.objects.filter(is_published=True)
+        context['related_images'] = list(related.similar(self.object, published)[:4]) or published.filter(
             category=self.object.category
         ).exclude(pk=self.object.pk)[:4]
         return context
@@ -271,8 +270,8 @@ class HistoryDetailView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['related_articles'] = HistoryArticle.objects.filter(
-            is_published=True,
+        published = HistoryArticle.objects.filter(is_published=True)
+        context['related_articles'] = list(related.similar(self.object, published)[:3]) or published.filter(
             article_type=self.object.article_type
         ).exclude(pk=self.object.pk)[:3]
         return context